@@ -71,6 +71,8 @@
 
 # %%
 import os
+import sys
+from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -79,6 +81,16 @@ import seaborn as sns
 from IPython.display import display
 from scipy import stats
 
+# Later cells reuse the app's utilities from streamlit_app/Product_Analytics.
+# Run as a script the path comes from this file; Jupyter and Colab start the
+# kernel in the notebook's own directory
+NOTEBOOK_DIR = (
+    Path(__file__).resolve().parent if "__file__" in globals() else Path.cwd()
+)
+APP_DIR = NOTEBOOK_DIR.parent / "streamlit_app" / "Product_Analytics"
+if str(APP_DIR) not in sys.path:
+    sys.path.append(str(APP_DIR))
+
 # Set plotting style
 sns.set_style("whitegrid")
 
@@ -170,9 +182,8 @@ plt.show()
 # **Takeaway for Product Analytics:** Understanding which distribution best fits the data allows for more accurate analysis, prediction, and hypothesis testing. For example, knowing the distribution of user session length can help optimize server capacity.
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 from scipy import stats
@@ -483,9 +494,8 @@ except Exception as e:
 # **Takeaway for Product Analytics:** Linear regression can provide insights into how different factors influence user behavior and can be used for forecasting and optimization.
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import statsmodels.api as sm
@@ -537,9 +547,8 @@ plt.show()
 # **Takeaway for Product Analytics:** Logistic regression can be used to predict user churn, conversion rates, and other binary outcomes, allowing for targeted interventions.
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
@@ -607,9 +616,9 @@ plt.show()
 # **Takeaway for Product Analytics:** It’s important to account for these challenges when designing experiments in social networks to ensure valid and reliable results. Techniques like cluster randomization or graph-based experiments can help mitigate these issues.
 #
 
+# %%
 import random
 
-# %%
 import numpy as np
 import pandas as pd
 
@@ -716,9 +725,8 @@ print(
 #
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
@@ -785,14 +793,14 @@ plt.show()
 # **Takeaway for Product Analytics:** Resampling techniques provide robust methods for evaluating model performance and estimating uncertainty, especially when dealing with limited data or complex models. They can help in making more reliable product decisions.
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
 from sklearn.model_selection import KFold
+from utils.bootstrap_utils import bootstrap
 
 # --- Bootstrapping ---
 print("--- Bootstrapping ---")
@@ -804,11 +812,10 @@ data = np.random.normal(loc=5, scale=2, size=100)
 # Number of bootstrap samples
 n_bootstraps = 1000
 
-# Bootstrap sampling and calculate the mean
-bootstrap_means = []
-for _ in range(n_bootstraps):
-    bootstrap_sample = np.random.choice(data, size=len(data), replace=True)
-    bootstrap_means.append(np.mean(bootstrap_sample))
+# Bootstrap sampling and calculate the mean (all resamples drawn as one index block)
+bootstrap_means = bootstrap(
+    data, np.mean, n_resamples=n_bootstraps, random_state=42
+).distribution
 
 # Estimate the mean and confidence interval
 mean_estimate = np.mean(bootstrap_means)
@@ -989,6 +996,34 @@ print(
     f"\nQuartiles: Q1={quantile_values[0]:.2f}, Q2={quantile_values[1]:.2f}, Q3={quantile_values[2]:.2f}"
 )
 
+# %% [markdown]
+# **Percentiles at scale:** Exact percentiles sort the whole column, which stops working once the data no longer fits in memory. Mergeable sketches summarize each chunk (or partition) in a small, fixed amount of memory and combine at query time: a KLL sketch for quantiles, Space-Saving for the most frequent values and HyperLogLog for the number of distinct values.
+
+# %%
+import numpy as np
+from utils.sketch_utils import HyperLogLog, KLLSketch, SpaceSaving
+
+rng = np.random.default_rng(42)
+percentiles = [25, 50, 75, 90]
+
+# Session lengths (minutes) arriving in daily partitions of one million rows
+quantiles, top_pages, visitors = KLLSketch(), SpaceSaving(), HyperLogLog()
+exact_sample = []
+for day in range(10):
+    sessions = rng.lognormal(mean=1.5, sigma=0.8, size=1_000_000)
+    quantiles.merge(KLLSketch().update(sessions))
+    top_pages.update(rng.zipf(1.5, size=1_000_000))
+    visitors.update(rng.integers(0, 2_000_000, size=1_000_000))
+    exact_sample.append(sessions)
+
+exact = np.percentile(np.concatenate(exact_sample), percentiles)
+approximate = quantiles.quantile(np.array(percentiles) / 100)
+for p, e, a in zip(percentiles, exact, approximate):
+    print(f"{p}th Percentile: exact={e:.3f}, sketch={a:.3f}")
+print(f"Sketch keeps {quantiles.size} of {quantiles.n:,} values")
+print(f"\nMost visited pages (page, visits): {top_pages.top(3)}")
+print(f"Distinct visitors: ~{visitors.count():,.0f}")
+
 # %% [markdown]
 #
 # ## 14. Data Transformation <a name="data-transformation"></a>
@@ -1004,9 +1039,8 @@ print(
 # **Takeaway for Product Analytics:** Data transformations can improve the performance of machine learning models and make data easier to visualize and interpret. For example, log transformation is often used to handle skewed metrics like user spending.
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 from sklearn.preprocessing import MinMaxScaler, StandardScaler
@@ -1098,9 +1132,8 @@ print(
 # **Takeaway for Product Analytics:** Discrete distributions can be used to model user behavior such as conversion rates (Binomial), number of support tickets (Poisson), etc.
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 from scipy import stats
@@ -1165,9 +1198,8 @@ plt.show()
 # **Takeaway for Product Analytics:** Continuous distributions can be used to model metrics like session duration, purchase amounts, and other continuous user behavior data.
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 from scipy import stats
@@ -1232,9 +1264,8 @@ plt.show()
 # **Takeaway for Product Analytics:** The CLT is fundamental for statistical inference. It allows us to use normal distribution-based tests (like t-tests and z-tests) even when the underlying population distribution is not normal, provided we have a sufficiently large sample size.
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 
@@ -1362,9 +1393,8 @@ plt.show()
 #
 # **Takeaway for Product Analytics:** These tests can be used to determine if a metric has changed significantly over time or if a sample of users differs significantly from the general population.
 
-import numpy as np
-
 # %%
+import numpy as np
 from scipy import stats
 
 # --- Example of One-Sample t-test ---
@@ -1432,10 +1462,9 @@ else:
 # **Takeaway for Product Analytics:** These tests are crucial for A/B testing, comparing different user segments, and analyzing relationships between categorical product features and user behavior.
 #
 
+# %%
 import numpy as np
 import pandas as pd
-
-# %%
 from scipy import stats
 
 # --- Example of Independent t-test ---
@@ -1516,9 +1545,9 @@ else:
 # **Takeaway for Product Analytics:** Ignoring network effects can lead to inaccurate conclusions in A/B tests. Specialized techniques are necessary to obtain reliable results in social network settings.
 #
 
+# %%
 import random
 
-# %%
 import numpy as np
 import pandas as pd
 
@@ -1622,9 +1651,8 @@ print(
 # **Takeaway for Product Analytics:** While observational studies can identify interesting trends, experiments (like A/B tests) are necessary to establish causal relationships between product changes and user behavior.
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
@@ -1706,9 +1734,8 @@ print(
 # **Takeaway for Product Analytics:** Understanding the bias-variance tradeoff helps in choosing appropriate model complexity and avoiding overfitting or underfitting, leading to more accurate predictions of user behavior.
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
@@ -1785,14 +1812,14 @@ print("Degree 3 is the ideal, having a good balance between bias and variance.")
 #
 #
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
 from sklearn.model_selection import KFold
+from utils.bootstrap_utils import bootstrap
 
 # --- Bootstrapping ---
 print("--- Bootstrapping ---")
@@ -1804,11 +1831,10 @@ data = np.random.normal(loc=5, scale=2, size=100)
 # Number of bootstrap samples
 n_bootstraps = 1000
 
-# Bootstrap sampling and calculate the mean
-bootstrap_means = []
-for _ in range(n_bootstraps):
-    bootstrap_sample = np.random.choice(data, size=len(data), replace=True)
-    bootstrap_means.append(np.mean(bootstrap_sample))
+# Bootstrap sampling and calculate the mean (all resamples drawn as one index block)
+bootstrap_means = bootstrap(
+    data, np.mean, n_resamples=n_bootstraps, random_state=42
+).distribution
 
 # Estimate the mean and confidence interval
 mean_estimate = np.mean(bootstrap_means)
@@ -1900,9 +1926,9 @@ plt.show()
 # **Takeaway for Product Analytics:** Understanding statistical power and sample size allows product analysts to design A/B tests that have a high chance of detecting meaningful changes in key metrics. It also helps avoid underpowered studies that may lead to false negatives.
 #
 
+# %%
 import math
 
-# %%
 from statsmodels.stats.power import TTestIndPower
 
 # Define the parameters
@@ -1946,9 +1972,8 @@ for eff_size in effect_sizes:
 #
 #
 
-import numpy as np
-
 # %%
+import numpy as np
 from scipy import stats
 
 # Example data
@@ -1986,6 +2011,7 @@ else:
 # %%
 import numpy as np
 from scipy import stats
+from utils.bootstrap_utils import bootstrap
 
 # Sample Data
 np.random.seed(42)
@@ -2009,17 +2035,17 @@ print(
 )
 
 # Bootstrapping example
-# Generate bootstrap samples
+# Generate bootstrap samples and take the CI from the 2.5 and 97.5 percentiles
 n_bootstraps = 1000
-bootstrap_means = []
-for _ in range(n_bootstraps):
-    sample = np.random.choice(data, size=len(data), replace=True)
-    bootstrap_means.append(np.mean(sample))
-
-
-# Calculate CI from bootstrapped means (2.5 and 97.5 percentiles)
-lower_bound_boot = np.percentile(bootstrap_means, 2.5)
-upper_bound_boot = np.percentile(bootstrap_means, 97.5)
+result = bootstrap(
+    data,
+    np.mean,
+    n_resamples=n_bootstraps,
+    confidence=confidence_level,
+    method="percentile",
+    random_state=42,
+)
+lower_bound_boot, upper_bound_boot = result.confidence_interval
 
 print(
     f"\nBootstrapped Confidence Interval ({confidence_level * 100}%) : {lower_bound_boot:.3f}, {upper_bound_boot:.3f}"
@@ -2060,9 +2086,8 @@ print(
 #
 # **Takeaway for Product Analytics:** Linear regression can be used to predict user behavior, understand the impact of different factors on key metrics, and identify areas for product optimization.
 
-import matplotlib.pyplot as plt
-
 # %%
+import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import statsmodels.api as sm
@@ -1,9 +1,25 @@
 import numpy as np
 import pandas as pd
 import plotly.express as px
-import statsmodels.stats.power as smp
 import streamlit as st
-from scipy.stats import chi2_contingency, mannwhitneyu, ttest_ind
+from scipy.stats import mannwhitneyu
+from utils.batch_utils import (
+    CORRECTION_METHODS,
+    EXPERIMENT_COLUMNS,
+    analyze_batch,
+    simulate_experiment_table,
+)
+from utils.experiment_utils import (
+    CupedStats,
+    ExperimentStats,
+    chi2_test,
+    cuped_test,
+    simulate_experiment,
+    welch_t_test,
+)
+from utils.io_utils import read_csv
+from utils.power_utils import required_sample_size, sample_size_grid, simulate_power
+from utils.sequential_utils import SequentialMonitor
 
 # --- Constants ---
 ALPHA_LEVEL_DEFAULT = 0.05
@@ -13,6 +29,7 @@ MDE_ABSOLUTE_DEFAULT = 10.0
 BASELINE_CONVERSION_RATE_DEFAULT = 0.10
 BASELINE_AOV_DEFAULT = 50.0
 N_USERS_PER_VARIANT_DEFAULT = 500
+GRID_POWER_LEVELS = [0.7, 0.8, 0.9, 0.95]
 
 
 # --- Data Generation Functions ---
@@ -24,120 +41,88 @@ def generate_ab_test_data(
     effect_type="absolute",
     outcome_type="binary",
     random_state=42,
+    covariate_correlation=None,
 ):
-    """Generates synthetic A/B testing data (same as before, but constants used)."""
-    np.random.seed(random_state)
-    data = []
-    for i in range(n_variants):
-        variant = chr(65 + i)
-        users = np.arange(1, n_users_per_variant + 1)
+    """Generates synthetic A/B testing data with a local, seeded generator.
 
-        if outcome_type == "binary":
-            converted = (
-                np.random.rand(n_users_per_variant) < conversion_rates[i]
-            ).astype(int)
-            revenue = np.zeros(n_users_per_variant)
-        elif outcome_type == "continuous":
-            converted = np.zeros(n_users_per_variant)
-            revenue = np.zeros(n_users_per_variant)
-            if effect_type == "absolute":
-                revenue = np.random.normal(
-                    loc=avg_order_values[i], scale=20, size=n_users_per_variant
-                )
-            elif effect_type == "relative":
-                base_aov = avg_order_values[0]
-                relative_diff = (avg_order_values[i] - base_aov) / base_aov
-                revenue = np.random.normal(
-                    loc=base_aov * (1 + relative_diff),
-                    scale=20,
-                    size=n_users_per_variant,
-                )
-            revenue = np.maximum(revenue, 0)
-
-        data.extend(
-            list(zip([variant] * n_users_per_variant, users, converted, revenue))
+    Relative effects are expressed through ``avg_order_values`` directly, so
+    ``effect_type`` no longer changes the simulated revenue.
+    """
+    if outcome_type == "binary":
+        return simulate_experiment(
+            n_users_per_variant,
+            conversion_rates=conversion_rates[:n_variants],
+            covariate_correlation=covariate_correlation,
+            random_state=random_state,
         )
-
-    df = pd.DataFrame(data, columns=["Variant", "UserID", "Converted", "Revenue"])
-    return df
+    return simulate_experiment(
+        n_users_per_variant,
+        avg_order_values=avg_order_values[:n_variants],
+        revenue_std=20,
+        covariate_correlation=covariate_correlation,
+        random_state=random_state,
+    )
 
 
-# --- Statistical Test Functions (unchanged) ---
+# --- Statistical Test Functions ---
 def perform_t_test(df, group_col, value_col):
-    """Performs an independent samples t-test (Welch's)."""
-    groups = df[group_col].unique()
-    if len(groups) != 2:
+    """Performs an independent samples t-test (Welch's) from per-variant statistics."""
+    stats = ExperimentStats.from_frame(df, group_col, value_col, conversion_col=None)
+    if len(stats.variants) != 2:
         raise ValueError("T-test requires exactly two groups.")
-    group1 = df[df[group_col] == groups[0]][value_col]
-    group2 = df[df[group_col] == groups[1]][value_col]
-    t_statistic, p_value = ttest_ind(group1, group2, equal_var=False)
-
-    results = {
-        "test_type": "Independent Samples T-Test (Welch's)",
-        "t_statistic": t_statistic,
-        "p_value": p_value,
-        "group_1_mean": group1.mean(),
-        "group_2_mean": group2.mean(),
-    }
-    return results
+    return welch_t_test(stats)
 
 
 def perform_mann_whitney_u_test(df, group_col, value_col):
-    """Performs a Mann-Whitney U test (non-parametric)."""
-    groups = df[group_col].unique()
+    """Performs a Mann-Whitney U test (non-parametric).
+
+    Ranks need every observation, so unlike the other tests this one cannot
+    run from sufficient statistics; the groups are split in a single pass.
+    """
+    groups = [
+        values.to_numpy()
+        for _, values in df.groupby(group_col, observed=True)[value_col]
+    ]
     if len(groups) != 2:
         raise ValueError("Mann-Whitney U test requires exactly two groups.")
-    group1 = df[df[group_col] == groups[0]][value_col]
-    group2 = df[df[group_col] == groups[1]][value_col]
+    group1, group2 = groups
     u_statistic, p_value = mannwhitneyu(group1, group2, alternative="two-sided")
 
     results = {
         "test_type": "Mann-Whitney U Test (Non-parametric)",
         "u_statistic": u_statistic,
         "p_value": p_value,
-        "group_1_median": group1.median(),
-        "group_2_median": group2.median(),
+        "group_1_median": np.median(group1),
+        "group_2_median": np.median(group2),
     }
     return results
 
 
 def perform_chi2_test(df, group_col, outcome_col):
-    """Performs a Chi-Square test of independence."""
-    contingency_table = pd.crosstab(df[group_col], df[outcome_col])
-    chi2, p, dof, expected = chi2_contingency(contingency_table)
-
-    results = {
-        "test_type": "Chi-Square Test",
-        "Chi-Square Statistic": chi2,
-        "p_value": p,
-        "Degrees of Freedom": dof,
-        "Contingency Table": contingency_table,
-        "Expected Frequencies": expected,
-    }
-    return results
+    """Performs a Chi-Square test of independence from per-variant conversion counts."""
+    stats = ExperimentStats.from_frame(
+        df, group_col, value_col=None, conversion_col=outcome_col
+    )
+    return chi2_test(stats, outcome_name=outcome_col)
 
 
-# --- Sample Size Calculation Functions (unchanged) ---
+# --- Sample Size Calculation Functions ---
 def calculate_sample_size_binary(
     effect_size, base_rate, power=POWER_LEVEL_DEFAULT, alpha=ALPHA_LEVEL_DEFAULT
 ):
     """Calculates sample size needed for binary outcome A/B test."""
-    effect_size_power = smp.proportion_effectsize(base_rate, base_rate + effect_size)
-    sample_size = smp.NormalIndPower().solve_power(
-        effect_size=effect_size_power, power=power, alpha=alpha, ratio=1
+    return required_sample_size(
+        "proportion", base_rate, effect_size, alpha, power, relative=False
     )
-    return np.ceil(sample_size)
 
 
 def calculate_sample_size_continuous(
     effect_size, std_dev, power=POWER_LEVEL_DEFAULT, alpha=ALPHA_LEVEL_DEFAULT
 ):
     """Calculates sample size needed for continuous outcome A/B test."""
-    effect_size_power = effect_size / std_dev  # Cohen's d
-    sample_size = smp.TTestIndPower().solve_power(
-        effect_size=effect_size_power, power=power, alpha=alpha, ratio=1
+    return required_sample_size(
+        "mean", 0.0, effect_size, alpha, power, std=std_dev, relative=False
     )
-    return np.ceil(sample_size)
 
 
 # --- Streamlit UI Functions ---
@@ -155,6 +140,9 @@ def display_experiment_design_inputs(outcome_type):
     """Displays the UI elements for experiment design inputs and returns user inputs."""
     st.subheader("1. Experiment Design Parameters")
 
+    # Continuous-only inputs keep their defaults for binary outcomes
+    baseline_aov = BASELINE_AOV_DEFAULT
+    mde_absolute = MDE_ABSOLUTE_DEFAULT
     col1, col2 = st.columns(2)
     with col1:
         baseline_conversion_rate = st.number_input(
@@ -239,14 +227,22 @@ def display_sample_size_calculation(
     """Displays the sample size calculation and results."""
     st.subheader("2. Estimated Sample Size")
     if outcome_type == "binary":
-        effect_size_binary = baseline_conversion_rate * (mde_percent / 100)
+        base_rate = baseline_conversion_rate / 100
+        effect_size_binary = base_rate * (mde_percent / 100)
         sample_size_needed = calculate_sample_size_binary(
-            effect_size_binary, baseline_conversion_rate / 100, power_level, alpha_level
+            effect_size_binary, base_rate, power_level, alpha_level
         )
-        st.write(
+        st.markdown(
             f"Estimated Sample Size per Variant (for Binary Outcome - Conversion Rate): **{int(sample_size_needed)} users**",
             help="This is the *minimum* number of users you should aim to have in *each* variant (A and B) to have sufficient power to detect the MDE with your chosen significance and power levels.",
         )
+        # Relative MDEs from 1% to 50% on the current baseline
+        mde_grid = np.linspace(0.01, 0.5, 50)
+        grid = sample_size_grid(
+            "proportion", [base_rate], mde_grid, [alpha_level], GRID_POWER_LEVELS
+        )[0, :, 0, :]
+        mde_axis = 100 * mde_grid
+        mde_label = "MDE (Relative % Change)"
 
     elif outcome_type == "continuous":
         std_dev_aov = 20  # Fixed std dev for AOV for simplicity
@@ -254,10 +250,228 @@ def display_sample_size_calculation(
         sample_size_needed = calculate_sample_size_continuous(
             effect_size_continuous, std_dev_aov, power_level, alpha_level
         )
-        st.write(
+        st.markdown(
             f"Estimated Sample Size per Variant (for Continuous Outcome - Average Order Value): **{int(sample_size_needed)} users**",
             help="This is the *minimum* number of users per variant needed to detect the MDE in Average Order Value.",
         )
+        mde_axis = np.linspace(1, 50, 50)
+        grid = sample_size_grid(
+            "mean",
+            [baseline_aov],
+            mde_axis,
+            [alpha_level],
+            GRID_POWER_LEVELS,
+            std=std_dev_aov,
+            relative=False,
+        )[0, :, 0, :]
+        mde_label = "MDE (Absolute Change in AOV)"
+
+    # The whole MDE x power grid is solved in one vectorized call
+    grid_df = pd.DataFrame(grid, columns=[f"{p:.0%}" for p in GRID_POWER_LEVELS])
+    grid_df[mde_label] = mde_axis
+    fig = px.line(
+        grid_df.melt(
+            id_vars=mde_label, var_name="Power", value_name="Users per Variant"
+        ),
+        x=mde_label,
+        y="Users per Variant",
+        color="Power",
+        log_y=True,
+        title=f"Sample Size across MDEs and Power Levels (α = {alpha_level:.2f})",
+    )
+    st.plotly_chart(fig)
+
+
+def display_power_simulation(
+    outcome_type,
+    baseline_conversion_rate,
+    baseline_aov,
+    mde_percent,
+    mde_absolute,
+    power_level,
+    alpha_level,
+):
+    """Displays a Monte Carlo check of power and Type I error for the design."""
+    st.subheader("Simulated Power Check")
+    st.write(
+        "Instead of a single run, simulate thousands of experiments at once to see how often the test detects the MDE (power) and how often it fires when there is no effect (Type I error)."
+    )
+    col1, col2, col3 = st.columns(3)
+    n_users_power = col1.number_input(
+        "Users per Variant:",
+        min_value=10,
+        max_value=1_000_000,
+        value=N_USERS_PER_VARIANT_DEFAULT * 4,
+        step=100,
+        key="n_users_power",
+    )
+    n_trials = col2.select_slider(
+        "Simulated Experiments:",
+        options=[1_000, 5_000, 10_000, 50_000],
+        value=10_000,
+        key="n_trials_power",
+    )
+    if outcome_type == "binary":
+        metric = "binary"
+        baseline = baseline_conversion_rate / 100
+        effect = baseline * (mde_percent / 100)
+    else:
+        heavy_tailed = col3.checkbox(
+            "Heavy-tailed revenue (lognormal)",
+            key="heavy_tailed_power",
+            help="Real revenue is skewed: most users spend little and a few spend a lot.",
+        )
+        metric = "heavy-tailed" if heavy_tailed else "continuous"
+        baseline, effect = baseline_aov, mde_absolute
+
+    result = simulate_power(
+        metric,
+        int(n_users_power),
+        baseline,
+        effect,
+        n_trials=n_trials,
+        alpha=alpha_level,
+        std=20,  # Same fixed std dev as the sample size calculation
+        rng=np.random.default_rng(42),
+    )
+    summary = result.summary()
+    col1, col2, col3 = st.columns(3)
+    col1.metric(
+        "Empirical Power",
+        f"{summary['Empirical Power']:.1%}",
+        delta=f"{summary['Empirical Power'] - power_level:+.1%} vs target",
+    )
+    col2.metric("Type I Error", f"{summary['Type I Error']:.1%}")
+    col3.metric("Mean Significant Effect", f"{summary['Mean Significant Effect']:.4g}")
+    fig = px.histogram(
+        x=result.effects,
+        color=np.where(result.p_values < alpha_level, "Significant", "Not significant"),
+        nbins=60,
+        labels={"x": "Observed Effect (B - A)", "color": "Result"},
+        title=f"Observed Effects across {result.n_trials:,} Simulated Experiments",
+    )
+    fig.add_vline(x=effect, line_dash="dash", annotation_text="True effect")
+    st.plotly_chart(fig)
+
+
+def simulate_daily_increments(rng, n_experiments, users_per_day, metric, mean, std=20):
+    """Draws one day of per-experiment ``(n, sum, sum of squares)`` for one arm."""
+    n = np.full(n_experiments, users_per_day)
+    if metric == "binary":
+        conversions = rng.binomial(users_per_day, mean, size=n_experiments)
+        return n, conversions, conversions
+    # Normal sufficient statistics: the sum and the centered sum of squares
+    total = rng.normal(
+        users_per_day * mean, std * np.sqrt(users_per_day), n_experiments
+    )
+    m2 = std**2 * rng.chisquare(users_per_day - 1, size=n_experiments)
+    return n, total, m2 + total**2 / users_per_day
+
+
+def display_sequential_monitoring(
+    outcome_type,
+    baseline_conversion_rate,
+    baseline_aov,
+    mde_percent,
+    mde_absolute,
+    alpha_level,
+):
+    """Displays daily monitoring of many concurrent experiments with sequential tests."""
+    st.subheader("Sequential Monitoring (Peeking Safely)")
+    st.write(
+        "Checking a fixed-horizon p-value every day and stopping at the first significant result inflates false positives. Always-valid p-values (mSPRT) and group-sequential boundaries (alpha spending) stay valid however often you look. Each simulated experiment is updated from one day of summary statistics at a time."
+    )
+    col1, col2, col3 = st.columns(3)
+    n_experiments = col1.select_slider(
+        "Concurrent Experiments:",
+        options=[100, 1_000, 5_000, 20_000],
+        value=1_000,
+        key="n_experiments_sequential",
+    )
+    days = col2.slider("Days of Monitoring:", 7, 60, 28, key="days_sequential")
+    users_per_day = col3.number_input(
+        "Users per Variant per Day:",
+        min_value=10,
+        max_value=100_000,
+        value=N_USERS_PER_VARIANT_DEFAULT // 5,
+        step=10,
+        key="users_per_day_sequential",
+    )
+    spending = st.radio(
+        "Alpha Spending Function:",
+        ["O'Brien-Fleming", "Pocock"],
+        horizontal=True,
+        key="spending_sequential",
+    )
+
+    if not st.button("Run Sequential Monitoring", key="sequential_button"):
+        return
+
+    if outcome_type == "binary":
+        baseline = baseline_conversion_rate / 100
+        effect = baseline * (mde_percent / 100)
+    else:
+        baseline, effect = baseline_aov, mde_absolute
+
+    rng = np.random.default_rng(42)
+    results = {}
+    history = []
+    for scenario, treatment_mean in [
+        ("No effect (A/A)", baseline),
+        ("True effect = MDE", baseline + effect),
+    ]:
+        # The mixing scale is set to the effect size we hope to detect
+        monitor = SequentialMonitor(
+            n_experiments, tau=effect, alpha=alpha_level, spending=spending
+        )
+        peeked = np.zeros(n_experiments, dtype=bool)
+        for day in range(1, days + 1):
+            monitor.update(
+                *simulate_daily_increments(
+                    rng, n_experiments, int(users_per_day), outcome_type, baseline
+                ),
+                *simulate_daily_increments(
+                    rng, n_experiments, int(users_per_day), outcome_type, treatment_mean
+                ),
+                information_fraction=day / days,
+            )
+            peeked |= monitor.naive_p_value < alpha_level
+            if scenario == "True effect = MDE":
+                history.append(
+                    {
+                        "Day": day,
+                        "Naive p-value": monitor.naive_p_value[0],
+                        "Always-valid p-value": monitor.p_value[0],
+                    }
+                )
+        results[scenario] = {
+            "Daily peeking (naive)": peeked.mean(),
+            "Fixed horizon (final day only)": (
+                monitor.naive_p_value < alpha_level
+            ).mean(),
+            "mSPRT (always valid)": monitor.rejected.mean(),
+            f"Group sequential ({spending})": monitor.boundary_crossed.mean(),
+        }
+
+    st.write("**Share of experiments declared significant:**")
+    st.dataframe(pd.DataFrame(results).style.format("{:.1%}"))
+    st.markdown(
+        "Under **No effect** this is the false positive rate (it should stay near alpha); under **True effect** it is the power.",
+    )
+    fig = px.line(
+        pd.DataFrame(history).melt(
+            id_vars="Day", var_name="Statistic", value_name="p-value"
+        ),
+        x="Day",
+        y="p-value",
+        color="Statistic",
+        log_y=True,
+        title="One Experiment with a True Effect, Checked Daily",
+    )
+    fig.add_hline(y=alpha_level, line_dash="dash", annotation_text="alpha")
+    st.plotly_chart(fig)
+    st.write(f"**Group-sequential boundaries ({spending}, one look per day):**")
+    st.dataframe(monitor.boundary.to_frame())
 
 
 def display_simulation_and_analysis(
@@ -291,6 +505,15 @@ def display_simulation_and_analysis(
         key="n_users_sim",
         help="Enter the number of users you want to simulate in each variant for this run.  This can be greater than the calculated minimum sample size.",
     )
+    pre_period_correlation = st.slider(
+        "Pre-Period Covariate Correlation (for CUPED):",
+        min_value=0.0,
+        max_value=0.95,
+        value=0.6,
+        step=0.05,
+        key="pre_period_correlation",
+        help="Correlation between each user's pre-experiment metric and their outcome. CUPED removes the part of the outcome's variance explained by it.",
+    )
 
     alpha_level = (
         st.session_state.alpha_level
@@ -303,6 +526,7 @@ def display_simulation_and_analysis(
                 n_users_per_variant=n_users_variant,
                 conversion_rates=conversion_rates,
                 outcome_type=outcome_type,
+                covariate_correlation=pre_period_correlation,
             )
             test_results = perform_chi2_test(df_ab, "Variant", "Converted")
             metric_name = "Conversion Rate"
@@ -317,6 +541,7 @@ def display_simulation_and_analysis(
                 avg_order_values=avg_order_values,
                 effect_type="absolute",
                 outcome_type=outcome_type,
+                covariate_correlation=pre_period_correlation,
             )
             if st.checkbox(
                 "Assume data is NOT normally distributed (use Mann-Whitney U Test)",
@@ -344,6 +569,11 @@ def display_simulation_and_analysis(
             outcome_type,
             df_ab,
         )
+        display_cuped_results(
+            df_ab,
+            "Converted" if outcome_type == "binary" else "Revenue",
+            alpha_level,
+        )
 
 
 def display_simulation_results(
@@ -407,6 +637,98 @@ def display_simulation_results(
     st.plotly_chart(fig)
 
 
+def display_cuped_results(df_ab, value_col, alpha_level):
+    """Displays raw vs CUPED-adjusted estimates using the pre-period covariate."""
+    st.subheader("Variance Reduction with CUPED")
+    st.write(
+        "CUPED (Controlled-experiment Using Pre-Experiment Data) subtracts theta × (pre-period metric − its mean) from each user's outcome. The effect estimate stays unbiased, but its variance shrinks by roughly the squared correlation, so the same precision needs fewer users."
+    )
+    result = cuped_test(
+        CupedStats.from_frame(df_ab, "Variant", value_col, "Pre-Period Metric"),
+        alpha=alpha_level,
+    )
+    scale = 100 if value_col == "Converted" else 1  # Conversions in percentage points
+    st.dataframe(
+        pd.DataFrame(
+            {
+                estimate: {
+                    "Effect (B - A)": result[key]["effect"] * scale,
+                    "Standard Error": result[key]["standard_error"] * scale,
+                    f"{1 - alpha_level:.0%} CI Lower": result[key]["ci_lower"] * scale,
+                    f"{1 - alpha_level:.0%} CI Upper": result[key]["ci_upper"] * scale,
+                    "P-value": result[key]["p_value"],
+                }
+                for estimate, key in [("Raw", "raw"), ("CUPED", "adjusted")]
+            }
+        ).T
+    )
+    col1, col2 = st.columns(2)
+    col1.metric("Theta", f"{result['theta']:.4g}")
+    col2.metric(
+        "Variance Reduction",
+        f"{result['variance_reduction']:.1%}",
+        help="Equivalent to running the raw test with this much more traffic.",
+    )
+
+
+def display_batch_analysis(alpha_level):
+    """Displays batch analysis of many concurrent experiments with multiple-testing correction."""
+    st.subheader("4. Analyze a Batch of Concurrent Experiments")
+    st.write(
+        "Testing hundreds of experiments at alpha = 5% yields false positives by chance alone. Analyze the whole batch at once (spread over worker processes) and control the family-wise error rate (Holm, Bonferroni) or the false discovery rate (Benjamini-Hochberg)."
+    )
+    uploaded = st.file_uploader(
+        "Experiment summary table (CSV, optional):",
+        type="csv",
+        key="batch_upload",
+        help=f"One row per experiment with columns: {', '.join(EXPERIMENT_COLUMNS)}. Without a file, a batch of conversion experiments is simulated.",
+    )
+    col1, col2 = st.columns(2)
+    correction = col1.radio(
+        "Correction:", list(CORRECTION_METHODS), horizontal=True, key="batch_correction"
+    )
+    n_experiments = col2.select_slider(
+        "Simulated Experiments:",
+        options=[100, 500, 1_000, 5_000],
+        value=500,
+        key="batch_n_experiments",
+        disabled=uploaded is not None,
+    )
+
+    if st.button("Analyze Batch", key="batch_button"):
+        experiments = (
+            read_csv(uploaded)
+            if uploaded is not None
+            else simulate_experiment_table(
+                n_experiments, n_per_variant=20_000, rng=np.random.default_rng(42)
+            )
+        )
+        results = analyze_batch(experiments, correction=correction, alpha=alpha_level)
+        if results.empty:
+            st.warning("No experiments to analyze.")
+            return
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Experiments", f"{len(results):,}")
+        col2.metric(
+            "Significant (uncorrected)", f"{(results['P-value'] < alpha_level).sum():,}"
+        )
+        col3.metric(f"Significant ({correction})", f"{results['Significant'].sum():,}")
+        if "true_effect" in experiments:
+            st.write("**Corrected discoveries vs. the simulated truth:**")
+            st.dataframe(
+                pd.crosstab(
+                    experiments["true_effect"].map({True: "Real effect", False: "A/A"}),
+                    results["Significant"].map(
+                        {True: "Significant", False: "Not significant"}
+                    ),
+                )
+            )
+        st.dataframe(results)
+        st.caption(
+            f"Total analysis time {results['Seconds'].sum():.2f}s across all experiments."
+        )
+
+
 def display_practice_exercises():
     """Displays the practice exercises section."""
     st.header("💪 Practice Exercises")
@@ -594,9 +916,27 @@ def main():
         power_level,
         alpha_level,
     )
+    display_power_simulation(
+        outcome_type,
+        baseline_conversion_rate,
+        baseline_aov,
+        mde_percent,
+        mde_absolute,
+        power_level,
+        alpha_level,
+    )
+    display_sequential_monitoring(
+        outcome_type,
+        baseline_conversion_rate,
+        baseline_aov,
+        mde_percent,
+        mde_absolute,
+        alpha_level,
+    )
     display_simulation_and_analysis(
         outcome_type, baseline_conversion_rate, baseline_aov, mde_percent, mde_absolute
     )
+    display_batch_analysis(alpha_level)
 
     display_practice_exercises()
     display_real_world_applications()
@@ -4,10 +4,13 @@ import streamlit as st
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
+from utils.cache_utils import cache_dataset
+from utils.rng_utils import get_rng
 
 # --- Data Generation Functions ---
 
 
+@cache_dataset
 def generate_demand_data(
     n_periods=365,
     base_demand=100,
@@ -17,11 +20,11 @@ def generate_demand_data(
     random_state=42,
 ):
     """Generates synthetic daily demand data with trend, seasonality, and noise."""
-    np.random.seed(random_state)
+    rng = get_rng("demand_forecasting", seed=random_state)
     time = np.arange(n_periods)
     trend = time * trend_strength * base_demand / n_periods  # Gradual trend over time
     seasonality = np.sin(2 * np.pi * time / 365) * seasonality_strength * base_demand
-    noise = np.random.randn(n_periods) * noise_level * base_demand
+    noise = rng.standard_normal(n_periods) * noise_level * base_demand
     demand = base_demand + trend + seasonality + noise
     demand = np.maximum(demand, 10)  # Ensure demand is non-negative and reasonable min
     date_rng = pd.date_range(start="2023-01-01", periods=n_periods)
@@ -2,10 +2,13 @@ import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
+from utils.cache_utils import cache_dataset
+from utils.rng_utils import get_rng
 
 # --- Data Generation Functions ---
 
 
+@cache_dataset
 def generate_demand_data(
     n_periods=365,
     base_demand=100,
@@ -14,10 +17,10 @@ def generate_demand_data(
     random_state=42,
 ):
     """Generates synthetic daily demand data with seasonality and noise."""
-    np.random.seed(random_state)
+    rng = get_rng("supply_chain", "demand", seed=random_state)
     time = np.arange(n_periods)
     seasonality = np.sin(2 * np.pi * time / 365) * seasonality_strength * base_demand
-    noise = np.random.randn(n_periods) * noise_level * base_demand
+    noise = rng.standard_normal(n_periods) * noise_level * base_demand
     demand = base_demand + seasonality + noise
     demand = np.maximum(demand, 10)  # Ensure demand is non-negative and reasonable min
     date_rng = pd.date_range(start="2023-01-01", periods=n_periods)
@@ -8,9 +8,13 @@ from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 from statsmodels.tsa.arima.model import ARIMA
 from statsmodels.tsa.seasonal import seasonal_decompose
 from statsmodels.tsa.stattools import adfuller
+from utils.cache_utils import cache_dataset
+from utils.io_utils import read_csv
+from utils.rng_utils import get_rng
 
 
 # Function to generate synthetic time series data
+@cache_dataset
 def generate_time_series_data(
     n_periods=200,
     trend_slope=0.5,
@@ -18,13 +22,13 @@ def generate_time_series_data(
     noise_level=10,
     random_state=42,
 ):
-    np.random.seed(random_state)
+    rng = get_rng("time_series", seed=random_state)
     time = np.arange(n_periods)
     trend = trend_slope * time
     seasonality = seasonality_strength * np.sin(
         2 * np.pi * time / 12
     )  # Assume yearly seasonality
-    noise = np.random.randn(n_periods) * noise_level
+    noise = rng.standard_normal(n_periods) * noise_level
     data = trend + seasonality + noise
     date_rng = pd.date_range(
         start="2023-01-01", periods=n_periods, freq="M"
@@ -148,7 +152,7 @@ def main():
         uploaded_file = st.file_uploader("Upload a CSV file", type=["csv"])
         if uploaded_file is not None:
             try:
-                df = pd.read_csv(uploaded_file, index_col=0, parse_dates=True)
+                df = read_csv(uploaded_file, index_col=0, parse_dates=True)
                 # Handle common date parsing issues:
                 if df.index.inferred_type == "string":  # If not parsed as dates...
                     df.index = pd.to_datetime(
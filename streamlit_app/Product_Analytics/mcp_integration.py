@@ -21,7 +21,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Optional
 
+import pandas as pd
 import streamlit as st
+from utils.experiment_utils import CupedStats, cuped_test, reduce_cuped
+from utils.power_utils import get_sample_size_table
 
 # For direct integration (without running MCP server separately)
 # We can import the tools directly
@@ -170,7 +173,10 @@ class MCPSampleSizeCalculator:
     ) -> dict[str, Any]:
         """Calculate sample size for A/B test."""
         if not MCP_AVAILABLE:
-            return self._fallback_calculation(baseline_value, minimum_detectable_effect)
+            return self._fallback_calculation(
+                metric_type, baseline_value, minimum_detectable_effect,
+                standard_deviation, alpha, power
+            )
         
         args = {
             "metric_type": metric_type,
@@ -184,11 +190,18 @@ class MCPSampleSizeCalculator:
         
         return await stats_tools.calculate_sample_size(args, self.config)
     
-    def _fallback_calculation(self, baseline: float, mde: float) -> dict[str, Any]:
-        """Simple fallback calculation."""
-        # Rough approximation
-        effect = baseline * mde
-        n = int(16 * (baseline * (1 - baseline)) / (effect ** 2))
+    def _fallback_calculation(
+        self,
+        metric_type: str,
+        baseline: float,
+        mde: float,
+        standard_deviation: Optional[float] = None,
+        alpha: float = 0.05,
+        power: float = 0.8
+    ) -> dict[str, Any]:
+        """Local fallback calculation from the precomputed sample-size table."""
+        table = get_sample_size_table(metric_type)
+        n = int(table.lookup(baseline, mde, alpha, power, std=standard_deviation))
         return {
             "sample_size": {
                 "per_variant": n,
@@ -462,21 +475,41 @@ class MCPABScenario:
         )
 
     async def analyze_results(self, control_n: int, control_conv: int,
-                               treatment_n: int, treatment_conv: int) -> dict:
+                               treatment_n: int, treatment_conv: int,
+                               covariate_stats: Optional[CupedStats] = None) -> dict:
+        """Analyzes conversion counts; ``covariate_stats`` (control first) adds a CUPED estimate."""
         if not MCP_AVAILABLE:
             p_ctrl = control_conv / control_n if control_n else 0
             p_trt = treatment_conv / treatment_n if treatment_n else 0
-            return {
+            result = {
                 "summary": {"control_rate": f"{p_ctrl:.2%}", "treatment_rate": f"{p_trt:.2%}"},
                 "statistical_analysis": {"p_value": 0.05, "significant_at_05": True},
                 "recommendation": "Insufficient data for MCP analysis (fallback mode).",
             }
-        return await ab_testing_tools.analyze_ab_results(
-            {"control_conversions": control_conv, "control_total": control_n,
-             "treatment_conversions": treatment_conv, "treatment_total": treatment_n,
-             "metric_type": "proportion"},
-            self.config,
-        )
+        else:
+            result = await ab_testing_tools.analyze_ab_results(
+                {"control_conversions": control_conv, "control_total": control_n,
+                 "treatment_conversions": treatment_conv, "treatment_total": treatment_n,
+                 "metric_type": "proportion"},
+                self.config,
+            )
+        if covariate_stats is not None and "error" not in result:
+            result["cuped"] = self._cuped_summary(covariate_stats)
+        return result
+
+    @staticmethod
+    def _cuped_summary(covariate_stats: CupedStats) -> dict:
+        """Formats the CUPED-adjusted lift next to the raw one."""
+        test = cuped_test(covariate_stats)
+        raw, adjusted = test["raw"], test["adjusted"]
+        return {
+            "theta": test["theta"],
+            "raw_lift": f"{raw['effect']:+.2%}",
+            "adjusted_lift": f"{adjusted['effect']:+.2%}",
+            "adjusted_ci": f"{adjusted['ci_lower']:+.2%} to {adjusted['ci_upper']:+.2%}",
+            "adjusted_p_value": adjusted["p_value"],
+            "variance_reduction": f"{test['variance_reduction']:.1%}",
+        }
 
     async def detect_pitfalls(self, description: str, unit: str = "user",
                                duration: int = 14, traffic_pct: float = 50.0) -> dict:
@@ -506,12 +539,35 @@ def render_ab_analysis_panel():
         trt_n = st.number_input("Total visitors (Treatment)", min_value=1, value=50000, key="ab_trt_n")
         trt_conv = st.number_input("Conversions (Treatment)", min_value=0, value=2750, key="ab_trt_conv")
 
+    with st.expander("Optional: CUPED adjustment with a pre-period covariate"):
+        uploaded = st.file_uploader(
+            "Per-user results (CSV)", type="csv", key="ab_cuped_upload",
+            help="One row per user. Variants are taken in sorted order, the first being the control.",
+        )
+        cuped_cols = ("Variant", "Revenue", "Pre-Period Metric")
+        if uploaded is not None:
+            columns = list(pd.read_csv(uploaded, nrows=0).columns)
+            cuped_cols = tuple(
+                st.selectbox(label, columns, index=columns.index(default) if default in columns else 0,
+                             key=f"ab_cuped_{default}")
+                for label, default in zip(["Variant column", "Metric column", "Pre-period covariate column"],
+                                          cuped_cols)
+            )
+
     if st.button("Analyze Results", type="primary", key="ab_analyze_btn"):
         if "ab_scenario" not in st.session_state:
             st.session_state.ab_scenario = MCPABScenario()
+        covariate_stats = None
+        if uploaded is not None:
+            uploaded.seek(0)
+            covariate_stats = reduce_cuped(pd.read_csv(uploaded, chunksize=100_000), *cuped_cols)
+            if len(covariate_stats.variants) != 2:
+                st.error(f"Expected two variants for CUPED, found {len(covariate_stats.variants)}.")
+                return
         with st.spinner("Analyzing..."):
             result = asyncio.run(
-                st.session_state.ab_scenario.analyze_results(ctrl_n, ctrl_conv, trt_n, trt_conv)
+                st.session_state.ab_scenario.analyze_results(ctrl_n, ctrl_conv, trt_n, trt_conv,
+                                                             covariate_stats)
             )
         if "error" in result:
             st.error(result["error"]["message"])
@@ -532,6 +588,12 @@ def render_ab_analysis_panel():
                 st.info(f"**95% CI:** {ci.get('lower_bound')} to {ci.get('upper_bound')}  \n"
                         f"{ci.get('interpretation', '')}")
 
+            if "cuped" in result:
+                cuped = result["cuped"]
+                st.info(f"**CUPED-adjusted lift:** {cuped['adjusted_lift']} "
+                        f"(95% CI {cuped['adjusted_ci']}, p={cuped['adjusted_p_value']:.4f})  \n"
+                        f"Pre-period covariate removed {cuped['variance_reduction']} of the variance.")
+
             rec = result.get("recommendation", "")
             if rec:
                 if sig:
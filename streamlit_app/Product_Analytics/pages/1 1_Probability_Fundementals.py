@@ -1,38 +1,9 @@
-import random
 from itertools import product  # for sample space generation
 
 import pandas as pd
 import plotly.express as px  # For Venn Diagram and other charts
 import streamlit as st
-
-
-def generate_dice_roll(num_rolls=1):
-    """Simulates dice rolls and returns outcomes.
-
-    Args:
-        num_rolls (int): The number of dice rolls to simulate.
-
-    Returns:
-        list: A list of integer outcomes from each dice roll (1 to 6).
-    """
-    return [random.randint(1, 6) for _ in range(num_rolls)]
-
-
-def calculate_empirical_probability(outcomes, event):
-    """Calculates empirical probability of an event given outcomes.
-
-    Args:
-        outcomes (list): A list of outcomes from an experiment.
-        event (function): A function that takes an outcome and returns True if it's a favorable outcome for the event, False otherwise.
-
-    Returns:
-        float: The empirical probability of the event.
-    """
-    favorable_outcomes = sum(1 for outcome in outcomes if event(outcome))
-    total_outcomes = len(outcomes)
-    if total_outcomes == 0:
-        return 0
-    return favorable_outcomes / total_outcomes
+from utils.simulation_utils import dice_sum_counts, empirical_probability
 
 
 def main():
@@ -144,7 +115,7 @@ def main():
         num_dice_rolls = st.slider(
             "Number of Dice Rolls:",
             min_value=10,
-            max_value=10000,
+            max_value=100_000_000,
             value=1000,
             step=100,
             help="Increase rolls for empirical probability to approach theoretical (1/6)",
@@ -158,9 +129,9 @@ def main():
 
         if st.button("Simulate Dice Rolls"):
             with st.spinner(f"Rolling dice {num_dice_rolls} times..."):
-                dice_outcomes = generate_dice_roll(num_dice_rolls)
-                event_probability = calculate_empirical_probability(
-                    dice_outcomes, lambda x: x == target_number
+                face_counts = dice_sum_counts(num_dice_rolls)  # Index = face
+                event_probability = empirical_probability(
+                    face_counts, lambda x: x == target_number
                 )
                 theoretical_probability = 1 / 6  # For a fair die
 
@@ -174,10 +145,9 @@ def main():
                     "*Notice how as you increase the number of rolls, the empirical probability gets closer to the theoretical probability (Law of Large Numbers)*"
                 )
 
-                counts = pd.Series(dice_outcomes).value_counts().sort_index()
                 fig = px.bar(
-                    x=counts.index,
-                    y=counts.values,
+                    x=list(range(1, 7)),
+                    y=face_counts[1:],
                     labels={"x": "Dice Outcome", "y": "Frequency"},
                     title="Distribution of Dice Roll Outcomes",
                 )  # plotly for interactive chart
@@ -475,7 +445,7 @@ def main():
         num_dice_rolls_demo = st.slider(
             "Number of Dice Rolls for Demo:",
             min_value=10,
-            max_value=10000,
+            max_value=100_000_000,
             value=1000,
             step=100,
             key="empirical_demo_slider",
@@ -489,9 +459,9 @@ def main():
 
         if st.button("Run Probability Demo"):
             with st.spinner("Simulating..."):
-                dice_outcomes_demo = generate_dice_roll(num_dice_rolls_demo)
-                empirical_prob_demo = calculate_empirical_probability(
-                    dice_outcomes_demo, lambda x: x == target_number_demo
+                face_counts_demo = dice_sum_counts(num_dice_rolls_demo)
+                empirical_prob_demo = empirical_probability(
+                    face_counts_demo, lambda x: x == target_number_demo
                 )
                 theoretical_prob_demo = 1 / 6
 
@@ -646,7 +616,7 @@ def main():
         num_virtual_dice_rolls = st.slider(
             "Number of Virtual Dice Rolls:",
             min_value=100,
-            max_value=10000,
+            max_value=100_000_000,
             value=1000,
             step=100,
             key="dice_sum_slider",
@@ -654,11 +624,9 @@ def main():
 
         if st.button("Simulate Two Dice Rolls and Show Distribution"):
             with st.spinner("Rolling virtual dice..."):
-                two_dice_sums = [
-                    sum(generate_dice_roll(num_rolls=2))
-                    for _ in range(num_virtual_dice_rolls)
-                ]  # Simulate sum of two dice
-                sum_counts = pd.Series(two_dice_sums).value_counts().sort_index()
+                # Simulate sum of two dice, tallied by total (index 2..12)
+                sum_totals = dice_sum_counts(num_virtual_dice_rolls, num_dice=2)
+                sum_counts = pd.Series(sum_totals[2:], index=range(2, 13))
 
                 theoretical_probs = {
                     i: 0 for i in range(2, 13)
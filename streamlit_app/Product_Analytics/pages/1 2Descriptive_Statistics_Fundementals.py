@@ -5,7 +5,6 @@ import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
-from numpy import random
 from scipy.stats import (
     bernoulli,
     binom,
@@ -18,6 +17,13 @@ from scipy.stats import (
     t,
     uniform,
 )
+from utils.simulation_utils import (
+    CLT_POPULATIONS,
+    plot_indices,
+    roll_dice,
+    running_mean,
+    sample_means,
+)
 
 
 def generate_bernoulli_samples(p, size):
@@ -72,7 +78,7 @@ def generate_t_samples(df, size):
 
 def generate_dice_roll(num_rolls=1):
     """Simulates dice rolls."""
-    return [random.randint(1, 6) for _ in range(num_rolls)]
+    return roll_dice(num_rolls)
 
 
 def calculate_empirical_probability(outcomes, event):
@@ -1520,25 +1526,21 @@ def main():
         num_trials_lln = st.slider(
             "Number of Trials (LLN Demo):",
             min_value=100,
-            max_value=10000,
+            max_value=1_000_000,
             value=1000,
             step=100,
             key="lln_slider",
         )
 
         if st.button("Run LLN Demo (Dice Rolls)"):
-            cumulative_means = []
             dice_rolls_lln = generate_dice_roll(num_trials_lln)
-
-            for i in range(1, num_trials_lln + 1):
-                sample = dice_rolls_lln[:i]
-                sample_mean = np.mean(sample)
-                cumulative_means.append(sample_mean)
+            cumulative_means = running_mean(dice_rolls_lln)
+            shown = plot_indices(num_trials_lln)  # Plotting every roll is too slow
 
             fig_lln, ax_lln = plt.subplots()
             ax_lln.plot(
-                range(1, num_trials_lln + 1),
-                cumulative_means,
+                shown + 1,
+                cumulative_means[shown],
                 label="Cumulative Sample Mean",
             )
             ax_lln.axhline(y=3.5, color="r", linestyle="--", label="True Mean (3.5)")
@@ -1566,39 +1568,33 @@ def main():
         num_samples_clt = st.slider(
             "Number of Samples (CLT Demo):",
             min_value=100,
-            max_value=5000,
+            max_value=1_000_000,
             value=1000,
             step=100,
             key="clt_num_samples",
         )
         population_dist_clt = st.selectbox(
             "Choose Population Distribution:",
-            ["Uniform (Discrete)", "Exponential"],
+            CLT_POPULATIONS,
             index=0,
             key="clt_dist_select",
         )
 
         if st.button("Run CLT Demo"):
-            sample_means_clt = []
             with st.spinner("Simulating Central Limit Theorem..."):
-                for _ in range(num_samples_clt):
-                    if population_dist_clt == "Uniform (Discrete)":
-                        population_samples = [
-                            random.randint(1, 6) for _ in range(sample_size_clt)
-                        ]  # Discrete Uniform (Dice)
-                    elif population_dist_clt == "Exponential":
-                        population_samples = np.random.exponential(
-                            scale=1, size=sample_size_clt
-                        )  # Exponential (mean=1)
-                    sample_mean_clt = np.mean(population_samples)
-                    sample_means_clt.append(sample_mean_clt)
-
-                fig_clt = px.histogram(
-                    sample_means_clt,
-                    nbins=30,
+                # Discrete Uniform (Dice) or Exponential (mean=1)
+                sample_means_clt = sample_means(
+                    population_dist_clt, num_samples_clt, sample_size_clt
+                )
+                # Bin before plotting so millions of means stay light in the browser
+                counts, edges = np.histogram(sample_means_clt, bins=30)
+                fig_clt = px.bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=counts,
                     title=f"Central Limit Theorem Demo (Population: {population_dist_clt}, Sample Size n={sample_size_clt})",
-                    labels={"value": "Sample Mean", "count": "Frequency"},
+                    labels={"x": "Sample Mean", "y": "Frequency"},
                 )
+                fig_clt.update_traces(width=edges[1] - edges[0])
                 st.plotly_chart(fig_clt)
                 st.info(
                     "Notice how the distribution of sample means becomes approximately Normal (bell-shaped) as the number of samples increases, even if the original population distribution is not Normal (like Uniform or Exponential)."
@@ -5,27 +5,33 @@ import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
+from utils.cache_utils import shared_dataset
+from utils.io_utils import read_csv
+from utils.rng_utils import get_rng
 
 # --- Helper Functions ---
 
 
+@shared_dataset
 def generate_example_data():
-    np.random.seed(42)
+    rng = get_rng("data_visualization", "example")
     n = 1000
     data = pd.DataFrame(
         {
-            "SessionDuration": np.random.randn(n),  # More descriptive names
-            "PurchaseAmount": np.random.randn(n) * 2 + 1,
-            "ProductRating": np.random.exponential(scale=2, size=n),
-            "UserCategory": np.random.choice(["New", "Returning", "VIP"], size=n),
-            "DeviceType": np.random.choice(["Mobile", "Desktop"], size=n),
+            "SessionDuration": rng.standard_normal(n),  # More descriptive names
+            "PurchaseAmount": rng.standard_normal(n) * 2 + 1,
+            "ProductRating": rng.exponential(scale=2, size=n),
+            "UserCategory": rng.choice(["New", "Returning", "VIP"], size=n),
+            "DeviceType": rng.choice(["Mobile", "Desktop"], size=n),
             "Date": pd.date_range("2023-01-01", periods=n, freq="D"),
-            "DailyClicks": np.cumsum(np.random.randn(n)) + 50,
-            "UserGroup": np.random.choice(["GroupX", "GroupY", "GroupZ"], size=n),
-            "ExperimentGroup": np.random.choice(["Control", "Treatment"], size=n),
+            "DailyClicks": np.cumsum(rng.standard_normal(n)) + 50,
+            "UserGroup": rng.choice(["GroupX", "GroupY", "GroupZ"], size=n),
+            "ExperimentGroup": rng.choice(["Control", "Treatment"], size=n),
         }
     )
-    data["MarketingSpend"] = data["SessionDuration"] * 0.5 + np.random.randn(n) * 0.5
+    data["MarketingSpend"] = (
+        data["SessionDuration"] * 0.5 + rng.standard_normal(n) * 0.5
+    )
     return data
 
 
@@ -37,7 +43,7 @@ def load_data(data_source: str) -> Optional[pd.DataFrame]:
         uploaded_file = st.file_uploader("Upload a CSV file", type=["csv"])
         if uploaded_file:
             try:
-                df = pd.read_csv(uploaded_file)
+                df = read_csv(uploaded_file)
                 df.dropna(
                     subset=df.select_dtypes(include=np.number).columns, inplace=True
                 )
@@ -50,7 +56,7 @@ def load_data(data_source: str) -> Optional[pd.DataFrame]:
         csv_data = st.text_area("Paste your CSV data here:", height=200)
         if csv_data:
             try:
-                df = pd.read_csv(StringIO(csv_data))
+                df = read_csv(StringIO(csv_data))
                 df.dropna(
                     subset=df.select_dtypes(include=np.number).columns, inplace=True
                 )
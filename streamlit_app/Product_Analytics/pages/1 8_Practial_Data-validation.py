@@ -3,9 +3,13 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 import streamlit as st
+from utils.cache_utils import shared_dataset
+from utils.io_utils import read_csv
+from utils.rng_utils import get_rng
 
 
 # Function to simulate different data issues
+@shared_dataset
 def create_dirty_data(
     n_rows=100,
     missing_rate=0.1,
@@ -13,42 +17,40 @@ def create_dirty_data(
     inconsistency_rate=0.05,
     random_state=42,
 ):
-    np.random.seed(random_state)
+    rng = get_rng("data_validation", "dirty_data", seed=random_state)
     data = {
-        "Age": np.random.randint(18, 70, n_rows),
-        "Income": np.random.randint(20000, 100000, n_rows),
-        "Purchase": np.random.choice(["Yes", "No"], n_rows),
-        "Rating": np.random.randint(1, 6, n_rows),
+        "Age": rng.integers(18, 70, n_rows),
+        "Income": rng.integers(20000, 100000, n_rows),
+        "Purchase": rng.choice(["Yes", "No"], n_rows),
+        "Rating": rng.integers(1, 6, n_rows),
         "Date": pd.to_datetime("2024-01-01")
-        + pd.to_timedelta(np.random.randint(0, 365, n_rows), unit="D"),
+        + pd.to_timedelta(rng.integers(0, 365, n_rows), unit="D"),
     }
     df = pd.DataFrame(data)
 
     # Introduce missing values
     for col in df.columns:
-        mask = np.random.choice(
-            [True, False], n_rows, p=[missing_rate, 1 - missing_rate]
-        )
+        mask = rng.choice([True, False], n_rows, p=[missing_rate, 1 - missing_rate])
         df.loc[mask, col] = np.nan
 
     # Introduce outliers (in numerical columns)
     for col in ["Age", "Income"]:
         num_outliers = int(n_rows * outlier_rate)
-        outlier_indices = np.random.choice(df.index, num_outliers, replace=False)
-        df.loc[outlier_indices, col] *= np.random.choice(
+        outlier_indices = rng.choice(df.index, num_outliers, replace=False)
+        df.loc[outlier_indices, col] *= rng.choice(
             [5, -5], num_outliers
         )  # make them very high
 
     # Introduce inconsistencies (in categorical and date columns)
     df["Purchase"] = df["Purchase"].str.lower()
-    inconsistency_indices = np.random.choice(
+    inconsistency_indices = rng.choice(
         df.index, int(n_rows * inconsistency_rate), replace=False
     )
     df.loc[inconsistency_indices, "Purchase"] = df.loc[
         inconsistency_indices, "Purchase"
     ].str.upper()
 
-    date_inconsistency_indices = np.random.choice(
+    date_inconsistency_indices = rng.choice(
         df.index, int(n_rows * inconsistency_rate), replace=False
     )
     df.loc[date_inconsistency_indices, "Date"] = df.loc[
@@ -138,7 +140,8 @@ def main():
         uploaded_file = st.file_uploader("Upload a CSV file", type=["csv"])
         if uploaded_file is not None:
             try:
-                df = pd.read_csv(uploaded_file)
+                # Plain strings: the cleaning steps below rewrite category values
+                df = read_csv(uploaded_file, categories=False)
                 st.write("Uploaded Data:")
                 st.dataframe(df)
             except Exception as e:
@@ -171,18 +174,19 @@ def main():
                 else:
                     for col in df.columns:
                         if df[col].isnull().any():
-                            if df[col].dtype in ["int64", "float64"]:
+                            if pd.api.types.is_numeric_dtype(df[col]):
                                 if missing_value_handling == "Impute (Mean)":
-                                    df[col].fillna(df[col].mean(), inplace=True)
+                                    df[col] = df[col].fillna(df[col].mean())
                                 elif missing_value_handling == "Impute (Median)":
-                                    df[col].fillna(df[col].median(), inplace=True)
+                                    df[col] = df[col].fillna(df[col].median())
 
                             elif (
-                                df[col].dtype == "object"
-                                or df[col].dtype == "datetime64[ns]"
+                                pd.api.types.is_object_dtype(df[col])
+                                or pd.api.types.is_string_dtype(df[col])
+                                or pd.api.types.is_datetime64_any_dtype(df[col])
                             ):  # Categorical and datetime
                                 if missing_value_handling == "Impute (Mode)":
-                                    df[col].fillna(df[col].mode()[0], inplace=True)
+                                    df[col] = df[col].fillna(df[col].mode()[0])
 
                 st.write("Data after handling missing values:")
                 st.dataframe(df)
@@ -204,8 +208,7 @@ def main():
                 )
                 if outlier_handling == "Remove":
                     # Simple outlier removal using IQR
-                    Q1 = df[col].quantile(0.25)
-                    Q3 = df[col].quantile(0.75)
+                    Q1, Q3 = df[col].quantile([0.25, 0.75])  # One sort for both
                     IQR = Q3 - Q1
                     lower_bound = Q1 - 1.5 * IQR
                     upper_bound = Q3 + 1.5 * IQR
@@ -1,13 +1,24 @@
-import random
+from collections import Counter
+from itertools import chain
 
-import folium
 import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
-from sklearn.cluster import DBSCAN
-from sklearn.preprocessing import StandardScaler
 from streamlit_folium import folium_static
+from utils.anomaly_utils import (
+    ANOMALY_SCORERS,
+    EXACT_FIT_MAX_POINTS,
+    DensityAnomalyScorer,
+    score_anomaly_stream,
+)
+from utils.fraud_utils import (
+    SlidingWindowVelocity,
+    generate_transactions,
+    iter_transaction_chunks,
+)
+from utils.geo_utils import aggregate_by_location, build_cluster_map
+from utils.rule_utils import RuleSet, hour_between, one_of, threshold
 
 
 def generate_transaction_data(
@@ -15,127 +26,92 @@ def generate_transaction_data(
     anomaly_rate=0.05,
     geographic_anomalies=False,
     merchant_category_anomalies=False,
+    rng=None,
 ):
     """Generates simulated transaction data with optional anomalies."""
-    categories = [
-        "Grocery",
-        "Electronics",
-        "Clothing",
-        "Restaurant",
-        "Travel",
-        "Home Goods",
-        "Entertainment",
-    ]
-    locations = [
-        {"city": "New York", "lat": 40.7128, "lon": -74.0060},
-        {"city": "London", "lat": 51.5074, "lon": 0.1278},
-        {"city": "Tokyo", "lat": 35.6895, "lon": 139.6917},
-        {"city": "Sydney", "lat": -33.8688, "lon": 151.2093},
-        {"city": "Paris", "lat": 48.8566, "lon": 2.3522},
-        {"city": "Rio de Janeiro", "lat": -22.9068, "lon": -43.1729},
-        {"city": "Cairo", "lat": 30.0444, "lon": 31.2357},
-    ]
-    data = []
-    for i in range(num_transactions):
-        amount = np.random.normal(50, 15)
-        is_anomaly = np.random.rand() < anomaly_rate
-        category = random.choice(categories)
-        location = random.choice(locations)
-        timestamp = (
-            pd.to_datetime("now")
-            - pd.to_timedelta(np.random.randint(0, 30), unit="days")
-            + pd.to_timedelta(np.random.randint(0, 24 * 60), unit="minutes")
-        )
-
-        if is_anomaly:
-            amount = np.random.uniform(150, 400)  # Higher amounts for anomalies
-            if merchant_category_anomalies:
-                category = "Luxury Goods"  # Unusual category
-            if geographic_anomalies:
-                location = {
-                    "city": "Dubai",
-                    "lat": 25.2048,
-                    "lon": 55.2708,
-                }  # Unusual location
-
-        data.append(
-            {
-                "Transaction ID": i + 1,
-                "Timestamp": timestamp,
-                "Amount": amount,
-                "Category": category,
-                "Location": location["city"],
-                "Latitude": location["lat"],
-                "Longitude": location["lon"],
-                "Is Anomaly": is_anomaly,
-            }
-        )
-    return pd.DataFrame(data)
+    anomaly_types = ["amount"]  # Higher amounts for anomalies
+    if merchant_category_anomalies:
+        anomaly_types.append("category")
+    if geographic_anomalies:
+        anomaly_types.append("location")
+    return generate_transactions(
+        num_transactions, anomaly_rate, anomaly_types=anomaly_types, rng=rng
+    )
 
 
 def generate_transaction_data_interactive(
-    num_transactions, anomaly_rate=0.05, anomaly_type="amount"
+    num_transactions, anomaly_rate=0.05, anomaly_type="amount", rng=None
 ):
     """Generates simulated transaction data with different types of anomalies."""
-    categories = [
-        "Grocery",
-        "Electronics",
-        "Clothing",
-        "Restaurant",
-        "Travel",
-        "Home Goods",
-        "Entertainment",
-    ]
-    locations = [
-        {"city": "New York", "lat": 40.7128, "lon": -74.0060},
-        {"city": "London", "lat": 51.5074, "lon": 0.1278},
-        {"city": "Tokyo", "lat": 35.6895, "lon": 139.6917},
-        {"city": "Sydney", "lat": -33.8688, "lon": 151.2093},
-        {"city": "Paris", "lat": 48.8566, "lon": 2.3522},
-        {"city": "Rio de Janeiro", "lat": -22.9068, "lon": -43.1729},
-        {"city": "Cairo", "lat": 30.0444, "lon": 31.2357},
-    ]
-    data = []
-    for i in range(num_transactions):
-        amount = np.random.normal(50, 15)
-        is_anomaly = np.random.rand() < anomaly_rate
-        category = random.choice(categories)
-        location = random.choice(locations)
-        timestamp = (
-            pd.to_datetime("now")
-            - pd.to_timedelta(np.random.randint(0, 30), unit="days")
-            + pd.to_timedelta(np.random.randint(0, 24 * 60), unit="minutes")
-        )
+    return generate_transactions(
+        num_transactions, anomaly_rate, anomaly_types=[anomaly_type], rng=rng
+    )
+
+
+# Hour ranges [start, end) for each time-of-day bucket (Night wraps midnight)
+TIME_OF_DAY_HOURS = {
+    "Night": (22, 6),
+    "Morning": (6, 12),
+    "Afternoon": (12, 18),
+    "Evening": (18, 22),
+}
+
+
+@st.cache_resource
+def compile_fraud_rules(
+    amount_threshold, categories, locations, velocity_threshold, time_of_day
+):
+    """Compiles Rules 1-3 into NumPy masks once per combination of rule settings."""
+    rules = RuleSet()
+    # Rule 1: High Amount in Specific Categories
+    rules.add(
+        "Rule 1",
+        one_of("Category", categories),
+        threshold("Amount", ">", amount_threshold),
+    )
+    # Rule 2: Transactions in High-Risk Locations
+    rules.add("Rule 2", one_of("Location", locations))
+    # Rule 3: High Velocity Transactions at the chosen Time of Day
+    rules.add(
+        "Rule 3",
+        threshold("Txn Count 1h", ">", velocity_threshold),
+        hour_between("Timestamp", *TIME_OF_DAY_HOURS[time_of_day]),
+    )
+    return rules.compile()
 
-        if is_anomaly:
-            if anomaly_type == "amount":
-                amount = np.random.uniform(150, 400)  # Higher amounts for anomalies
-            elif anomaly_type == "location":
-                location = {
-                    "city": "Dubai",
-                    "lat": 25.2048,
-                    "lon": 55.2708,
-                }  # Unusual location
-            elif anomaly_type == "category":
-                category = "Luxury Goods"  # Unusual category
-            elif anomaly_type == "velocity":
-                timestamp = pd.to_datetime(
-                    "now"
-                )  # Recent timestamp for velocity simulation
-
-        data.append(
-            {
-                "Transaction ID": i + 1,
-                "Timestamp": timestamp,
-                "Amount": amount,
-                "Category": category,
-                "Location": location["city"],
-                "Latitude": location["lat"],
-                "Longitude": location["lon"],
-                "Is Anomaly": is_anomaly,
-            }
-        )
-    return pd.DataFrame(data)
+
+def apply_fraud_rules(df, compiled_rules, velocity_engine):
+    """Adds velocity features, the Rule 1-3 flags and the combined fraud flag to a frame.
+
+    Velocity features come from ``velocity_engine``, which keeps per-customer
+    sliding windows across calls, so consecutive chunks of a stream are scored
+    without regrouping earlier transactions.
+    """
+    velocity = velocity_engine.update_batch(
+        df["Customer ID"], df["Timestamp"], df["Amount"]
+    )
+    velocity.index = df.index
+    df = df.join(velocity)
+
+    evaluation = compiled_rules.evaluate(df)
+    df = df.join(evaluation.to_frame(index=df.index))
+    # Combine Rules: Flag if ANY rule is triggered
+    df["Rule-Based Fraud Flag"] = evaluation.any_flag
+    return df, evaluation
+
+
+@st.cache_data
+def simulate_cluster_transactions(num_transactions, seed=42):
+    """Simulates a reproducible transaction sample for the clustering demo."""
+    df = generate_transactions(
+        num_transactions,
+        anomaly_rate=0.1,
+        anomaly_types=["amount"],  # Amount anomalies for visual clarity
+        rng=np.random.default_rng(seed),
+        end=pd.Timestamp.now().normalize(),
+    )
+    df["time_of_day"] = df["Timestamp"].dt.hour
+    return df
 
 
 def main():
@@ -614,15 +590,12 @@ def main():
 
             if anomaly_type_sim == "location":
                 st.subheader("Geographic Transaction Visualization")
-                m = folium.Map(location=[0, 0], zoom_start=2)  # World map centered
-                for index, row in df_sim.iterrows():
-                    folium.Marker(
-                        [row["Latitude"], row["Longitude"]],
-                        popup=f"Transaction ID: {row['Transaction ID']}, Location: {row['Location']}, Anomaly: {row['Is Anomaly']}",
-                    ).add_to(m)
-                folium_static(m)
+                # One circle per geohash cell instead of one marker per
+                # transaction keeps the map payload independent of volume
+                location_bins = aggregate_by_location(df_sim, precision=5)
+                folium_static(build_cluster_map(location_bins))
                 st.write(
-                    "Geographic Anomalies: Red markers might represent transactions in unusual or high-risk locations when 'location' anomaly type is selected."
+                    "Geographic Anomalies: Each circle aggregates the transactions in one geohash cell; its size reflects the transaction count and red circles mark cells dominated by anomalies, such as unusual or high-risk locations when 'location' anomaly type is selected. Switch on the density layer for a heatmap view."
                 )
 
             category_bar = px.bar(
@@ -683,55 +656,60 @@ def main():
             rule_location_options,
             default=["Dubai"],
         )
-        st.slider(
+        rule_velocity_threshold = st.slider(
             "Velocity Threshold (Transactions per Hour) for Rule 3:",
             min_value=1,
             max_value=10,
             value=3,
         )
         time_of_day_rule3 = st.select_slider(
-            "Time of Day for Rule 3 (Night Hours):",
+            "Time of Day for Rule 3:",
             options=["Night", "Morning", "Afternoon", "Evening"],
             value=("Night"),
         )
 
-        if st.button("Apply Rules and Detect Fraud"):
-            rule_based_df = generate_transaction_data_interactive(
-                num_transactions=500
-            )  # Generate data for rule testing
-
-            # Rule 1: High Amount in Specific Categories
-            rule1_mask = (rule_based_df["Amount"] > rule_amount_threshold) & (
-                rule_based_df["Category"].isin(rule_category)
-            )
-            rule_based_df["Rule 1 Flag"] = rule1_mask
-
-            # Rule 2: Transactions in High-Risk Locations
-            rule2_mask = rule_based_df["Location"].isin(rule_location)
-            rule_based_df["Rule 2 Flag"] = rule2_mask
-
-            # Rule 3: High Velocity Transactions at Night (Conceptual - requires more complex velocity calculation in real-time)
-            # For simplicity, we'll flag all transactions in 'Night' time for demonstration in this simplified interactive example
-            rule_based_df["Hour"] = rule_based_df["Timestamp"].dt.hour
-
-            def categorize_time(hour):
-                if 22 <= hour or hour < 6:
-                    return "Night"  # Simplified night definition
-                else:
-                    return "Day"
+        num_transactions_rules = st.select_slider(
+            "Transactions to Stream Through the Rules:",
+            options=[500, 10_000, 100_000, 1_000_000, 5_000_000],
+            value=500,
+        )
+        chunk_size_rules = st.select_slider(
+            "Rows per Chunk:",
+            options=[500, 10_000, 100_000, 500_000],
+            value=100_000,
+        )
 
-            rule_based_df["Time Category"] = rule_based_df["Hour"].apply(
-                categorize_time
+        if st.button("Apply Rules and Detect Fraud"):
+            # Stream the simulated transactions chunk by chunk so memory stays
+            # bounded by the chunk size, whatever the total volume
+            compiled_rules = compile_fraud_rules(
+                rule_amount_threshold,
+                tuple(rule_category),
+                tuple(rule_location),
+                rule_velocity_threshold,
+                time_of_day_rule3,
             )
-            rule3_mask = (
-                rule_based_df["Time Category"] == time_of_day_rule3
-            )  # Simplified time based rule - velocity requires more complex logic
-            rule_based_df["Rule 3 Flag"] = rule3_mask
-
-            # Combine Rules: Flag if ANY rule is triggered
-            rule_based_df["Rule-Based Fraud Flag"] = rule_based_df[
-                ["Rule 1 Flag", "Rule 2 Flag", "Rule 3 Flag"]
-            ].any(axis=1)
+            fraud_count, total_transactions = 0, 0
+            rule_hits, rule_seconds = Counter(), Counter()
+            rule_based_df = None
+            velocity_engine = SlidingWindowVelocity()  # 1m / 1h / 24h windows
+            progress = st.progress(0.0)
+            for chunk in iter_transaction_chunks(
+                num_transactions_rules,
+                pd.Timestamp.now().normalize(),
+                chunk_size=chunk_size_rules,
+                anomaly_types=["amount", "location", "category", "velocity"],
+            ):
+                chunk, evaluation = apply_fraud_rules(
+                    chunk, compiled_rules, velocity_engine
+                )
+                fraud_count += int(evaluation.any_flag.sum())
+                total_transactions += len(chunk)
+                rule_hits.update(evaluation.hit_counts)
+                rule_seconds.update(evaluation.timings)
+                if rule_based_df is None:
+                    rule_based_df = chunk.head(500)  # Preview of the first chunk
+                progress.progress(total_transactions / num_transactions_rules)
 
             st.dataframe(
                 rule_based_df[
@@ -741,6 +719,10 @@ def main():
                         "Category",
                         "Location",
                         "Timestamp",
+                        "Customer ID",
+                        "Txn Count 1m",
+                        "Txn Count 1h",
+                        "Txn Count 24h",
                         "Rule 1 Flag",
                         "Rule 2 Flag",
                         "Rule 3 Flag",
@@ -749,8 +731,6 @@ def main():
                 ]
             )
 
-            fraud_count = rule_based_df["Rule-Based Fraud Flag"].sum()
-            total_transactions = len(rule_based_df)
             fraud_percentage = (
                 (fraud_count / total_transactions) * 100
                 if total_transactions > 0
@@ -760,6 +740,18 @@ def main():
             st.write(
                 f"Transactions Flagged as Potentially Fraudulent by Rules: **{fraud_count} out of {total_transactions} ({fraud_percentage:.2f}%)**"
             )
+            st.dataframe(
+                pd.DataFrame(
+                    {
+                        "Rule": compiled_rules.rule_names,
+                        "Hits": [rule_hits[name] for name in compiled_rules.rule_names],
+                        "Evaluation Time (ms)": [
+                            1000 * rule_seconds[name]
+                            for name in compiled_rules.rule_names
+                        ],
+                    }
+                )
+            )
             st.info(
                 "Experiment with different rule parameters (thresholds, categories, locations, velocity) to see how the number of flagged transactions changes. Rule-based systems are effective for known fraud patterns but may miss new or subtle fraud schemes."
             )
@@ -781,10 +773,8 @@ def main():
         ).astype(
             int
         )  # Weekend Feature
-        feature_importance_df["location_risk"] = feature_importance_df[
-            "Location"
-        ].apply(
-            lambda loc: 1 if loc in ["Dubai", "Cairo"] else 0
+        feature_importance_df["location_risk"] = (
+            feature_importance_df["Location"].isin(["Dubai", "Cairo"]).astype(int)
         )  # Example location risk
 
         features_for_model = [
@@ -836,13 +826,31 @@ def main():
             "Visualize how clustering algorithms like DBSCAN can identify anomalies (outliers) in transaction data."
         )
 
-        num_samples_cluster = st.slider(
+        num_samples_cluster = st.select_slider(
             "Number of Data Points for Clustering:",
-            min_value=200,
-            max_value=1000,
+            options=[500, 1_000, 10_000, 100_000, 1_000_000],
             value=500,
             key="cluster_slider",
         )
+        scorer_name = st.selectbox(
+            "Anomaly Scoring Backend:",
+            list(ANOMALY_SCORERS),
+            index=0,
+            key="scorer_selectbox",
+        )
+        exact_allowed = num_samples_cluster <= EXACT_FIT_MAX_POINTS
+        approximate_cluster = st.checkbox(
+            "Approximate Mode (cluster a 10,000-point sample, label the rest via the neighbor index)",
+            value=True,
+            key="approx_checkbox",
+            disabled=not exact_allowed,
+        )
+        if not exact_allowed:
+            # An exact fit of 100,000 points takes over a minute
+            approximate_cluster = True
+            st.caption(
+                f"Approximate Mode is always on above {EXACT_FIT_MAX_POINTS:,} points; an exact fit at this size would take minutes."
+            )
         epsilon_dbscan = st.slider(
             "DBSCAN Epsilon (ε - Radius):",
             min_value=0.1,
@@ -860,24 +868,74 @@ def main():
             key="min_samples_slider",
         )
 
+        num_streamed_cluster = st.select_slider(
+            "Additional Transactions to Score (Streamed):",
+            options=[0, 10_000, 100_000, 1_000_000],
+            value=0,
+            key="cluster_stream_slider",
+        )
+
         if st.button("Run DBSCAN Clustering for Anomaly Detection"):
-            cluster_df = generate_transaction_data_interactive(
-                num_transactions=num_samples_cluster,
+            st.session_state["clustering_active"] = True
+
+        if st.session_state.get("clustering_active"):
+            cluster_df = simulate_cluster_transactions(num_samples_cluster)
+
+            # The scorer lives in the session so its neighbor index survives
+            # reruns: moving a slider only re-labels, new data re-fits
+            scorer_key = (scorer_name, approximate_cluster)
+            if st.session_state.get("anomaly_scorer_key") != scorer_key:
+                sample_size = 10_000 if approximate_cluster else None
+                if scorer_name.startswith("DBSCAN"):
+                    scorer = ANOMALY_SCORERS[scorer_name](
+                        sample_size=sample_size, random_state=42
+                    )
+                else:
+                    scorer = ANOMALY_SCORERS[scorer_name](
+                        contamination=0.1, random_state=42
+                    )
+                st.session_state["anomaly_scorer"] = scorer
+                st.session_state["anomaly_scorer_key"] = scorer_key
+            scorer = st.session_state["anomaly_scorer"]
+            if isinstance(scorer, DensityAnomalyScorer):
+                scorer.set_params(eps=epsilon_dbscan, min_samples=min_samples_dbscan)
+            else:
+                st.caption(
+                    "Epsilon and Min Samples apply to DBSCAN only; the Isolation Forest flags the 10% most isolated transactions."
+                )
+
+            # The clustered sample is scored first; the streamed chunks are
+            # then labelled incrementally against the fitted model
+            stream = iter_transaction_chunks(
+                num_streamed_cluster,
+                pd.Timestamp.now().normalize(),
+                chunk_size=100_000,
                 anomaly_rate=0.1,
-                anomaly_type="amount",
-            )  # Amount anomalies for visual clarity
-            cluster_df["time_of_day"] = cluster_df["Timestamp"].dt.hour
-            cluster_data = cluster_df[
-                ["Amount", "time_of_day"]
-            ].copy()  # Using Amount and time_of_day for 2D clustering
-
-            scaler = StandardScaler()  # Standardize features for DBSCAN
-            scaled_data = scaler.fit_transform(cluster_data)
-
-            dbscan = DBSCAN(eps=epsilon_dbscan, min_samples=min_samples_dbscan)
-            clusters = dbscan.fit_predict(scaled_data)
+                anomaly_types=["amount"],
+            )
+            chunks = (
+                chunk.assign(time_of_day=chunk["Timestamp"].dt.hour)
+                for chunk in chain([cluster_df], stream)
+            )
+            scored = score_anomaly_stream(
+                chunks,
+                [
+                    "Amount",
+                    "time_of_day",
+                ],  # Using Amount and time_of_day for 2D clustering
+                scorer,
+            )
+            cluster_df, clusters = next(scored)
             cluster_df["Cluster"] = clusters  # Add cluster labels to dataframe
 
+            streamed_total, streamed_noise = 0, 0
+            for chunk, labels in scored:
+                streamed_total += len(chunk)
+                streamed_noise += int((labels == -1).sum())
+
+            if len(cluster_df) > 5_000:
+                cluster_df = cluster_df.sample(5_000, random_state=42)  # Plot a sample
+
             fig_cluster = px.scatter(
                 cluster_df,
                 x="time_of_day",
@@ -895,6 +953,10 @@ def main():
             st.info(
                 "Clustering-based anomaly detection is useful for identifying outliers without pre-defined labels. DBSCAN is effective in finding clusters of arbitrary shapes and identifying noise points as anomalies."
             )
+            if streamed_total:
+                st.write(
+                    f"Streamed Scoring: **{streamed_noise} of {streamed_total}** additional transactions ({streamed_noise / streamed_total * 100:.2f}%) are flagged as anomalies by the {scorer_name} backend. Each chunk is labelled against the model fitted above, so memory stays bounded by the chunk size."
+                )
 
     with st.expander("💪 3. Practice Exercises", expanded=False):
         st.subheader("Practice Exercises to Apply Your Knowledge")
@@ -4,70 +4,35 @@ import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
+from utils.attribution_utils import (
+    ATTRIBUTION_MODELS,
+    DATA_DRIVEN_MODELS,
+    MarkovAttribution,
+    attribute,
+    shapley_attribution,
+    simulate_touchpoints,
+)
+from utils.cache_utils import cache_dataset
+from utils.marketing_utils import (
+    WEBSITE_CHANNELS,
+    WEBSITE_COUNTRIES,
+    WEBSITE_DEVICES,
+    generate_website_traffic,
+)
+from utils.rng_utils import get_rng
 
 
 def generate_website_dashboard_data(
     days=90,
-    channels=["Organic", "Paid Ads", "Social", "Email"],
-    devices=["Desktop", "Mobile", "Tablet"],
-    countries=["USA", "Canada", "UK"],
+    channels=WEBSITE_CHANNELS,
+    devices=WEBSITE_DEVICES,
+    countries=WEBSITE_COUNTRIES,
+    seed=None,
 ):
     """Generates synthetic website dashboard data with channels, devices, and countries."""
-    dates = pd.date_range(end="today", periods=days)
-    data = []
-    for date in dates:
-        for channel in channels:
-            for device in devices:
-                for country in countries:
-                    users = max(
-                        0,
-                        int(
-                            100
-                            + random.gauss(20, 30)
-                            + (days - (dates.max() - date).days) * 2
-                        ),
-                    )  # Users increase over time
-                    sessions = max(0, int(users * random.uniform(0.8, 0.95)))
-                    page_views = max(0, int(sessions * random.uniform(2, 4)))
-                    bounce_rate = (
-                        min(100, max(20, int(random.gauss(60, 10)))) / 100
-                    )  # Bounce rate around 60%
-                    session_duration = max(
-                        30, int(random.expovariate(1 / 180))
-                    )  # Avg session duration ~ 3 mins
-                    conversions = max(
-                        0, int(users * random.uniform(0.01, 0.03))
-                    )  # Conversion rate 1-3%
-                    data.append(
-                        [
-                            date,
-                            channel,
-                            device,
-                            country,
-                            users,
-                            sessions,
-                            page_views,
-                            bounce_rate,
-                            session_duration,
-                            conversions,
-                        ]
-                    )
-    df = pd.DataFrame(
-        data,
-        columns=[
-            "Date",
-            "Channel",
-            "Device",
-            "Country",
-            "Users",
-            "Sessions",
-            "Page Views",
-            "Bounce Rate",
-            "Session Duration (Seconds)",
-            "Conversions",
-        ],
+    return generate_website_traffic(
+        days, channels, devices, countries, rng=np.random.default_rng(seed)
     )
-    return df
 
 
 def generate_multi_channel_ads_data(
@@ -132,27 +97,24 @@ def generate_multi_channel_ads_data(
     return df_ads
 
 
+@cache_dataset
 def generate_customer_segmentation_data(num_customers=1000):
     """Generates synthetic customer segmentation data."""
-    np.random.seed(42)  # for reproducibility
-    age = np.random.randint(18, 70, num_customers)
-    gender = np.random.choice(
-        ["Male", "Female", "Other"], num_customers, p=[0.45, 0.45, 0.1]
-    )
-    location = np.random.choice(
-        ["USA", "Canada", "UK", "Germany", "France"], num_customers
-    )
-    website_visits_last_month = np.random.randint(0, 50, num_customers)
-    time_on_site_minutes = np.random.randint(1, 120, num_customers)
-    pages_visited = np.random.randint(1, 20, num_customers)
-    purchase_frequency = np.random.choice(
+    rng = get_rng("marketing", "customer_segmentation")
+    age = rng.integers(18, 70, num_customers)
+    gender = rng.choice(["Male", "Female", "Other"], num_customers, p=[0.45, 0.45, 0.1])
+    location = rng.choice(["USA", "Canada", "UK", "Germany", "France"], num_customers)
+    website_visits_last_month = rng.integers(0, 50, num_customers)
+    time_on_site_minutes = rng.integers(1, 120, num_customers)
+    pages_visited = rng.integers(1, 20, num_customers)
+    purchase_frequency = rng.choice(
         ["Low", "Medium", "High"], num_customers, p=[0.5, 0.3, 0.2]
     )
-    avg_order_value = np.random.randint(25, 300, num_customers)
-    email_engagement_score = np.random.randint(
+    avg_order_value = rng.integers(25, 300, num_customers)
+    email_engagement_score = rng.integers(
         0, 100, num_customers
     )  # Higher score = more engagement
-    social_media_engagement = np.random.choice(
+    social_media_engagement = rng.choice(
         ["Low", "Medium", "High"], num_customers, p=[0.4, 0.4, 0.2]
     )
 
@@ -226,71 +188,43 @@ def generate_ab_test_detailed_data(sample_size=1000):
     return df_ab_detailed
 
 
-def generate_customer_journey_attribution_data(num_journeys=1000):
-    """Generates customer journey data with conversion value for attribution."""
-    channels = [
-        "Organic Search",
-        "Paid Ads",
-        "Social Media",
-        "Email Marketing",
-        "Direct",
-    ]
-    journey_data = []
-    for _ in range(num_journeys):
-        journey_length = random.randint(1, 5)
-        journey_path = random.choices(channels, k=journey_length)
-        conversion = random.random() < 0.15  # 15% conversion rate
-        conversion_value = 0
-        if conversion:
-            conversion_value = random.uniform(50, 500)  # Conversion value varies
-        journey_data.append(
-            {
-                "Journey Path": journey_path,
-                "Conversion": conversion,
-                "Conversion Value": conversion_value,
-            }
-        )
-    return pd.DataFrame(journey_data)
+ATTRIBUTION_CHANNELS = [
+    "Organic Search",
+    "Paid Ads",
+    "Social Media",
+    "Email Marketing",
+    "Direct",
+]
+
+
+@st.cache_data
+def generate_customer_journey_attribution_data(num_journeys=1000, seed=42):
+    """Generates customer journeys with conversion value, one row per touchpoint."""
+    return simulate_touchpoints(
+        num_journeys,
+        ATTRIBUTION_CHANNELS,
+        max_length=5,
+        conversion_rate=0.15,  # 15% conversion rate
+        value_range=(50, 500),  # Conversion value varies
+        rng=np.random.default_rng(seed),
+    )
 
 
-def last_click_attribution(journey_df):
-    """Performs last-click attribution."""
-    attributed_conversions = {}
-    for index, row in journey_df.iterrows():
-        if row["Conversion"]:
-            last_touch_channel = row["Journey Path"][-1]
-            attributed_conversions[last_touch_channel] = (
-                attributed_conversions.get(last_touch_channel, 0)
-                + row["Conversion Value"]
-            )
-    return attributed_conversions
-
-
-def first_click_attribution(journey_df):
-    """Performs first-click attribution."""
-    attributed_conversions = {}
-    for index, row in journey_df.iterrows():
-        if row["Conversion"]:
-            first_touch_channel = row["Journey Path"][0]
-            attributed_conversions[first_touch_channel] = (
-                attributed_conversions.get(first_touch_channel, 0)
-                + row["Conversion Value"]
-            )
-    return attributed_conversions
-
-
-def linear_attribution(journey_df):
-    """Performs linear attribution."""
-    attributed_conversions = {}
-    for index, row in journey_df.iterrows():
-        if row["Conversion"]:
-            path_length = len(row["Journey Path"])
-            value_per_touch = row["Conversion Value"] / path_length
-            for channel in row["Journey Path"]:
-                attributed_conversions[channel] = (
-                    attributed_conversions.get(channel, 0) + value_per_touch
-                )
-    return attributed_conversions
+@st.cache_resource
+def fit_markov_attribution(num_journeys=1000, seed=42):
+    """Builds the Markov transition matrix once per simulated dataset."""
+    touchpoints = generate_customer_journey_attribution_data(num_journeys, seed)
+    return MarkovAttribution().fit(touchpoints)
+
+
+@st.cache_data
+def attribute_all_models(num_journeys=1000, seed=42):
+    """Attributes one simulated dataset under every heuristic and data-driven model."""
+    touchpoints = generate_customer_journey_attribution_data(num_journeys, seed)
+    results = attribute(touchpoints)
+    results["Markov Chain"] = fit_markov_attribution(num_journeys, seed).attribute()
+    results["Shapley Value"] = shapley_attribution(touchpoints)
+    return results
 
 
 def calculate_ctr(impressions, clicks):
@@ -891,26 +825,24 @@ def main():  # noqa: C901
             "Explore how different attribution models can change the perceived value of marketing channels. Select an attribution model and compare channel performance."
         )
 
-        attribution_df = generate_customer_journey_attribution_data(num_journeys=500)
-
-        attribution_model_options = ["Last Click", "First Click", "Linear"]
+        num_attribution_journeys = st.select_slider(
+            "Number of Journeys:",
+            options=[500, 10_000, 100_000, 1_000_000],
+            value=500,
+        )
         selected_attribution_model = st.selectbox(
-            "Choose Attribution Model:", attribution_model_options, index=0
+            "Choose Attribution Model:",
+            ATTRIBUTION_MODELS + DATA_DRIVEN_MODELS,
+            index=0,
         )
 
-        if selected_attribution_model == "Last Click":
-            attributed_conversions_data = last_click_attribution(attribution_df)
-        elif selected_attribution_model == "First Click":
-            attributed_conversions_data = first_click_attribution(attribution_df)
-        elif selected_attribution_model == "Linear":
-            attributed_conversions_data = linear_attribution(attribution_df)
-        else:
-            attributed_conversions_data = {}
-
-        attributed_channels = list(attributed_conversions_data.keys())
-        attributed_values = list(attributed_conversions_data.values())
-        attribution_results_df = pd.DataFrame(
-            {"Channel": attributed_channels, "Attributed Value": attributed_values}
+        # Heuristic models share one grouped aggregation over the touchpoints;
+        # Markov and Shapley reuse a cached transition matrix and coalition table
+        all_models_df = attribute_all_models(num_journeys=num_attribution_journeys)
+        attribution_results_df = (
+            all_models_df[selected_attribution_model]
+            .rename("Attributed Value")
+            .reset_index()
         )
 
         fig_attribution = px.bar(
@@ -922,10 +854,12 @@ def main():  # noqa: C901
         )
         st.plotly_chart(fig_attribution, use_container_width=True)
         st.dataframe(attribution_results_df, use_container_width=True)
+        st.caption("Attributed value by channel under every model:")
+        st.dataframe(all_models_df.round(2), use_container_width=True)
 
         st.markdown("**Exploration Questions:**")
         st.markdown(
-            "* **Compare Channel Rankings:** Switch between 'Last Click', 'First Click', and 'Linear' attribution models. How does the ranking of channels by 'Attributed Value' change across models? Which channels gain or lose value depending on the model?"
+            "* **Compare Channel Rankings:** Switch between the heuristic models ('Last Click', 'First Click', 'Linear', 'Time Decay', 'Position-Based') and the data-driven ones ('Markov Chain', 'Shapley Value'). How does the ranking of channels by 'Attributed Value' change across models? Which channels gain or lose value depending on the model?"
         )
         st.markdown(
             "* **Last-Click Bias:** Observe the results under 'Last Click' attribution. Is 'Direct' traffic always the top channel? Why might last-click attribution overemphasize 'Direct' and under value earlier touchpoints?"
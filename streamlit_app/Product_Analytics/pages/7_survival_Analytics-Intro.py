@@ -2,10 +2,11 @@ from io import StringIO  # For handling CSV input as string
 
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import streamlit as st
 from lifelines import CoxPHFitter, KaplanMeierFitter
 from lifelines.datasets import load_rossi  # Example dataset
+from utils.cache_utils import shared_dataset
+from utils.io_utils import read_csv
 
 
 def show_theoretical_concepts():
@@ -108,14 +109,20 @@ def load_kaplan_meier_data():
     return validate_kaplan_meier_data(data, data_source)
 
 
+@shared_dataset
+def load_example_data():
+    """The Rossi recidivism data, shared read-only across sessions."""
+    return load_rossi()
+
+
 def load_data_by_source(data_source):
     if data_source == "Use Example Dataset":
-        return load_rossi()
+        return load_example_data()
     elif data_source == "Upload CSV":
         uploaded_file = st.file_uploader("Upload a CSV file", type=["csv"])
         if uploaded_file is not None:
             try:
-                return pd.read_csv(uploaded_file)
+                return read_csv(uploaded_file)
             except Exception as e:
                 st.error(f"Error reading CSV: {e}")
         return None
@@ -123,7 +130,7 @@ def load_data_by_source(data_source):
         csv_data = st.text_area("Paste your CSV data here:", height=200)
         if csv_data:
             try:
-                return pd.read_csv(StringIO(csv_data))
+                return read_csv(StringIO(csv_data))
             except Exception as e:
                 st.error(f"Error reading CSV data: {e}")
         return None
@@ -1,5 +1,4 @@
 import matplotlib.pyplot as plt
-import pandas as pd
 import streamlit as st
 from stats_utils import (
     calculate_mean,
@@ -9,15 +8,22 @@ from stats_utils import (
     calculate_variance,
     plot_histogram,
 )
+from utils.cache_utils import bytes_key, get_dataset_cache
+from utils.io_utils import read_csv
 
 # --- DATA ACQUISITION ---
 st.header("Data Acquisition")
 
 
-# Use st.cache_data to cache the data loading and preprocessing
-@st.cache_data
+# Cache parsed uploads on disk by content, shared across reruns and processes
 def load_data(file_path):
-    df = pd.read_csv(file_path)
+    # Hash each upload once per session, not on every rerun
+    upload_keys = st.session_state.setdefault("upload_keys", {})
+    if file_path.file_id not in upload_keys:
+        upload_keys[file_path.file_id] = bytes_key(file_path.getvalue())
+    df = get_dataset_cache().get_or_create(
+        upload_keys[file_path.file_id], lambda: read_csv(file_path)
+    )
     return df
 
 
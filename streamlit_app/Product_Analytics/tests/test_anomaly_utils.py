@@ -0,0 +1,75 @@
+# tests/test_anomaly_utils.py
+import numpy as np
+import pytest
+from sklearn.cluster import DBSCAN
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score, roc_auc_score
+from sklearn.preprocessing import StandardScaler
+from utils.anomaly_utils import (
+    CACHED_NEIGHBORS,
+    DensityAnomalyScorer,
+    StreamingIsolationForest,
+)
+
+
+@pytest.fixture(scope="module")
+def points():
+    blobs, _ = make_blobs(2_000, centers=4, cluster_std=0.6, random_state=0)
+    outliers = np.random.default_rng(0).uniform(-12, 12, size=(100, 2))
+    return np.vstack([blobs, outliers])
+
+
+@pytest.mark.parametrize("algorithm", ["kd_tree", "ball_tree"])
+def test_relabelling_matches_dbscan(points, algorithm):
+    scaled = StandardScaler().fit_transform(points)
+    scorer = DensityAnomalyScorer(algorithm=algorithm).fit(points)
+    for eps in (0.1, 0.2, 0.3):
+        for min_samples in (3, 5, 10):
+            scorer.set_params(eps=eps, min_samples=min_samples)
+            expected = DBSCAN(eps=eps, min_samples=min_samples).fit(scaled).labels_
+            assert adjusted_rand_score(expected, scorer.labels_) == 1.0
+            np.testing.assert_array_equal(expected == -1, scorer.labels_ == -1)
+
+
+def test_large_min_samples_grow_the_neighbor_cache(points):
+    scaled = StandardScaler().fit_transform(points)
+    scorer = DensityAnomalyScorer(eps=0.2, min_samples=5).fit(points)
+    for min_samples in (CACHED_NEIGHBORS + 10, 60, 8):
+        scorer.set_params(min_samples=min_samples)
+        expected = DBSCAN(eps=0.2, min_samples=min_samples).fit(scaled).labels_
+        assert adjusted_rand_score(expected, scorer.labels_) == 1.0
+        np.testing.assert_array_equal(expected == -1, scorer.labels_ == -1)
+    # More samples than points: DBSCAN finds no cores at all
+    few = DensityAnomalyScorer(min_samples=50).fit(points[:10])
+    assert (few.labels_ == -1).all()
+    assert np.isinf(few.score_samples(points[:3])).all()
+
+
+def test_border_points_join_a_reachable_cluster(points):
+    # With a tiny eps some border points are reachable from two clusters,
+    # which DBSCAN breaks by visiting order; cores and noise must still agree
+    scaled = StandardScaler().fit_transform(points)
+    scorer = DensityAnomalyScorer(eps=0.05, min_samples=5).fit(points)
+    reference = DBSCAN(eps=0.05, min_samples=5).fit(scaled)
+    core = np.zeros(len(points), dtype=bool)
+    core[reference.core_sample_indices_] = True
+    assert adjusted_rand_score(reference.labels_[core], scorer.labels_[core]) == 1.0
+    np.testing.assert_array_equal(reference.labels_ == -1, scorer.labels_ == -1)
+    for i in np.flatnonzero(~core & (scorer.labels_ != -1)):
+        near = core & (np.linalg.norm(scaled - scaled[i], axis=1) <= 0.05)
+        assert scorer.labels_[i] in scorer.labels_[near]
+
+
+def test_sampled_fit_approximates_dbscan(points):
+    scaled = StandardScaler().fit_transform(points)
+    expected = DBSCAN(eps=0.2, min_samples=5).fit(scaled).labels_
+    scorer = DensityAnomalyScorer(eps=0.2, sample_size=1_000, random_state=0)
+    assert adjusted_rand_score(expected, scorer.fit(points).labels_) > 0.95
+
+
+def test_streaming_isolation_forest_ranks_outliers_first(points):
+    truth = np.r_[np.zeros(2_000), np.ones(100)]
+    forest = StreamingIsolationForest(contamination=0.05, random_state=0)
+    for batch in np.random.default_rng(1).permutation(len(points)).reshape(3, -1):
+        forest.partial_fit(points[batch])
+    assert roc_auc_score(truth, forest.score_samples(points)) > 0.95
@@ -0,0 +1,137 @@
+# tests/test_attribution_utils.py
+from itertools import permutations
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.attribution_utils import (
+    ATTRIBUTION_MODELS,
+    MarkovAttribution,
+    attribute,
+    explode_journeys,
+    shapley_attribution,
+    simulate_touchpoints,
+)
+
+CHANNELS = ["Email", "Search", "Social", "Display"]
+
+
+def _journeys(touchpoints):
+    """Rebuilds each journey as (list of channels, conversion value)."""
+    frame = touchpoints.to_frame()
+    return [
+        (list(group["Channel"]), group["Conversion Value"].iloc[0])
+        for _, group in frame.groupby("Journey ID", sort=True)
+    ]
+
+
+def _loop_credit(path, model, half_life=1.0):
+    """Per-touch shares of one journey, written out touch by touch."""
+    k = len(path)
+    if model == "Last Click":
+        return [0.0] * (k - 1) + [1.0]
+    if model == "First Click":
+        return [1.0] + [0.0] * (k - 1)
+    if model == "Linear":
+        return [1.0 / k] * k
+    if model == "Time Decay":
+        raw = [2 ** (-(k - 1 - i) / half_life) for i in range(k)]
+        return [r / sum(raw) for r in raw]
+    if k <= 2:
+        return [1.0 / k] * k
+    return [0.4] + [0.2 / (k - 2)] * (k - 2) + [0.4]
+
+
+@pytest.fixture(scope="module")
+def touchpoints():
+    return simulate_touchpoints(
+        2_000, CHANNELS, conversion_rate=0.3, rng=np.random.default_rng(11)
+    )
+
+
+def test_heuristic_models_match_journey_loop(touchpoints):
+    result = attribute(touchpoints, half_life=2.0)
+    expected = pd.DataFrame(0.0, index=CHANNELS, columns=ATTRIBUTION_MODELS)
+    for path, value in _journeys(touchpoints):
+        if value <= 0:
+            continue
+        for model in ATTRIBUTION_MODELS:
+            for channel, share in zip(path, _loop_credit(path, model, half_life=2.0)):
+                expected.loc[channel, model] += share * value
+    np.testing.assert_allclose(result.loc[CHANNELS].to_numpy(), expected.to_numpy())
+    total = touchpoints.conversion_value.sum()
+    np.testing.assert_allclose(result.sum(), total)
+
+
+def test_explode_journeys_round_trips():
+    journey_df = pd.DataFrame(
+        {
+            "Journey Path": [["Email"], ["Search", "Email", "Social"], ["Social"]],
+            "Conversion": [True, False, True],
+            "Conversion Value": [120.0, 80.0, 40.0],
+        }
+    )
+    touchpoints = explode_journeys(journey_df)
+    assert _journeys(touchpoints) == [
+        (["Email"], 120.0),
+        (["Search", "Email", "Social"], 0.0),
+        (["Social"], 40.0),
+    ]
+    result = attribute(touchpoints, models=["Linear"])
+    assert result.loc["Email", "Linear"] == 120.0
+    assert result.loc["Search", "Linear"] == 0.0
+
+
+def _coalition_value(journeys, coalition):
+    return sum(
+        value for path, value in journeys if value > 0 and set(path) <= coalition
+    )
+
+
+def test_shapley_matches_permutation_brute_force(touchpoints):
+    journeys = _journeys(touchpoints)
+    expected = dict.fromkeys(CHANNELS, 0.0)
+    orders = list(permutations(CHANNELS))
+    for order in orders:
+        for i, channel in enumerate(order):
+            before = set(order[:i])
+            expected[channel] += (
+                _coalition_value(journeys, before | {channel})
+                - _coalition_value(journeys, before)
+            ) / len(orders)
+    result = shapley_attribution(touchpoints)
+    np.testing.assert_allclose(result[CHANNELS], [expected[c] for c in CHANNELS])
+    np.testing.assert_allclose(result.sum(), touchpoints.conversion_value.sum())
+
+
+def _conversion_probability(journeys, removed=None):
+    """Absorbing-chain conversion probability from dense, loop-counted transitions."""
+    states = ["start"] + CHANNELS + ["conversion", "null"]
+    index = {state: i for i, state in enumerate(states)}
+    counts = np.zeros((len(states), len(states)))
+    for path, value in journeys:
+        steps = ["start"] + path + ["conversion" if value > 0 else "null"]
+        for source, target in zip(steps, steps[1:]):
+            counts[index[source], index[target]] += 1
+    totals = counts.sum(axis=1, keepdims=True)
+    P = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+    if removed is not None:
+        P[:, index[removed]] = 0.0
+    transient = len(CHANNELS) + 1
+    Q, R = P[:transient, :transient], P[:transient, index["conversion"]]
+    return np.linalg.solve(np.eye(transient) - Q, R)[0]
+
+
+def test_markov_removal_effects_match_dense_solve(touchpoints):
+    journeys = _journeys(touchpoints)
+    base = _conversion_probability(journeys)
+    effects = np.array(
+        [1 - _conversion_probability(journeys, c) / base for c in CHANNELS]
+    )
+    model = MarkovAttribution().fit(touchpoints)
+    np.testing.assert_allclose(model.conversion_probability(), base)
+    np.testing.assert_allclose(model.removal_effects()[CHANNELS], effects)
+    np.testing.assert_allclose(
+        model.attribute()[CHANNELS],
+        effects / effects.sum() * touchpoints.conversion_value.sum(),
+    )
@@ -0,0 +1,97 @@
+# tests/test_batch_utils.py
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from statsmodels.stats.multitest import multipletests
+from utils.batch_utils import (
+    CORRECTION_METHODS,
+    analyze_batch,
+    simulate_experiment_table,
+)
+from utils.experiment_utils import simulate_experiment
+
+
+def _mean_table(rng, n_experiments=30):
+    n = rng.integers(50, 500, size=(n_experiments, 2))
+    return pd.DataFrame(
+        {
+            "experiment_id": [f"M-{i}" for i in range(n_experiments)],
+            "metric_type": "mean",
+            "control_n": n[:, 0],
+            "treatment_n": n[:, 1],
+            "control_mean": rng.normal(10, 1, n_experiments),
+            "treatment_mean": rng.normal(10.3, 1, n_experiments),
+            "control_std": rng.uniform(2, 5, n_experiments),
+            "treatment_std": rng.uniform(2, 5, n_experiments),
+        }
+    )
+
+
+@pytest.mark.parametrize("correction", list(CORRECTION_METHODS))
+def test_summary_rows_match_per_row_scipy_tests(correction):
+    rng = np.random.default_rng(0)
+    table = pd.concat(
+        [
+            simulate_experiment_table(40, share_with_effect=0.5, rng=rng),
+            _mean_table(rng),
+        ],
+        ignore_index=True,
+    )
+    result = analyze_batch(table, correction=correction, chunk_size=16)
+    expected = []
+    for row in table.itertuples():
+        if row.metric_type == "proportion":
+            counts = [
+                [row.control_n - row.control_conversions, row.control_conversions],
+                [
+                    row.treatment_n - row.treatment_conversions,
+                    row.treatment_conversions,
+                ],
+            ]
+            expected.append(stats.chi2_contingency(counts)[1])
+        else:
+            expected.append(
+                stats.ttest_ind_from_stats(
+                    row.control_mean,
+                    row.control_std,
+                    row.control_n,
+                    row.treatment_mean,
+                    row.treatment_std,
+                    row.treatment_n,
+                    equal_var=False,
+                ).pvalue
+            )
+    np.testing.assert_allclose(result["P-value"], expected)
+    rejected, adjusted, _, _ = multipletests(
+        expected, method=CORRECTION_METHODS[correction]
+    )
+    np.testing.assert_allclose(result["Adjusted P-value"], adjusted)
+    np.testing.assert_array_equal(result["Significant"], rejected)
+    assert result["Error"].isna().all()
+
+
+def test_result_files_match_raw_tests_and_report_failures(tmp_path):
+    expected = []
+    for i in range(5):
+        df = simulate_experiment([300, 320], avg_order_values=[40, 44], random_state=i)
+        df[["Variant", "Revenue"]].to_csv(tmp_path / f"exp_{i}.csv", index=False)
+        revenue = [df.loc[df["Variant"] == v, "Revenue"] for v in "AB"]
+        expected.append(stats.ttest_ind(*revenue, equal_var=False).pvalue)
+    (tmp_path / "exp_9.csv").write_text("Variant,Revenue\nA,1.0\n")
+
+    result = analyze_batch(tmp_path, metric_type="mean", chunk_size=2)
+    assert list(result["Experiment"]) == [f"exp_{i}" for i in (0, 1, 2, 3, 4, 9)]
+    np.testing.assert_allclose(result["P-value"].iloc[:5], expected)
+    assert result["Error"].iloc[:5].isna().all()
+    assert result["Error"].iloc[5] is not None
+    assert np.isnan(result["Adjusted P-value"].iloc[5])
+
+
+def test_process_pool_matches_inline_run():
+    table = simulate_experiment_table(200, rng=np.random.default_rng(3))
+    inline = analyze_batch(table, chunk_size=50)
+    pooled = analyze_batch(table, chunk_size=50, max_workers=2)
+    pd.testing.assert_frame_equal(
+        inline.drop(columns="Seconds"), pooled.drop(columns="Seconds")
+    )
@@ -0,0 +1,85 @@
+# tests/test_bootstrap_utils.py
+import numpy as np
+import pytest
+from scipy import stats
+from utils.bootstrap_utils import (
+    ROW_STATISTICS,
+    ValueCounts,
+    bootstrap,
+    bootstrap_stream,
+)
+
+
+@pytest.fixture(scope="module")
+def skewed():
+    return np.random.default_rng(0).exponential(2.0, size=400)
+
+
+@pytest.mark.parametrize("method", ["percentile", "bca"])
+@pytest.mark.parametrize("statistic", [np.mean, np.std])
+def test_intervals_match_scipy_bootstrap(skewed, method, statistic):
+    result = bootstrap(
+        skewed, statistic, n_resamples=20_000, method=method, random_state=1
+    )
+    expected = stats.bootstrap(
+        (skewed,),
+        statistic,
+        n_resamples=20_000,
+        method="BCa" if method == "bca" else "percentile",
+        random_state=np.random.default_rng(2),
+    )
+    se = expected.standard_error
+    assert abs(result.standard_error - se) < 0.05 * se
+    np.testing.assert_allclose(
+        result.confidence_interval, expected.confidence_interval, atol=0.1 * se
+    )
+    assert result.estimate == statistic(skewed)
+
+
+def test_count_path_matches_row_path():
+    # Few distinct values: named statistics resample value counts instead of rows
+    data = np.random.default_rng(3).poisson(4, size=5_000)
+    table = ValueCounts.from_array(data)
+    assert table.values.size < 30 and table.n == data.size
+    for name in ("mean", "std"):
+        counts = bootstrap(data, name, n_resamples=4_000, random_state=4)
+        rows = bootstrap(data, ROW_STATISTICS[name], n_resamples=4_000, random_state=4)
+        assert counts.estimate == pytest.approx(rows.estimate)
+        assert counts.standard_error == pytest.approx(rows.standard_error, rel=0.05)
+    median = bootstrap(data, "median", n_resamples=2_000, method="bca", random_state=5)
+    assert median.estimate == np.sort(data)[(data.size - 1) // 2]
+    assert (
+        median.confidence_interval[0]
+        <= median.estimate
+        <= median.confidence_interval[1]
+    )
+
+
+def test_distinct_values_fall_back_to_rows(skewed):
+    # Continuous data takes the row path; the lower median matches a sort
+    result = bootstrap(skewed, "median", n_resamples=2_000, random_state=6)
+    assert result.estimate == np.sort(skewed)[(skewed.size - 1) // 2]
+    assert np.isin(result.distribution, skewed).all()
+
+
+def test_streamed_counts_match_whole_array():
+    data = np.random.default_rng(7).integers(0, 50, size=10_000).astype(float)
+    data[::97] = np.nan
+    chunks = np.array_split(data, 7)
+    table = ValueCounts.from_chunks(chunks)
+    whole = ValueCounts.from_array(data)
+    np.testing.assert_array_equal(table.values, whole.values)
+    np.testing.assert_array_equal(table.counts, whole.counts)
+    streamed = bootstrap_stream(chunks, "mean", n_resamples=1_000, random_state=8)
+    direct = bootstrap(whole, "mean", n_resamples=1_000, random_state=8)
+    np.testing.assert_array_equal(streamed.distribution, direct.distribution)
+
+
+def test_results_do_not_depend_on_n_jobs(skewed):
+    kwargs = dict(n_resamples=3_000, block_size=500, random_state=9)
+    inline = bootstrap(skewed, np.mean, n_jobs=1, **kwargs)
+    pooled = bootstrap(skewed, np.mean, n_jobs=2, **kwargs)
+    np.testing.assert_array_equal(inline.distribution, pooled.distribution)
+    assert inline.n_resamples == 3_000
+    with pytest.raises(ValueError):
+        bootstrap(skewed, "mode")
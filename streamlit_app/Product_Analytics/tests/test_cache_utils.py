@@ -0,0 +1,132 @@
+# tests/test_cache_utils.py
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils import cache_utils
+from utils.cache_utils import DatasetCache, cache_dataset, call_key, shared_dataset
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = DatasetCache(tmp_path)
+    monkeypatch.setattr(cache_utils, "_default_cache", cache)
+    return cache
+
+
+def _frame(n=1_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "id": np.arange(n, dtype=np.int32),
+            "value": rng.normal(size=n),
+            "segment": pd.Categorical(rng.choice(["a", "b"], n)),
+            "label": [f"row-{i}" for i in range(n)],
+            "when": pd.date_range("2024-01-01", periods=n, freq="min"),
+        }
+    )
+
+
+def test_entries_round_trip(cache):
+    df = _frame()
+    assert cache.get("missing") is None
+    cache.put("frame", df)
+    pd.testing.assert_frame_equal(cache.get("frame"), df, check_dtype=False)
+    assert cache.get("frame")["segment"].dtype == "category"
+    # A torn file reads as a miss instead of raising
+    cache.path("torn").write_bytes(cache.path("frame").read_bytes()[:100])
+    assert cache.get("torn") is None
+
+    calls = []
+    for _ in range(3):
+        cache.get_or_create("made", lambda: calls.append(1) or _frame(10))
+    assert len(calls) == 1
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, _frame(seed=i))
+        os.utime(cache.path(key), (i, i))
+    size = cache.path("a").stat().st_size
+    cache.get("a")  # Refreshes a, so b is now the oldest
+    cache.max_bytes = 3 * size
+    cache.put("d", _frame(seed=3))
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+    cache.clear()
+    assert list(cache.directory.glob("*.arrow")) == []
+
+
+def test_call_keys_depend_on_arguments_and_salt(monkeypatch):
+    def generate(n, scale=1.0):
+        return pd.DataFrame({"x": np.arange(n) * scale})
+
+    key = call_key(generate, (10,), {"scale": 2.0})
+    assert key == call_key(generate, (10,), {"scale": 2.0})
+    assert key != call_key(generate, (11,), {"scale": 2.0})
+    assert call_key(generate, (10,), {"rng": np.random.default_rng()}) is None
+
+    cache_utils._salt.cache_clear()
+    monkeypatch.setattr(cache_utils, "CACHE_VERSION", cache_utils.CACHE_VERSION + 1)
+    try:
+        assert call_key(generate, (10,), {"scale": 2.0}) != key
+    finally:
+        cache_utils._salt.cache_clear()
+
+
+def test_cached_generator_runs_once_per_key(cache):
+    calls = []
+
+    @cache_dataset
+    def generate(n, rng=None):
+        calls.append(n)
+        rng = rng or np.random.default_rng(n)
+        return pd.DataFrame({"x": rng.normal(size=n)})
+
+    first = generate(100)
+    pd.testing.assert_frame_equal(generate(100), first)
+    generate(200)
+    generate(100, rng=np.random.default_rng(1))
+    generate(100, rng=np.random.default_rng(1))
+    assert calls == [100, 200, 100, 100]
+
+
+@pytest.mark.parametrize("copy_on_write", [True, False])
+def test_shared_frames_never_leak_writes(cache, monkeypatch, copy_on_write):
+    if copy_on_write and not cache_utils.COPY_ON_WRITE:
+        pytest.skip("copy-on-write is only guaranteed from pandas 3")
+    monkeypatch.setattr(cache_utils, "COPY_ON_WRITE", copy_on_write)
+    monkeypatch.setattr(cache_utils, "_shared_frames", OrderedDict())
+    calls = []
+
+    @shared_dataset
+    def canned(n):
+        calls.append(n)
+        return _frame(n)
+
+    first, second = canned(1_000), canned(1_000)
+    assert calls == [1_000]
+    pd.testing.assert_frame_equal(first, _frame(1_000), check_dtype=False)
+    # With copy-on-write both sessions read the same mapped buffers;
+    # without it each gets writable memory of its own
+    for col in ("id", "value"):
+        shared = np.shares_memory(first[col].to_numpy(), second[col].to_numpy())
+        assert shared == copy_on_write
+
+    first.loc[0, "value"] = 99.0
+    first["id"] += 1
+    assert first.loc[0, "value"] == 99.0
+    assert second.loc[0, "value"] == _frame(1_000).loc[0, "value"]
+    np.testing.assert_array_equal(second["id"], np.arange(1_000))
+    third = canned(1_000)
+    np.testing.assert_array_equal(third["id"], np.arange(1_000))
+    assert not np.shares_memory(first["id"].to_numpy(), third["id"].to_numpy())
+
+    # Calls that cannot be keyed bypass the shared store
+    uncached = shared_dataset(lambda rng: _frame(5))
+    uncached(np.random.default_rng(0))
+    assert len(cache_utils._shared_frames) == 1
@@ -0,0 +1,140 @@
+# tests/test_experiment_utils.py
+import numpy as np
+import pandas as pd
+import statsmodels.formula.api as smf
+from scipy import stats
+from utils.experiment_utils import (
+    CupedStats,
+    ExperimentStats,
+    chi2_test,
+    cuped_test,
+    reduce_cuped,
+    reduce_experiment,
+    simulate_experiment,
+    welch_t_test,
+)
+
+
+def test_simulated_experiment_matches_requested_design():
+    df = simulate_experiment(
+        [40_000, 60_000, 50_000],
+        conversion_rates=[0.1, 0.12, 0.3],
+        avg_order_values=[50, 55, 60],
+        revenue_std=10,
+        random_state=0,
+    )
+    assert list(df["Variant"].cat.categories) == ["A", "B", "C"]
+    np.testing.assert_array_equal(
+        df["Variant"].value_counts(sort=False), [40_000, 60_000, 50_000]
+    )
+    assert df["UserID"].is_unique
+    by_variant = df.groupby("Variant", observed=True)
+    # Each variant's conversions are Bernoulli(rate), so a binomial test holds
+    for successes, n, rate in zip(
+        by_variant["Converted"].sum(), by_variant.size(), [0.1, 0.12, 0.3]
+    ):
+        assert stats.binomtest(int(successes), int(n), rate).pvalue > 1e-3
+    np.testing.assert_allclose(by_variant["Revenue"].mean(), [50, 55, 60], atol=0.2)
+    assert (df["Revenue"] >= 0).all()
+
+
+def test_covariate_correlation_and_determinism():
+    kwargs = dict(
+        avg_order_values=[100, 100],
+        revenue_std=20,
+        covariate_correlation=0.7,
+    )
+    df = simulate_experiment(50_000, random_state=1, **kwargs)
+    r = np.corrcoef(df["Revenue"], df["Pre-Period Metric"])[0, 1]
+    assert abs(r - 0.7) < 0.02
+    pd.testing.assert_frame_equal(
+        df, simulate_experiment(50_000, random_state=1, **kwargs)
+    )
+
+    converters = simulate_experiment(
+        1_000,
+        conversion_rates=[0.2],
+        avg_order_values=[30],
+        revenue_on_conversion=True,
+        random_state=2,
+    )
+    assert (converters.loc[converters["Converted"] == 0, "Revenue"] == 0).all()
+
+
+def _experiment(seed=3):
+    return simulate_experiment(
+        [3_000, 3_500],
+        conversion_rates=[0.1, 0.13],
+        avg_order_values=[50, 52],
+        random_state=seed,
+    )
+
+
+def test_tests_from_statistics_match_raw_data_tests():
+    df = _experiment()
+    result = ExperimentStats.from_frame(df)
+    a = df.loc[df["Variant"] == "A", "Revenue"]
+    b = df.loc[df["Variant"] == "B", "Revenue"]
+    np.testing.assert_allclose(result.variance, [a.var(), b.var()])
+
+    welch = welch_t_test(result)
+    expected = stats.ttest_ind(a, b, equal_var=False)
+    np.testing.assert_allclose(welch["t_statistic"], expected.statistic)
+    np.testing.assert_allclose(welch["p_value"], expected.pvalue)
+
+    chi2 = chi2_test(result)
+    expected = stats.chi2_contingency(pd.crosstab(df["Variant"], df["Converted"]))
+    np.testing.assert_allclose(chi2["Chi-Square Statistic"], expected[0])
+    np.testing.assert_allclose(chi2["p_value"], expected[1])
+
+
+def test_chunked_reduction_matches_one_pass():
+    df = _experiment()
+    whole = ExperimentStats.from_frame(df)
+    # Rows are grouped by variant, so most chunks hold only one of them
+    chunks = [df.iloc[start : start + 1_000] for start in range(0, len(df), 1_000)]
+    merged = reduce_experiment(chunks[::-1])
+    assert merged.variants == whole.variants
+    for field in ("n", "mean", "m2", "conversions"):
+        np.testing.assert_allclose(getattr(merged, field), getattr(whole, field))
+
+    from_sums = ExperimentStats.from_sums(
+        whole.variants,
+        whole.n,
+        df.groupby("Variant", observed=True)["Revenue"].sum(),
+        df.groupby("Variant", observed=True)["Revenue"].apply(lambda v: (v**2).sum()),
+        whole.conversions,
+    )
+    np.testing.assert_allclose(from_sums.m2, whole.m2, rtol=1e-6)
+
+
+def test_cuped_matches_regression_with_the_covariate():
+    df = simulate_experiment(
+        [4_000, 5_000, 3_000],
+        avg_order_values=[50, 52, 51],
+        covariate_correlation=0.6,
+        random_state=6,
+    ).rename(columns={"Pre-Period Metric": "Pre"})
+    moments = CupedStats.from_frame(df, covariate_col="Pre")
+    ols = smf.ols("Revenue ~ C(Variant) + Pre", data=df).fit()
+    np.testing.assert_allclose(moments.theta, ols.params["Pre"])
+
+    # The adjusted mean difference is the regression's treatment coefficient
+    result = cuped_test(moments, 0, 1)
+    np.testing.assert_allclose(
+        result["adjusted"]["effect"], ols.params["C(Variant)[T.B]"]
+    )
+    np.testing.assert_allclose(
+        result["adjusted"]["standard_error"], ols.bse["C(Variant)[T.B]"], rtol=0.02
+    )
+    assert 0.3 < result["variance_reduction"] < 0.42  # About rho ** 2
+
+    adjusted = df["Revenue"] - moments.theta * (df["Pre"] - df["Pre"].mean())
+    np.testing.assert_allclose(
+        moments.adjusted_stats().mean,
+        adjusted.groupby(df["Variant"], observed=True).mean(),
+    )
+    chunks = [df.iloc[start : start + 2_500] for start in range(0, len(df), 2_500)]
+    merged = reduce_cuped(chunks, covariate_col="Pre")
+    for field in ("n", "mean_y", "mean_x", "m2_y", "m2_x", "c_xy"):
+        np.testing.assert_allclose(getattr(merged, field), getattr(moments, field))
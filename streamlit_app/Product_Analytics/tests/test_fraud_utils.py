@@ -0,0 +1,127 @@
+# tests/test_fraud_utils.py
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from utils.fraud_utils import (
+    ANOMALY_CATEGORY,
+    ANOMALY_LOCATION,
+    CATEGORIES,
+    LOCATIONS,
+    VELOCITY_BURST_SIZE,
+    VELOCITY_BURST_SPAN,
+    VELOCITY_WINDOWS,
+    SlidingWindowVelocity,
+    generate_transactions,
+    iter_transaction_chunks,
+)
+
+END = pd.Timestamp("2024-01-01")
+
+
+def test_generated_columns_follow_their_distributions():
+    df = generate_transactions(
+        50_000,
+        anomaly_rate=0.05,
+        anomaly_types=["amount", "category", "location"],
+        rng=np.random.default_rng(0),
+        end=END,
+    )
+    normal, anomalous = df[~df["Is Anomaly"]], df[df["Is Anomaly"]]
+    assert stats.binomtest(len(anomalous), len(df), 0.05).pvalue > 1e-3
+    assert stats.kstest(normal["Amount"], stats.norm(50, 15).cdf).pvalue > 1e-3
+    assert anomalous["Amount"].between(150, 400).all()
+    counts = normal["Category"].value_counts()[CATEGORIES]
+    assert stats.chisquare(counts).pvalue > 1e-3
+    assert (anomalous["Category"] == ANOMALY_CATEGORY).all()
+    assert (normal["Category"] != ANOMALY_CATEGORY).all()
+    assert (anomalous["Location"] == ANOMALY_LOCATION["city"]).all()
+    places = {
+        loc["city"]: (loc["lat"], loc["lon"]) for loc in LOCATIONS + [ANOMALY_LOCATION]
+    }
+    coordinates = df["Location"].astype(str).map(places)
+    np.testing.assert_array_equal(df["Latitude"], coordinates.str[0])
+    np.testing.assert_array_equal(df["Longitude"], coordinates.str[1])
+    assert df["Timestamp"].min() >= END - pd.Timedelta(days=30)
+    assert df["Timestamp"].max() < END
+
+
+def test_velocity_anomalies_arrive_in_bursts():
+    df = generate_transactions(
+        20_000,
+        anomaly_rate=0.05,
+        anomaly_types=["velocity"],
+        rng=np.random.default_rng(1),
+        end=END,
+        time_ordered=True,
+    )
+    assert df["Timestamp"].is_monotonic_increasing
+    anomalous = df[df["Is Anomaly"]]
+    gaps = anomalous.groupby("Customer ID")["Timestamp"].diff()
+    # Only the first row of each burst can lack a sibling within the burst span
+    bursts = len(anomalous) // VELOCITY_BURST_SIZE
+    assert (gaps <= VELOCITY_BURST_SPAN).sum() >= len(anomalous) - bursts
+    with pytest.raises(ValueError):
+        generate_transactions(10, anomaly_types=["refund"])
+
+
+def _stream(total, chunk_size, seed=7):
+    return pd.concat(
+        iter_transaction_chunks(total, END, chunk_size=chunk_size, seed=seed),
+        ignore_index=True,
+    )
+
+
+@pytest.mark.parametrize("total", [500, 70_000])
+def test_stream_stays_in_window_and_order(total):
+    stream = _stream(total, 10_000)
+    assert len(stream) == total
+    assert stream["Timestamp"].is_monotonic_increasing
+    assert stream["Timestamp"].min() >= END - pd.Timedelta(days=30)
+    assert stream["Timestamp"].max() <= END
+    assert stream["Transaction ID"].is_unique
+
+
+def test_stream_is_reproducible_for_any_chunk_size():
+    pd.testing.assert_frame_equal(_stream(70_000, 333), _stream(70_000, 100_000))
+    assert not _stream(1_000, 1_000, seed=1).equals(_stream(1_000, 1_000, seed=2))
+
+
+def _brute_force_velocity(df, window):
+    """Counts and sums each customer's transactions in ``(t - window, t]``."""
+    span = pd.Timedelta(window)
+    ordered = df.sort_values("Timestamp", kind="stable")
+    counts, sums = pd.Series(0, index=df.index), pd.Series(0.0, index=df.index)
+    for _, group in ordered.groupby("Customer ID", sort=False):
+        times, amounts = group["Timestamp"].tolist(), group["Amount"].tolist()
+        for i, label in enumerate(group.index):
+            inside = [j for j in range(i + 1) if times[j] > times[i] - span]
+            counts[label] = len(inside)
+            sums[label] = sum(amounts[j] for j in inside)
+    return counts, sums
+
+
+def test_velocity_matches_brute_force_across_batches():
+    df = generate_transactions(
+        600,
+        anomaly_types=["velocity"],
+        anomaly_rate=0.2,
+        rng=np.random.default_rng(3),
+        end=END,
+        num_customers=40,
+        time_ordered=True,
+    )
+    engine = SlidingWindowVelocity()
+    features = pd.concat(
+        [
+            engine.update_batch(
+                batch["Customer ID"], batch["Timestamp"], batch["Amount"]
+            ).set_axis(batch.index)
+            for batch in (df.iloc[start : start + 150] for start in range(0, 600, 150))
+        ]
+    )
+    for name, window in VELOCITY_WINDOWS.items():
+        counts, sums = _brute_force_velocity(df, window)
+        np.testing.assert_array_equal(features[f"Txn Count {name}"], counts)
+        np.testing.assert_allclose(features[f"Amount Sum {name}"], sums)
+    assert features["Txn Count 24h"].max() > 1
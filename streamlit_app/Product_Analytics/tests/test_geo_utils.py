@@ -0,0 +1,58 @@
+# tests/test_geo_utils.py
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("folium")
+from utils.geo_utils import (  # noqa: E402
+    aggregate_by_location,
+    geohash_codes,
+    geohash_strings,
+    merge_location_bins,
+)
+
+
+def test_geohash_matches_known_cells():
+    # Reference cells from the geohash specification's worked examples
+    codes = geohash_codes(np.array([57.64911, 42.6]), np.array([10.40744, -5.6]), 11)
+    assert list(geohash_strings(codes, 11)) == ["u4pruydqqvj", "ezs42e44yx9"]
+    assert list(geohash_strings(geohash_codes(42.6, -5.6, 5).ravel(), 5)) == ["ezs42"]
+
+
+def test_aggregation_matches_groupby_and_merges_by_chunk():
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame(
+        {
+            "Latitude": rng.choice([40.71, 51.51, 35.69], size=3_000)
+            + rng.normal(0, 0.001, 3_000),
+            "Longitude": rng.choice([-74.0, 0.13, 139.69], size=3_000)
+            + rng.normal(0, 0.001, 3_000),
+            "Is Anomaly": rng.random(3_000) < 0.1,
+        }
+    )
+    bins = aggregate_by_location(df, precision=4)
+    cells = geohash_strings(geohash_codes(df["Latitude"], df["Longitude"], 4), 4)
+    expected = (
+        df.assign(Geohash=cells)
+        .groupby("Geohash")
+        .agg(
+            Transactions=("Is Anomaly", "size"),
+            Anomalies=("Is Anomaly", "sum"),
+            Latitude=("Latitude", "mean"),
+            Longitude=("Longitude", "mean"),
+        )
+    )
+    result = bins.set_index("Geohash").loc[expected.index]
+    np.testing.assert_array_equal(result["Transactions"], expected["Transactions"])
+    np.testing.assert_array_equal(result["Anomalies"], expected["Anomalies"])
+    np.testing.assert_allclose(result[["Latitude", "Longitude"]], expected.iloc[:, 2:])
+
+    merged = merge_location_bins(
+        aggregate_by_location(df.iloc[start : start + 700], precision=4)
+        for start in range(0, len(df), 700)
+    )
+    pd.testing.assert_frame_equal(
+        merged.set_index("Geohash").sort_index()[result.columns],
+        bins.set_index("Geohash").sort_index()[result.columns],
+        check_dtype=False,
+    )
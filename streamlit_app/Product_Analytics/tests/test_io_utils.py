@@ -0,0 +1,95 @@
+# tests/test_io_utils.py
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.io_utils import iter_csv, memory_usage_mb, read_csv
+
+
+@pytest.fixture(scope="module")
+def csv_text():
+    rng = np.random.default_rng(0)
+    n = 5_000
+    df = pd.DataFrame(
+        {
+            "user_id": np.arange(n),
+            "country": rng.choice(["US", "UK", "CA"], n),
+            "session": [f"s-{i}" for i in rng.permutation(n)],
+            "clicks": rng.integers(0, 100, n),
+            "revenue": rng.exponential(20, n).round(4),
+        }
+    )
+    # A category value that first appears after the sample and the first chunk
+    df.loc[n - 10 :, "country"] = "DE"
+    return df.to_csv(index=False)
+
+
+def _assert_same_values(result, expected):
+    assert list(result.columns) == list(expected.columns)
+    for col in expected.columns:
+        np.testing.assert_array_equal(
+            result[col].astype(object).to_numpy(), expected[col].to_numpy()
+        )
+
+
+def test_chunked_pandas_read_matches_read_csv(csv_text):
+    expected = pd.read_csv(io.StringIO(csv_text))
+    result = read_csv(
+        io.StringIO(csv_text), engine="pandas", chunksize=700, sample_rows=1_000
+    )
+    _assert_same_values(result, expected)
+    assert result.index.equals(expected.index)
+    assert isinstance(result["country"].dtype, pd.CategoricalDtype)
+    assert set(result["country"].cat.categories) == {"US", "UK", "CA", "DE"}
+    assert not isinstance(result["session"].dtype, pd.CategoricalDtype)
+    assert result["clicks"].dtype == np.int8
+    assert result["user_id"].dtype == np.int16
+    assert result["revenue"].dtype == np.float64
+    assert memory_usage_mb(result) < memory_usage_mb(expected)
+
+
+def test_iter_csv_chunks_and_column_selection(csv_text):
+    chunks = list(
+        iter_csv(io.StringIO(csv_text), usecols=["country", "clicks"], chunksize=1_000)
+    )
+    assert [len(chunk) for chunk in chunks] == [1_000] * 5
+    assert all(list(chunk.columns) == ["country", "clicks"] for chunk in chunks)
+    expected = pd.read_csv(io.StringIO(csv_text), usecols=["country", "clicks"])
+    _assert_same_values(pd.concat(chunks).astype({"country": object}), expected)
+    # pandas-only keyword arguments are passed through
+    semicolons = csv_text.replace(",", ";")
+    result = read_csv(io.StringIO(semicolons), sep=";", categories=False)
+    _assert_same_values(result, pd.read_csv(io.StringIO(csv_text)))
+
+
+def test_pyarrow_engine_matches_pandas_engine(csv_text, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "data.csv"
+    path.write_text(csv_text)
+    arrow = read_csv(path, engine="pyarrow")
+    _assert_same_values(arrow, read_csv(path, engine="pandas"))
+    assert isinstance(arrow["country"].dtype, pd.CategoricalDtype)
+    assert not isinstance(arrow["session"].dtype, pd.CategoricalDtype)
+    subset = read_csv(io.StringIO(csv_text), usecols=["revenue"], engine="pyarrow")
+    assert list(subset.columns) == ["revenue"]
+    with pytest.raises(ValueError):
+        read_csv(path, engine="polars")
+
+
+def test_pyarrow_engine_keeps_blanks_missing(csv_text):
+    pytest.importorskip("pyarrow")
+    # Blank every seventh session id and country
+    lines = csv_text.splitlines()
+    for i in range(1, len(lines), 7):
+        user_id, _, _, clicks, revenue = lines[i].split(",")
+        lines[i] = ",".join([user_id, "", "", clicks, revenue])
+    text = "\n".join(lines) + "\n"
+    expected = pd.read_csv(io.StringIO(text))
+    for engine in ("pyarrow", "pandas"):
+        result = read_csv(io.StringIO(text), engine=engine)
+        for col in ("country", "session"):
+            np.testing.assert_array_equal(result[col].isna(), expected[col].isna())
+        assert not isinstance(result["session"].dtype, pd.CategoricalDtype)
+        assert not (result["session"] == "nan").any()
+        _assert_same_values(result.dropna(), expected.dropna())
@@ -0,0 +1,46 @@
+# tests/test_marketing_utils.py
+import itertools
+
+import numpy as np
+import pandas as pd
+from utils.marketing_utils import (
+    WEBSITE_CHANNELS,
+    WEBSITE_COUNTRIES,
+    WEBSITE_DEVICES,
+    generate_website_traffic,
+)
+
+END = pd.Timestamp("2024-01-01")
+
+
+def _traffic(seed=0, days=30):
+    return generate_website_traffic(days, rng=np.random.default_rng(seed), end=END)
+
+
+def test_every_cell_appears_once_in_loop_order():
+    df = _traffic()
+    dates = pd.date_range(end=END, periods=30)
+    expected = list(
+        itertools.product(dates, WEBSITE_CHANNELS, WEBSITE_DEVICES, WEBSITE_COUNTRIES)
+    )
+    cells = df[["Date", "Channel", "Device", "Country"]]
+    assert list(cells.itertuples(index=False, name=None)) == expected
+
+
+def test_metrics_respect_documented_ranges():
+    df = _traffic()
+    assert (df["Sessions"] <= df["Users"]).all()
+    assert (df["Sessions"] >= np.floor(df["Users"] * 0.8)).all()
+    assert df["Page Views"].between(2 * df["Sessions"], 4 * df["Sessions"]).all()
+    assert df["Bounce Rate"].between(0.2, 1.0).all()
+    assert (df["Session Duration (Seconds)"] >= 30).all()
+    assert (df["Conversions"] <= np.floor(df["Users"] * 0.03)).all()
+    # Two extra users per day on top of a N(120, 30) baseline
+    daily = df.groupby("Date")["Users"].mean()
+    slope = np.polyfit(np.arange(len(daily)), daily.to_numpy(), 1)[0]
+    assert abs(slope - 2) < 0.5
+
+
+def test_seeded_runs_are_reproducible():
+    pd.testing.assert_frame_equal(_traffic(seed=4), _traffic(seed=4))
+    assert not _traffic(seed=4).equals(_traffic(seed=5))
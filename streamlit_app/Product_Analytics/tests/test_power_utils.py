@@ -0,0 +1,119 @@
+# tests/test_power_utils.py
+import itertools
+
+import numpy as np
+import pytest
+from statsmodels.stats.power import NormalIndPower, TTestIndPower
+from utils.power_utils import (
+    SampleSizeTable,
+    required_sample_size,
+    sample_size_from_effect,
+    sample_size_grid,
+    simulate_power,
+    standardized_effect,
+)
+from utils.stats_utils import calculate_sample_size_power
+
+
+def _within(estimate, expected, trials, z=4):
+    """Whether a simulated rate is within ``z`` binomial standard errors."""
+    return abs(estimate - expected) < z * np.sqrt(expected * (1 - expected) / trials)
+
+
+def test_binary_power_matches_normal_approximation():
+    result = simulate_power(
+        "binary", 2_000, 0.1, 0.02, n_trials=20_000, rng=np.random.default_rng(0)
+    )
+    h = standardized_effect("proportion", 0.1, 0.02, relative=False)
+    expected = NormalIndPower().power(abs(h), nobs1=2_000, alpha=0.05)
+    assert abs(result.power - expected) < 0.02
+    assert _within(result.type_i_error, 0.05, result.n_trials)
+
+
+def test_continuous_power_matches_t_test_power():
+    result = simulate_power(
+        "continuous", 100, 50, 5, std=20, rng=np.random.default_rng(1)
+    )
+    expected = TTestIndPower().power(5 / 20, nobs1=100, alpha=0.05)
+    assert _within(result.power, expected, result.n_trials)
+    assert _within(result.type_i_error, 0.05, result.n_trials)
+    np.testing.assert_allclose(result.effects.mean(), 5, atol=0.1)
+
+
+def test_heavy_tailed_arm_keeps_its_mean():
+    result = simulate_power(
+        "heavy-tailed", 400, 30, 0, n_trials=4_000, rng=np.random.default_rng(2)
+    )
+    # Without an effect both tests are A/A tests; skew only loosens Welch slightly
+    assert abs(result.type_i_error - 0.05) < 0.02
+    assert abs(result.power - 0.05) < 0.02
+    np.testing.assert_allclose(result.effects.mean(), 0, atol=0.2)
+
+
+def test_invalid_arguments_raise():
+    with pytest.raises(ValueError):
+        simulate_power("counts", 100, 0.1, 0.01)
+    with pytest.raises(ValueError):
+        simulate_power("binary", 1, 0.1, 0.01)
+
+
+@pytest.mark.parametrize("alpha,power", [(0.05, 0.8), (0.01, 0.9), (0.2, 0.5)])
+def test_sample_sizes_match_statsmodels_solvers(alpha, power):
+    # The closed forms ignore rejections in the wrong direction, which is a
+    # one-sided solve at alpha / 2
+    solve = dict(alpha=alpha / 2, power=power, alternative="larger")
+    for d in (0.02, 0.2, 0.5):
+        expected = np.ceil(TTestIndPower().solve_power(d, **solve))
+        assert abs(sample_size_from_effect(d, alpha, power) - expected) <= 1
+    for baseline, mde in [(0.02, 0.1), (0.1, 0.05), (0.4, 0.2)]:
+        h = standardized_effect("proportion", baseline, mde)
+        expected = np.ceil(NormalIndPower().solve_power(h, **solve))
+        n = required_sample_size("proportion", baseline, mde, alpha, power)
+        assert abs(n - expected) <= 1
+
+
+def test_page_sample_size_is_the_exact_t_test_solution():
+    for d, power in itertools.product([0.05, 0.2, 0.5, 1.2], [0.8, 0.9]):
+        expected = TTestIndPower().solve_power(d, power=power, alpha=0.05)
+        assert calculate_sample_size_power(d, power) == np.ceil(expected)
+
+
+def test_grid_matches_pointwise_solutions():
+    grid = sample_size_grid(
+        "mean", [10, 50], [0.01, 0.05, 0.1], [0.05, 0.01], [0.8], std=20
+    )
+    assert grid.shape == (2, 3, 2, 1)
+    for (i, baseline), (j, mde), (k, alpha) in itertools.product(
+        enumerate([10, 50]), enumerate([0.01, 0.05, 0.1]), enumerate([0.05, 0.01])
+    ):
+        assert grid[i, j, k, 0] == required_sample_size(
+            "mean", baseline, mde, alpha, 0.8, std=20
+        )
+
+
+@pytest.mark.parametrize(
+    "metric,std,off_grid", [("proportion", None, 0.9), ("mean", 15.0, 0.3)]
+)
+def test_table_lookup_is_close_to_direct_solution(metric, std, off_grid, tmp_path):
+    table = SampleSizeTable(metric)
+    rng = np.random.default_rng(4)
+    baselines = rng.uniform(0.01, 0.4, 50) if std is None else rng.uniform(5, 500, 50)
+    mdes = rng.uniform(0.02, 0.4, 50)
+    alphas = rng.choice([0.01, 0.03, 0.05], 50)
+    powers = rng.uniform(0.7, 0.95, 50)
+    sizes = table.lookup(baselines, mdes, alphas, powers, std=std)
+    exact = [
+        required_sample_size(metric, *design, std=std)
+        for design in zip(baselines, mdes, alphas, powers)
+    ]
+    np.testing.assert_allclose(sizes, exact, rtol=0.01, atol=2)
+
+    table.save(tmp_path / "table.npz")
+    loaded = SampleSizeTable.load(tmp_path / "table.npz")
+    np.testing.assert_array_equal(
+        loaded.lookup(baselines, mdes, alphas, powers, std=std), sizes
+    )
+    # Designs outside the grid fall back to the closed form
+    assert table.lookup(off_grid, 0.05, std=std) == required_sample_size(
+        metric, off_grid, 0.05, std=std
+    )
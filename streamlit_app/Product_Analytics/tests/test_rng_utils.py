@@ -0,0 +1,62 @@
+# tests/test_rng_utils.py
+import numpy as np
+import pandas as pd
+from utils import data_utils
+from utils.rng_utils import RNGService, get_rng
+
+
+def _draw(rng, size=5):
+    return rng.integers(0, 2**62, size=size)
+
+
+def test_integer_keys_match_numpy_spawn():
+    children = np.random.SeedSequence(42).spawn(4)
+    service = RNGService(42)
+    for i, child in enumerate(children):
+        np.testing.assert_array_equal(
+            _draw(service.generator(i)), _draw(np.random.default_rng(child))
+        )
+    grandchildren = children[3].spawn(3)
+    for seed, child in zip(service.spawn(3, 3), grandchildren):
+        np.testing.assert_array_equal(
+            _draw(np.random.default_rng(seed)), _draw(np.random.default_rng(child))
+        )
+
+
+def test_streams_are_reproducible_and_order_independent():
+    keys = [("data_utils", "normal"), ("ab_test", "job-7"), ("bootstrap", 3)]
+    forward = {key: _draw(get_rng(*key)) for key in keys}
+    backward = {key: _draw(RNGService(42).generator(*key)) for key in keys[::-1]}
+    for key in keys:
+        np.testing.assert_array_equal(forward[key], backward[key])
+    draws = np.concatenate(list(forward.values()))
+    assert np.unique(draws).size == draws.size
+    assert not np.array_equal(_draw(get_rng("x", seed=1)), _draw(get_rng("x", seed=2)))
+    assert not np.array_equal(
+        _draw(get_rng("x", seed=None)), _draw(get_rng("x", seed=None))
+    )
+
+
+def test_worker_streams_are_uncorrelated():
+    workers = RNGService(0).worker_generators(8, "simulation")
+    samples = np.array([rng.standard_normal(20_000) for rng in workers])
+    correlations = np.corrcoef(samples)[np.triu_indices(8, k=1)]
+    assert np.abs(correlations).max() < 4 / np.sqrt(20_000)
+
+
+def test_generators_do_not_touch_global_state():
+    np.random.seed(123)
+    state = np.random.get_state()[1].copy()
+    skewed = data_utils.generate_right_skewed_data(100)
+    normal = data_utils.generate_normal_data(100)
+    np.testing.assert_array_equal(np.random.get_state()[1], state)
+    # Each generator has its own stream, so call order does not matter
+    np.testing.assert_array_equal(data_utils.generate_normal_data(100), normal)
+    np.testing.assert_array_equal(data_utils.generate_right_skewed_data(100), skewed)
+    pd.testing.assert_frame_equal(
+        data_utils.generate_time_series_data(),
+        data_utils.generate_time_series_data(),
+    )
+    custom = data_utils.generate_normal_data(100, rng=np.random.default_rng(1))
+    assert not np.array_equal(custom, normal)
+    assert (data_utils.generate_left_skewed_data(1_000) <= 20).all()
@@ -0,0 +1,85 @@
+# tests/test_rule_utils.py
+import numpy as np
+import pandas as pd
+from utils.fraud_utils import generate_transactions
+from utils.rule_utils import RuleSet, hour_between, one_of, threshold
+
+
+def _transactions():
+    return generate_transactions(
+        5_000,
+        anomaly_rate=0.1,
+        anomaly_types=["amount", "location", "category"],
+        rng=np.random.default_rng(5),
+        end=pd.Timestamp("2024-01-01"),
+    )
+
+
+def test_compiled_rules_match_pandas_masks():
+    df = _transactions()
+    rules = (
+        RuleSet()
+        .add("Large", threshold("Amount", ">", 150))
+        .add(
+            "Unusual",
+            one_of("Location", ["Dubai", "Cairo"]),
+            one_of("Category", ["Grocery"], negate=True),
+        )
+        .add("Night", hour_between("Timestamp", 22, 4), threshold("Amount", ">=", 60))
+    )
+    evaluation = rules.compile().evaluate(df)
+
+    hours = df["Timestamp"].dt.hour
+    expected = {
+        "Large": df["Amount"] > 150,
+        "Unusual": df["Location"].isin(["Dubai", "Cairo"])
+        & ~df["Category"].isin(["Grocery"]),
+        "Night": ((hours >= 22) | (hours < 4)) & (df["Amount"] >= 60),
+    }
+    for name, mask in expected.items():
+        np.testing.assert_array_equal(evaluation.flags[name], mask.to_numpy())
+        assert evaluation.hit_counts[name] == mask.sum() > 0
+    np.testing.assert_array_equal(
+        evaluation.any_flag, np.logical_or.reduce(list(expected.values()))
+    )
+
+
+def test_short_circuit_counts_first_rule_only():
+    df = _transactions()
+    rules = (
+        RuleSet()
+        .add("Large", threshold("Amount", ">", 150))
+        .add("Luxury", one_of("Category", ["Luxury Goods"]))
+        .compile()
+    )
+    full = rules.evaluate(df)
+    short = rules.evaluate(df, short_circuit=True)
+    np.testing.assert_array_equal(full.any_flag, short.any_flag)
+    assert (
+        short.hit_counts["Luxury"]
+        == (full.flags["Luxury"] & ~full.flags["Large"]).sum()
+    )
+
+
+def test_rules_from_config_match_builder():
+    df = _transactions()
+    config = [
+        {
+            "name": "Large abroad",
+            "when": [
+                {"column": "Amount", "op": ">", "value": 100},
+                {"column": "Location", "op": "not in", "value": ["New York"]},
+                {"column": "Timestamp", "op": "hour between", "value": [9, 17]},
+            ],
+        }
+    ]
+    built = RuleSet().add(
+        "Large abroad",
+        threshold("Amount", ">", 100),
+        one_of("Location", ["New York"], negate=True),
+        hour_between("Timestamp", 9, 17),
+    )
+    np.testing.assert_array_equal(
+        RuleSet.from_config(config).compile().evaluate(df).any_flag,
+        built.compile().evaluate(df).any_flag,
+    )
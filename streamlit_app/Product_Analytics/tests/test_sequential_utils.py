@@ -0,0 +1,80 @@
+# tests/test_sequential_utils.py
+import numpy as np
+import pytest
+from utils.sequential_utils import (
+    GroupSequentialBoundary,
+    RunningMoments,
+    SequentialMonitor,
+)
+
+# Lan-DeMets boundaries for five equally spaced looks at two-sided alpha 0.05,
+# as tabulated by gsDesign (sfLDOF / sfLDPocock)
+PUBLISHED_BOUNDARIES = {
+    "O'Brien-Fleming": [4.877, 3.357, 2.680, 2.290, 2.031],
+    "Pocock": [2.438, 2.427, 2.410, 2.397, 2.386],
+}
+
+
+@pytest.mark.parametrize("spending", list(PUBLISHED_BOUNDARIES))
+def test_boundaries_match_published_values(spending):
+    boundary = GroupSequentialBoundary(0.05, spending)
+    bounds = [boundary.next_look(k / 5) for k in range(1, 6)]
+    np.testing.assert_allclose(bounds, PUBLISHED_BOUNDARIES[spending], atol=2e-3)
+    np.testing.assert_allclose(boundary.alpha_spent, 0.05)
+
+
+def test_uneven_looks_spend_alpha_on_brownian_paths():
+    fractions = np.array([0.15, 0.4, 0.45, 0.8, 1.0])
+    boundary = GroupSequentialBoundary(0.05, "O'Brien-Fleming")
+    bounds = np.array([boundary.next_look(t) for t in fractions])
+    rng = np.random.default_rng(0)
+    steps = rng.standard_normal((400_000, 5)) * np.sqrt(np.diff(fractions, prepend=0))
+    z = np.cumsum(steps, axis=1) / np.sqrt(fractions)
+    crossed = (np.abs(z) >= bounds).any(axis=1).mean()
+    assert abs(crossed - 0.05) < 0.002
+    with pytest.raises(ValueError):
+        boundary.next_look(0.9)
+
+
+def test_running_moments_match_numpy():
+    rng = np.random.default_rng(1)
+    batches = [rng.normal(3, 2, size=(3, size)) for size in (1, 40, 0, 7, 300)]
+    moments = RunningMoments(3)
+    for batch in batches:
+        moments.add(batch.shape[1], batch.sum(axis=1), (batch**2).sum(axis=1))
+    data = np.concatenate(batches, axis=1)
+    np.testing.assert_array_equal(moments.n, data.shape[1])
+    np.testing.assert_allclose(moments.mean, data.mean(axis=1))
+    np.testing.assert_allclose(moments.variance, data.var(axis=1, ddof=1))
+
+
+def _monitor_aa_tests(n_experiments, looks, batch, rng, **kwargs):
+    monitor = SequentialMonitor(n_experiments, tau=0.5, **kwargs)
+    naive_rejected = np.zeros(n_experiments, dtype=bool)
+    for look in range(1, looks + 1):
+        control = rng.normal(0, 1, size=(n_experiments, batch))
+        treatment = rng.normal(0, 1, size=(n_experiments, batch))
+        monitor.update(
+            batch,
+            control.sum(axis=1),
+            (control**2).sum(axis=1),
+            batch,
+            treatment.sum(axis=1),
+            (treatment**2).sum(axis=1),
+            information_fraction=look / looks,
+        )
+        naive_rejected |= monitor.naive_p_value < 0.05
+    return monitor, naive_rejected
+
+
+def test_monitor_controls_false_positives_under_peeking():
+    monitor, naive_rejected = _monitor_aa_tests(
+        4_000, 20, 50, np.random.default_rng(2), spending="Pocock"
+    )
+    # Checking the fixed-horizon p-value at every look inflates errors...
+    assert naive_rejected.mean() > 0.15
+    # ...while always-valid p-values, confidence sequences and boundaries hold
+    assert monitor.rejected.mean() <= 0.05
+    assert ((monitor.lower > 0) | (monitor.upper < 0)).mean() <= 0.05
+    assert abs(monitor.boundary_crossed.mean() - 0.05) < 0.015
+    np.testing.assert_array_equal(monitor.control.n, 1_000)
@@ -0,0 +1,94 @@
+# tests/test_simulation_utils.py
+import numpy as np
+import pytest
+from scipy import stats
+from utils import simulation_utils
+from utils.simulation_utils import (
+    dice_sum_counts,
+    discrete_event_counts,
+    empirical_probability,
+    plot_indices,
+    roll_dice,
+    running_mean,
+    sample_means,
+)
+
+
+def test_running_mean_matches_prefix_means():
+    values = np.random.default_rng(0).integers(1, 7, size=500)
+    expected = [values[: i + 1].mean() for i in range(values.size)]
+    np.testing.assert_allclose(running_mean(values), expected)
+
+
+def test_exponential_sample_means_follow_gamma_distribution():
+    # The mean of n Exp(1) draws is exactly Gamma(n, scale=1/n)
+    means = sample_means("Exponential", 20_000, 12, rng=np.random.default_rng(1))
+    assert stats.kstest(means, stats.gamma(12, scale=1 / 12).cdf).pvalue > 1e-3
+
+
+def test_die_sample_means_match_clt_moments():
+    means = sample_means("Uniform (Discrete)", 50_000, 30, np.random.default_rng(2))
+    assert abs(means.mean() - 3.5) < 4 * np.sqrt(35 / 12 / 30 / 50_000)
+    assert means.var(ddof=1) == pytest.approx(35 / 12 / 30, rel=0.03)
+    totals = means * 30
+    np.testing.assert_allclose(totals, np.round(totals))
+    assert totals.min() >= 30 and totals.max() <= 180
+
+
+def test_sample_means_are_identical_across_block_sizes(monkeypatch):
+    expected = sample_means("Exponential", 3_000, 50, np.random.default_rng(3))
+    monkeypatch.setattr(simulation_utils, "BLOCK_ELEMENTS", 1_000)
+    blocked = sample_means("Exponential", 3_000, 50, np.random.default_rng(3))
+    np.testing.assert_array_equal(blocked, expected)
+    with pytest.raises(ValueError):
+        sample_means("Normal", 10, 10)
+
+
+@pytest.mark.parametrize("n", [1, 50, 2_000, 10**6])
+def test_plot_indices_cover_the_series(n):
+    indices = plot_indices(n)
+    assert indices[0] == 0 and indices[-1] == n - 1
+    assert (np.diff(indices) > 0).all()
+    assert indices.size <= min(n, 2_000)
+
+
+def _exact_sum_distribution(num_dice, sides):
+    """Distribution of the total of ``num_dice`` fair dice by repeated convolution."""
+    face = np.r_[0.0, np.full(sides, 1 / sides)]
+    distribution = np.array([1.0])
+    for _ in range(num_dice):
+        distribution = np.convolve(distribution, face)
+    return distribution
+
+
+@pytest.mark.parametrize("num_dice,sides", [(1, 6), (2, 6), (3, 4)])
+def test_dice_sums_fit_the_exact_distribution(monkeypatch, num_dice, sides):
+    monkeypatch.setattr(simulation_utils, "BLOCK_ELEMENTS", 10_000)
+    counts = dice_sum_counts(60_000, num_dice, sides, np.random.default_rng(4))
+    expected = _exact_sum_distribution(num_dice, sides) * 60_000
+    assert counts.sum() == 60_000
+    assert (counts[expected == 0] == 0).all()
+    possible = expected > 0
+    assert stats.chisquare(counts[possible], expected[possible]).pvalue > 1e-3
+
+
+def test_event_counts_fit_the_probabilities():
+    weights = [1, 2, 3, 4]
+    counts = discrete_event_counts(100_000, weights, np.random.default_rng(5))
+    assert counts.sum() == 100_000
+    expected = np.array(weights) / 10 * 100_000
+    assert stats.chisquare(counts, expected).pvalue > 1e-3
+
+
+def test_empirical_probability_matches_counting_rolls():
+    rolls = roll_dice(5_000, rng=np.random.default_rng(6))
+    assert rolls.min() >= 1 and rolls.max() <= 6
+    counts = np.bincount(rolls, minlength=7)
+    assert empirical_probability(counts, lambda x: x % 2 == 0) == np.mean(
+        rolls % 2 == 0
+    )
+    assert empirical_probability(counts, {5, 6}) == np.mean(rolls >= 5)
+    assert empirical_probability(counts[1:], [1, 2], values=np.arange(1, 7)) == (
+        np.mean(rolls <= 2)
+    )
+    assert empirical_probability(np.zeros(7), {1}) == 0.0
@@ -0,0 +1,131 @@
+# tests/test_sketch_utils.py
+import numpy as np
+import pandas as pd
+import pytest
+from utils.sketch_utils import (
+    CountMinSketch,
+    HyperLogLog,
+    KLLSketch,
+    SpaceSaving,
+    sketch_from_bytes,
+)
+from utils.streaming_utils import StreamingSummary
+
+
+@pytest.fixture(scope="module")
+def zipf():
+    return np.random.default_rng(0).zipf(1.3, 200_000) % 50_000
+
+
+def test_count_min_never_undercounts(zipf):
+    sketch = CountMinSketch(width=1024, depth=5)
+    for chunk in np.split(zipf, 10):
+        sketch.update(chunk)
+    values, exact = np.unique(zipf, return_counts=True)
+    estimates = sketch.estimate(values)
+    assert (estimates >= exact).all()
+    within = estimates - exact <= np.e * zipf.size / 1024
+    assert within.mean() >= 1 - np.exp(-5)
+
+    # Partition sketches add up to the sketch of the whole stream
+    merged = CountMinSketch(width=1024, depth=5)
+    for part in np.split(zipf, 4):
+        merged.merge(CountMinSketch(width=1024, depth=5).update(part))
+    np.testing.assert_array_equal(merged.table, sketch.table)
+    with pytest.raises(ValueError):
+        merged.merge(CountMinSketch(width=1024, depth=5, seed=1))
+
+
+def test_count_min_counts_strings_and_equal_numbers():
+    sketch = CountMinSketch().update(["a", "b", "a", None]).update([1, 1.0, 2])
+    np.testing.assert_array_equal(sketch.estimate(["a", "b", "c"]), [2, 1, 0])
+    np.testing.assert_array_equal(sketch.estimate([1]), [2])
+    assert sketch.n == 6
+
+
+@pytest.mark.parametrize("partitions", [1, 8])
+def test_space_saving_keeps_heavy_hitters(zipf, partitions):
+    summary = SpaceSaving(capacity=100)
+    for part in np.split(zipf, partitions):
+        partial = SpaceSaving(capacity=100)
+        for chunk in np.split(part, 5):
+            partial.update(chunk)
+        summary.merge(partial)
+    exact = pd.Series(zipf).value_counts()
+    assert summary.n == zipf.size
+    assert set(exact.index[exact > zipf.size / 100]) <= set(summary.values)
+    for value, count, error in summary.top(100):
+        assert count - error <= exact.get(value, 0) <= count
+    assert summary.mode == exact.index[0]
+    assert [value for value, _, _ in summary.top(5)] == list(exact.index[:5])
+
+
+@pytest.mark.parametrize("cardinality", [100, 10_000, 1_000_000])
+def test_hyperloglog_relative_error(cardinality):
+    values = np.random.default_rng(cardinality).permutation(cardinality)
+    sketch = HyperLogLog()
+    # Repeats must not change the estimate
+    for chunk in np.array_split(np.r_[values, values[: cardinality // 2]], 7):
+        sketch.update(chunk)
+    assert sketch.count() == pytest.approx(cardinality, rel=0.03)
+
+
+def test_hyperloglog_merge_counts_the_union():
+    left = HyperLogLog().update(np.arange(0, 60_000))
+    right = HyperLogLog().update(np.arange(40_000, 100_000))
+    assert left.count() == pytest.approx(60_000, rel=0.03)
+    assert left.merge(right).count() == pytest.approx(100_000, rel=0.03)
+    # Integers and equal floats are the same value
+    np.testing.assert_array_equal(
+        HyperLogLog().update(np.arange(500)).registers,
+        HyperLogLog().update(np.arange(500.0)).registers,
+    )
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(precision=10))
+
+
+def _filled_sketches(zipf):
+    return [
+        KLLSketch(rng=np.random.default_rng(1)).update(zipf),
+        CountMinSketch().update(zipf),
+        SpaceSaving().update(zipf),
+        HyperLogLog().update(zipf),
+    ]
+
+
+def test_sketches_round_trip_through_bytes(zipf):
+    kll, count_min, space_saving, hll = _filled_sketches(zipf)
+    restored = [
+        sketch_from_bytes(s.to_bytes()) for s in (kll, count_min, space_saving, hll)
+    ]
+    assert [type(s) for s in restored] == [
+        KLLSketch,
+        CountMinSketch,
+        SpaceSaving,
+        HyperLogLog,
+    ]
+    q = np.linspace(0, 1, 11)
+    np.testing.assert_array_equal(restored[0].quantile(q), kll.quantile(q))
+    assert restored[0].n == kll.n
+    np.testing.assert_array_equal(
+        restored[1].estimate(zipf[:100]), count_min.estimate(zipf[:100])
+    )
+    assert restored[2].top(20) == space_saving.top(20)
+    assert restored[3].count() == hll.count()
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(kll.to_bytes())
+
+
+def test_summaries_round_trip_and_merge(zipf):
+    halves = np.split(zipf.astype(float), 2)
+    first = StreamingSummary(rng=np.random.default_rng(2)).update(halves[0])
+    second = StreamingSummary(rng=np.random.default_rng(3)).update(halves[1])
+    stored = StreamingSummary.from_bytes(first.to_bytes(), np.random.default_rng(2))
+    assert stored.describe() == first.describe()
+
+    merged = stored.merge(StreamingSummary.from_bytes(second.to_bytes())).describe()
+    whole = StreamingSummary(rng=np.random.default_rng(4)).update(zipf).describe()
+    for key in ("Count", "Mean", "Variance", "Skewness", "Range"):
+        assert merged[key] == pytest.approx(whole[key], rel=1e-9), key
+    assert merged["Distinct Values"] == whole["Distinct Values"]
+    assert merged["Mode"] == whole["Mode"] == "Not well-defined"
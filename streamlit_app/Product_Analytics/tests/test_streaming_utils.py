@@ -0,0 +1,120 @@
+# tests/test_streaming_utils.py
+import numpy as np
+import pytest
+from scipy import stats
+from utils.sketch_utils import KLLSketch
+from utils.stats_utils import calculate_descriptive_stats
+from utils.streaming_utils import StreamingMoments, describe_stream
+
+
+def _scipy_descriptive_stats(data):
+    """The scipy formulation ``calculate_descriptive_stats`` replaced."""
+    data = np.array(data)
+    return {
+        "Mean": np.mean(data),
+        "Median": np.median(data),
+        "Mode": (
+            stats.mode(data, keepdims=True)[0][0]
+            if len(np.unique(data)) < 500
+            else "Not well-defined"
+        ),
+        "Range": np.max(data) - np.min(data),
+        "Variance": np.var(data),
+        "Standard Deviation": np.std(data),
+        "IQR": stats.iqr(data),
+        "Skewness": stats.skew(data),
+        "Kurtosis": stats.kurtosis(data),
+        "25th Percentile (Q1)": np.percentile(data, 25),
+        "50th Percentile (Median)": np.percentile(data, 50),
+        "75th Percentile (Q3)": np.percentile(data, 75),
+        "90th Percentile": np.percentile(data, 90),
+    }
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        np.random.default_rng(0).poisson(3, 5_000).astype(float),
+        np.random.default_rng(1).lognormal(0, 1, 5_000),
+        [2.0, 7.0, 7.0, 1.0],
+    ],
+)
+def test_descriptive_stats_match_scipy(data):
+    result = calculate_descriptive_stats(data)
+    expected = _scipy_descriptive_stats(data)
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, str):
+            assert result[key] == value
+        else:
+            assert result[key] == pytest.approx(value, rel=1e-9, abs=1e-12), key
+
+
+def test_descriptive_stats_drop_missing_values():
+    data = np.random.default_rng(3).poisson(3, 1_000).astype(float)
+    with_nan = np.insert(data, [0, 10, 500, 1_000], np.nan)
+    result = calculate_descriptive_stats(with_nan)
+    for key, value in calculate_descriptive_stats(data).items():
+        assert result[key] == pytest.approx(value, rel=1e-12), key
+
+
+def test_moments_merge_in_any_order():
+    rng = np.random.default_rng(2)
+    # A large offset would break naive sum-of-powers formulas
+    data = 1e6 + rng.gamma(2.0, 3.0, 30_000)
+    chunks = np.split(data, [0, 10, 5_000, 5_001, 17_000])
+    sequential = StreamingMoments()
+    for chunk in chunks:
+        sequential.update(chunk)
+    parts = [StreamingMoments.from_array(chunk) for chunk in chunks]
+    tree = parts[4].merge(parts[1]).merge(parts[5].merge(parts[0]).merge(parts[3]))
+    tree.merge(parts[2])
+    for moments in (sequential, tree):
+        assert moments.n == data.size
+        assert moments.mean == pytest.approx(data.mean(), rel=1e-12)
+        assert moments.variance(1) == pytest.approx(data.var(ddof=1), rel=1e-9)
+        assert moments.skewness == pytest.approx(stats.skew(data), rel=1e-7)
+        assert moments.kurtosis == pytest.approx(stats.kurtosis(data), rel=1e-7)
+        assert (moments.min, moments.max) == (data.min(), data.max())
+    with_nan = StreamingMoments.from_array(np.r_[data[:100], np.nan])
+    assert with_nan.n == 100
+    assert np.isnan(StreamingMoments().variance())
+
+
+def _max_rank_error(sketch, data):
+    ordered = np.sort(data)
+    probes = np.quantile(data, np.linspace(0.01, 0.99, 99))
+    exact = np.searchsorted(ordered, probes, side="right") / data.size
+    return np.abs([sketch.rank(p) for p in probes] - exact).max()
+
+
+def test_kll_rank_error_within_bound():
+    rng = np.random.default_rng(3)
+    data = rng.standard_t(3, 1_000_000)
+    sketch = KLLSketch(200, np.random.default_rng(4))
+    for chunk in np.split(data, 100):
+        sketch.update(chunk)
+    assert sketch.n == data.size and sketch.size < 1_000
+    assert _max_rank_error(sketch, data) < 1.7 / 200
+    assert sketch.quantile(0) == data.min() and sketch.quantile(1) == data.max()
+
+    # Partition sketches merged later answer for the union
+    merged = KLLSketch(200, np.random.default_rng(5))
+    for part in np.split(data, 8):
+        merged.merge(KLLSketch(200, np.random.default_rng(6)).update(part))
+    assert merged.n == data.size
+    assert _max_rank_error(merged, data) < 1.7 / 200
+    with pytest.raises(ValueError):
+        merged.merge(KLLSketch(100))
+
+
+def test_describe_stream_matches_in_memory_stats():
+    data = np.random.default_rng(7).integers(0, 100, 200_000).astype(float)
+    result = describe_stream(np.split(data, 20), rng=np.random.default_rng(8))
+    expected = calculate_descriptive_stats(data)
+    for key in ("Mean", "Variance", "Range", "Skewness", "Kurtosis"):
+        assert result[key] == pytest.approx(expected[key], rel=1e-9), key
+    for key in ("Median", "25th Percentile (Q1)", "90th Percentile"):
+        assert abs(result[key] - expected[key]) <= 2, key
+    assert result["Count"] == data.size
+    assert result["Distinct Values"] == pytest.approx(100, abs=3)
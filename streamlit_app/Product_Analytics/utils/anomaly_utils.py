@@ -0,0 +1,278 @@
+# utils/anomaly_utils.py
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import HDBSCAN
+from sklearn.ensemble import IsolationForest
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import StandardScaler
+
+CACHED_NEIGHBORS = 20  # Neighbors cached per point; grown when min_samples exceeds it
+EXACT_FIT_MAX_POINTS = 20_000  # Larger fits take minutes; sample them instead
+
+
+def fingerprint(X: np.ndarray) -> str:
+    """Returns a content hash used to detect when the data to fit has changed."""
+    X = np.ascontiguousarray(X)
+    digest = hashlib.blake2b(X.view(np.uint8), digest_size=16)
+    digest.update(str((X.shape, X.dtype)).encode())
+    return digest.hexdigest()
+
+
+class DensityAnomalyScorer:
+    """DBSCAN-equivalent anomaly scorer that re-labels without re-fitting.
+
+    Fitting builds a KD-tree or ball-tree over the (optionally sampled) data,
+    caches every point's distances to its nearest neighbors (enough for the
+    largest ``min_samples`` used so far) and, per
+    ``min_samples``, the HDBSCAN single-linkage tree of mutual reachability
+    distances. Cutting that tree at ``eps`` gives exactly the DBSCAN core
+    clusters, so moving ``eps`` costs milliseconds. With ``sample_size`` set,
+    only a random sample is clustered and the remaining points are labelled
+    through the neighbor index. ``fit`` is a no-op when the data is unchanged.
+    Labels follow DBSCAN: ``-1`` marks anomalies (noise).
+    """
+
+    def __init__(
+        self,
+        eps: float = 0.5,
+        min_samples: int = 5,
+        algorithm: str = "kd_tree",
+        sample_size: Optional[int] = None,
+        standardize: bool = True,
+        random_state: Optional[int] = None,
+    ):
+        if algorithm not in ("kd_tree", "ball_tree"):
+            raise ValueError("algorithm must be 'kd_tree' or 'ball_tree'")
+        if min_samples < 2:
+            raise ValueError("min_samples must be at least 2")
+        self.eps = eps
+        self.min_samples = min_samples
+        self.algorithm = algorithm
+        self.sample_size = sample_size
+        self.standardize = standardize
+        self.random_state = random_state
+        self.labels_: Optional[np.ndarray] = None
+        self._fingerprint: Optional[str] = None
+        self._labelled_with: Optional[Tuple[float, int]] = None
+        self._trees: Dict[int, HDBSCAN] = {}
+
+    def fit(self, X: np.ndarray) -> "DensityAnomalyScorer":
+        """Builds the neighbor index and caches unless ``X`` was already fitted."""
+        X = np.asarray(X, dtype=float)
+        key = fingerprint(X)
+        if key != self._fingerprint:
+            self._fingerprint = key
+            self._scaler = StandardScaler().fit(X) if self.standardize else None
+            scaled = self._transform(X)
+            self._sample_idx = None
+            if self.sample_size is not None and len(X) > self.sample_size:
+                rng = np.random.default_rng(self.random_state)
+                self._sample_idx = np.sort(
+                    rng.choice(len(X), self.sample_size, replace=False)
+                )
+                scaled_sample = scaled[self._sample_idx]
+            else:
+                scaled_sample = scaled
+            self._X = scaled
+            self._X_sample = scaled_sample
+            self._neighbors = NearestNeighbors(algorithm=self.algorithm).fit(
+                scaled_sample
+            )
+            self._core_distances = np.empty((len(scaled_sample), 0))
+            self._trees = {}
+            self._labelled_with = None
+        self._relabel()
+        return self
+
+    def set_params(self, **params) -> "DensityAnomalyScorer":
+        """Updates ``eps``/``min_samples`` and re-labels from the cached index."""
+        for name, value in params.items():
+            if name not in ("eps", "min_samples"):
+                raise ValueError(f"{name!r} cannot change without re-fitting")
+            setattr(self, name, value)
+        if self._fingerprint is not None:
+            self._relabel()
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Labels new points with the cluster of the nearest core point within ``eps``."""
+        return self._assign(self._transform(np.asarray(X, dtype=float)))
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """Returns the distance to the nearest core point in units of ``eps``."""
+        if self._core_index is None:
+            return np.full(len(X), np.inf)
+        distances, _ = self._core_index.kneighbors(
+            self._transform(np.asarray(X, dtype=float))
+        )
+        return distances[:, 0] / self.eps
+
+    def _transform(self, X: np.ndarray) -> np.ndarray:
+        return self._scaler.transform(X) if self._scaler is not None else X
+
+    def _tree(self, min_samples: int) -> HDBSCAN:
+        if min_samples not in self._trees:
+            self._trees[min_samples] = HDBSCAN(
+                min_cluster_size=2,
+                min_samples=min_samples,
+                algorithm=self.algorithm,
+                copy=True,
+            ).fit(self._X_sample)
+        return self._trees[min_samples]
+
+    def _core_distance(self, min_samples: int) -> np.ndarray:
+        """Distance of every sampled point to its ``min_samples``-th neighbor.
+
+        The point itself counts as its first neighbor, as in DBSCAN. The
+        neighbor cache is rebuilt when ``min_samples`` outgrows it.
+        """
+        n = len(self._X_sample)
+        if min_samples > n:
+            return np.full(n, np.inf)  # Too few points for any core
+        if min_samples > self._core_distances.shape[1]:
+            k = min(max(CACHED_NEIGHBORS, min_samples), n)
+            # Column j holds the distance to the (j + 1)-th neighbor, self included
+            self._core_distances, _ = self._neighbors.kneighbors(
+                self._X_sample, n_neighbors=k
+            )
+        return self._core_distances[:, min_samples - 1]
+
+    def _relabel(self) -> None:
+        if self._labelled_with == (self.eps, self.min_samples):
+            return
+        self._labelled_with = (self.eps, self.min_samples)
+        core = self._core_distance(self.min_samples) <= self.eps
+        labels = np.full(len(core), -1)
+        if core.any():
+            tree = self._tree(self.min_samples)
+            labels = tree.dbscan_clustering(self.eps, 2).copy()
+            # Cores whose neighbors within eps are all border points form their
+            # own cluster in DBSCAN but are cut as singletons from the tree
+            lone = core & (labels == -1)
+            labels[lone] = labels.max() + 1 + np.arange(lone.sum())
+            labels[~core] = -1
+
+        self._core_labels = labels[core]
+        self._core_index = None
+        if core.any():
+            self._core_index = NearestNeighbors(
+                n_neighbors=1, algorithm=self.algorithm
+            ).fit(self._X_sample[core])
+        # Border points join the cluster of a core point within eps
+        border = np.flatnonzero(~core)
+        if border.size:
+            labels[border] = self._assign(self._X_sample[border])
+
+        if self._sample_idx is None:
+            self.labels_ = labels
+        else:
+            self.labels_ = self._assign(self._X)
+            self.labels_[self._sample_idx] = labels
+
+    def _assign(self, scaled: np.ndarray) -> np.ndarray:
+        labels = np.full(len(scaled), -1)
+        if self._core_index is None or len(scaled) == 0:
+            return labels
+        distances, nearest = self._core_index.kneighbors(scaled)
+        within = distances[:, 0] <= self.eps
+        labels[within] = self._core_labels[nearest[within, 0]]
+        return labels
+
+
+class StreamingIsolationForest:
+    """Isolation-Forest-style scorer trained incrementally on mini-batches.
+
+    Every ``partial_fit`` grows a small forest on that batch alone and keeps
+    the ``max_batches`` most recent ones, so memory is bounded and the model
+    follows drift in the stream. Scores average over the retained forests.
+    Labels are ``-1`` for the ``contamination`` share of most anomalous
+    points of the latest batch and ``0`` otherwise.
+    """
+
+    def __init__(
+        self,
+        n_estimators_per_batch: int = 25,
+        max_batches: int = 8,
+        max_samples: int = 256,
+        contamination: float = 0.05,
+        random_state: Optional[int] = None,
+    ):
+        self.n_estimators_per_batch = n_estimators_per_batch
+        self.max_batches = max_batches
+        self.max_samples = max_samples
+        self.contamination = contamination
+        self.labels_: Optional[np.ndarray] = None
+        self._rng = np.random.default_rng(random_state)
+        self._forests: List[IsolationForest] = []
+        self._fingerprint: Optional[str] = None
+
+    def fit(self, X: np.ndarray) -> "StreamingIsolationForest":
+        """Resets the model and trains it on ``X`` unless ``X`` was already fitted."""
+        X = np.asarray(X, dtype=float)
+        key = fingerprint(X)
+        if key != self._fingerprint:
+            self._forests = []
+            self.partial_fit(X)
+            self._fingerprint = key
+        return self
+
+    def partial_fit(self, X: np.ndarray) -> "StreamingIsolationForest":
+        """Adds a forest trained on one mini-batch and drops the oldest if needed."""
+        X = np.asarray(X, dtype=float)
+        forest = IsolationForest(
+            n_estimators=self.n_estimators_per_batch,
+            max_samples=min(self.max_samples, len(X)),
+            random_state=int(self._rng.integers(2**31 - 1)),
+        ).fit(X)
+        self._forests = (self._forests + [forest])[-self.max_batches :]
+        self._fingerprint = None
+        scores = self.score_samples(X)
+        self.threshold_ = np.quantile(scores, 1 - self.contamination)
+        self.labels_ = np.where(scores > self.threshold_, -1, 0)
+        return self
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """Returns anomaly scores in ``(0, 1]``; higher means more anomalous."""
+        X = np.asarray(X, dtype=float)
+        return -np.mean([forest.score_samples(X) for forest in self._forests], axis=0)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Labels points above the latest batch threshold as ``-1``, else ``0``."""
+        return np.where(self.score_samples(X) > self.threshold_, -1, 0)
+
+
+ANOMALY_SCORERS = {
+    "DBSCAN (KD-tree)": lambda **kw: DensityAnomalyScorer(algorithm="kd_tree", **kw),
+    "DBSCAN (Ball-tree)": lambda **kw: DensityAnomalyScorer(
+        algorithm="ball_tree", **kw
+    ),
+    "Isolation Forest (mini-batch)": StreamingIsolationForest,
+}
+
+
+def score_anomaly_stream(
+    chunks: Iterable[pd.DataFrame],
+    features: Sequence[str],
+    scorer,
+    update: bool = False,
+) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """Fits ``scorer`` on the first chunk and labels every later chunk incrementally.
+
+    With ``update=True`` scorers that support ``partial_fit`` also learn from
+    each later chunk after labelling it. Yields ``(chunk, labels)`` pairs.
+    """
+    fitted = False
+    for chunk in chunks:
+        values = chunk[list(features)].to_numpy(dtype=float)
+        if not fitted:
+            scorer.fit(values)
+            fitted = True
+            yield chunk, scorer.labels_
+            continue
+        labels = scorer.predict(values)
+        if update and hasattr(scorer, "partial_fit"):
+            scorer.partial_fit(values)
+        yield chunk, labels
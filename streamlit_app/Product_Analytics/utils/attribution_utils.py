@@ -0,0 +1,352 @@
+# utils/attribution_utils.py
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+from utils.anomaly_utils import fingerprint
+
+ATTRIBUTION_MODELS = [
+    "Last Click",
+    "First Click",
+    "Linear",
+    "Time Decay",
+    "Position-Based",
+]
+DATA_DRIVEN_MODELS = ["Markov Chain", "Shapley Value"]
+MAX_SHAPLEY_CHANNELS = 20  # Coalition table has 2 ** channels entries
+
+
+@dataclass
+class Touchpoints:
+    """Customer journeys exploded into one flat row per touchpoint.
+
+    ``journey_id``, ``position``, ``path_length`` and ``channel_codes`` have
+    one entry per touchpoint; ``conversion_value`` has one entry per journey
+    (``0`` for journeys that did not convert) and is looked up by
+    ``journey_id``, so journey-level values are never duplicated.
+    """
+
+    journey_id: np.ndarray
+    position: np.ndarray
+    path_length: np.ndarray
+    channel_codes: np.ndarray
+    channels: List[str]
+    conversion_value: np.ndarray
+
+    @property
+    def num_journeys(self) -> int:
+        return len(self.conversion_value)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns the touchpoint table as a DataFrame (for display and export)."""
+        return pd.DataFrame(
+            {
+                "Journey ID": self.journey_id,
+                "Position": self.position,
+                "Path Length": self.path_length,
+                "Channel": pd.Categorical.from_codes(self.channel_codes, self.channels),
+                "Conversion Value": self.conversion_value[self.journey_id],
+            }
+        )
+
+    def converting(self) -> "Touchpoints":
+        """Keeps only the touchpoints of journeys with a positive conversion value."""
+        journey_mask = self.conversion_value > 0
+        keep = journey_mask[self.journey_id]
+        new_ids = np.cumsum(journey_mask) - 1
+        return Touchpoints(
+            journey_id=new_ids[self.journey_id[keep]],
+            position=self.position[keep],
+            path_length=self.path_length[keep],
+            channel_codes=self.channel_codes[keep],
+            channels=self.channels,
+            conversion_value=self.conversion_value[journey_mask],
+        )
+
+
+def _from_lengths(
+    lengths: np.ndarray,
+    channel_codes: np.ndarray,
+    channels: List[str],
+    conversion_value: np.ndarray,
+) -> Touchpoints:
+    lengths = np.asarray(lengths, dtype=np.int64)
+    journey_id = np.repeat(np.arange(lengths.size), lengths)
+    starts = np.cumsum(lengths) - lengths
+    return Touchpoints(
+        journey_id=journey_id,
+        position=(np.arange(journey_id.size) - starts[journey_id]).astype(np.int32),
+        path_length=lengths[journey_id].astype(np.int32),
+        channel_codes=np.asarray(channel_codes),
+        channels=list(channels),
+        conversion_value=np.asarray(conversion_value, dtype=float),
+    )
+
+
+def explode_journeys(
+    journey_df: pd.DataFrame,
+    path_col: str = "Journey Path",
+    conversion_col: str = "Conversion",
+    value_col: Optional[str] = "Conversion Value",
+    channels: Optional[Sequence[str]] = None,
+) -> Touchpoints:
+    """Explodes a frame of journey paths (lists of channels) into ``Touchpoints``.
+
+    Paths are flattened once; without ``value_col`` each conversion counts 1.
+    """
+    paths = journey_df[path_col]
+    lengths = paths.map(len).to_numpy()
+    flat = pd.Categorical(list(chain.from_iterable(paths)), categories=channels)
+    converted = journey_df[conversion_col].to_numpy(dtype=bool)
+    values = (
+        journey_df[value_col].to_numpy(dtype=float)
+        if value_col is not None
+        else np.ones(len(journey_df))
+    )
+    return _from_lengths(
+        lengths,
+        flat.codes,
+        list(flat.categories),
+        np.where(converted, values, 0.0),
+    )
+
+
+def simulate_touchpoints(
+    num_journeys: int,
+    channels: Sequence[str],
+    max_length: int = 5,
+    conversion_rate: float = 0.15,
+    value_range: tuple = (50, 500),
+    rng: Optional[np.random.Generator] = None,
+) -> Touchpoints:
+    """Simulates journeys directly in touchpoint form with bulk array draws.
+
+    Path lengths are uniform on ``1..max_length``, every touch picks a
+    channel uniformly, and converting journeys get a uniform value.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    lengths = rng.integers(1, max_length + 1, size=num_journeys)
+    codes = rng.integers(0, len(channels), size=int(lengths.sum()), dtype=np.int16)
+    converted = rng.random(num_journeys) < conversion_rate
+    values = np.where(converted, rng.uniform(*value_range, size=num_journeys), 0.0)
+    return _from_lengths(lengths, codes, list(channels), values)
+
+
+def touch_weights(
+    touchpoints: Touchpoints, model: str, half_life: float = 1.0
+) -> np.ndarray:
+    """Returns each touchpoint's share of its journey's conversion under ``model``.
+
+    Shares sum to one per journey. Time decay halves the credit every
+    ``half_life`` steps back from the conversion; position-based gives 40%
+    each to the first and last touch and splits 20% across the middle.
+    """
+    position, length = touchpoints.position, touchpoints.path_length
+    if model == "Last Click":
+        return (position == length - 1).astype(float)
+    if model == "First Click":
+        return (position == 0).astype(float)
+    if model == "Linear":
+        return 1.0 / length
+    if model == "Time Decay":
+        raw = np.exp2(-(length - 1 - position) / half_life)
+        totals = np.bincount(
+            touchpoints.journey_id, weights=raw, minlength=touchpoints.num_journeys
+        )
+        return raw / totals[touchpoints.journey_id]
+    if model == "Position-Based":
+        ends = (position == 0) | (position == length - 1)
+        middle = np.maximum(length - 2, 1)
+        weights = np.where(ends, 0.4, 0.2 / middle)
+        weights[length == 1] = 1.0
+        weights[length == 2] = 0.5
+        return weights
+    raise ValueError(f"Unknown attribution model {model!r}")
+
+
+def attribute(
+    touchpoints: Touchpoints,
+    models: Iterable[str] = ATTRIBUTION_MODELS,
+    half_life: float = 1.0,
+) -> pd.DataFrame:
+    """Attributes conversion value to channels under several models at once.
+
+    Only converting journeys are kept, each model contributes one credit
+    column and a single grouped sum by channel produces every model's
+    totals. Returns one row per channel and one column per model.
+    """
+    models = list(models)
+    converting = touchpoints.converting()
+    value = converting.conversion_value[converting.journey_id]
+    credits = (
+        np.column_stack(
+            [touch_weights(converting, model, half_life) * value for model in models]
+        )
+        if models
+        else np.empty((value.size, 0))
+    )
+    num_channels = len(touchpoints.channels)
+    # One grouped sum for all models: offset each model's channel codes
+    codes = converting.channel_codes.astype(np.int64)
+    group = codes[:, None] + num_channels * np.arange(len(models))
+    totals = np.bincount(
+        group.ravel(), weights=credits.ravel(), minlength=num_channels * len(models)
+    )
+    return pd.DataFrame(
+        totals.reshape(len(models), num_channels).T,
+        index=pd.Index(touchpoints.channels, name="Channel"),
+        columns=models,
+    )
+
+
+def journey_channel_sets(touchpoints: Touchpoints) -> np.ndarray:
+    """Returns each journey's set of channels as a bitmask (bit ``i`` = channel ``i``)."""
+    masks = np.zeros(touchpoints.num_journeys, dtype=np.int64)
+    if touchpoints.journey_id.size:
+        bits = np.left_shift(1, touchpoints.channel_codes.astype(np.int64))
+        starts = np.flatnonzero(touchpoints.position == 0)
+        masks[touchpoints.journey_id[starts]] = np.bitwise_or.reduceat(bits, starts)
+    return masks
+
+
+class MarkovAttribution:
+    """Removal-effect attribution from a first-order Markov chain over channels.
+
+    ``fit`` counts every transition (start -> first touch -> ... -> conversion
+    or null) into a sparse matrix once per dataset and is a no-op when the
+    touchpoints are unchanged. Conversion probabilities are solved as an
+    absorbing chain and memoized per removed channel, so re-attributing only
+    costs a dictionary lookup.
+    """
+
+    def __init__(self):
+        self.transitions_: Optional[sparse.csr_matrix] = None
+        self._fingerprint: Optional[str] = None
+        self._probabilities: Dict[Optional[int], float] = {}
+
+    def fit(self, touchpoints: Touchpoints) -> "MarkovAttribution":
+        """Builds the transition probability matrix unless already fitted."""
+        key = "-".join(
+            fingerprint(array)
+            for array in (
+                touchpoints.journey_id,
+                touchpoints.channel_codes,
+                touchpoints.conversion_value,
+            )
+        )
+        if key == self._fingerprint:
+            return self
+        n = len(touchpoints.channels)
+        # States: 0 = start, 1..n = channels, n + 1 = conversion, n + 2 = null
+        start, conversion, null = 0, n + 1, n + 2
+        states = touchpoints.channel_codes.astype(np.int64) + 1
+        first = touchpoints.position == 0
+        last = touchpoints.position == touchpoints.path_length - 1
+        converted = touchpoints.conversion_value[touchpoints.journey_id] > 0
+        source = np.concatenate([np.full(first.sum(), start), states[:-1][~last[:-1]]])
+        target = np.concatenate([states[first], states[1:][~last[:-1]]])
+        source = np.concatenate([source, states[last]])
+        target = np.concatenate([target, np.where(converted[last], conversion, null)])
+        counts = sparse.coo_matrix(
+            (np.ones(source.size), (source, target)), shape=(n + 3, n + 3)
+        ).tocsr()
+        totals = np.asarray(counts.sum(axis=1)).ravel()
+        with np.errstate(divide="ignore"):
+            scale = np.where(totals > 0, 1.0 / totals, 0.0)
+        self.transitions_ = sparse.diags(scale) @ counts
+        self.channels = list(touchpoints.channels)
+        self.total_value = float(touchpoints.conversion_value.sum())
+        self._fingerprint = key
+        self._probabilities = {}
+        return self
+
+    def conversion_probability(self, removed: Optional[int] = None) -> float:
+        """Probability of reaching conversion from start, optionally without a channel."""
+        if removed not in self._probabilities:
+            n = len(self.channels)
+            transient = self.transitions_[: n + 1, : n + 1].tolil()
+            if removed is not None:
+                # Traffic into the removed channel is lost (sent to null)
+                transient[:, removed + 1] = 0
+            to_conversion = self.transitions_[: n + 1, n + 1].toarray().ravel()
+            system = sparse.identity(n + 1, format="csc") - transient.tocsc()
+            self._probabilities[removed] = float(
+                np.atleast_1d(spsolve(system, to_conversion))[0]
+            )
+        return self._probabilities[removed]
+
+    def removal_effects(self) -> pd.Series:
+        """Share of conversion probability lost when each channel is removed."""
+        base = self.conversion_probability()
+        effects = [
+            1 - self.conversion_probability(code) / base if base > 0 else 0.0
+            for code in range(len(self.channels))
+        ]
+        return pd.Series(
+            effects,
+            index=pd.Index(self.channels, name="Channel"),
+            name="Removal Effect",
+        )
+
+    def attribute(self) -> pd.Series:
+        """Splits the total conversion value in proportion to removal effects."""
+        effects = self.removal_effects()
+        total = effects.sum()
+        shares = effects / total if total > 0 else effects * 0.0
+        return (shares * self.total_value).rename("Markov Chain")
+
+
+def coalition_values(touchpoints: Touchpoints) -> np.ndarray:
+    """Returns ``v(S)`` for every channel subset ``S`` (indexed by bitmask).
+
+    ``v(S)`` is the conversion value of journeys whose channels all lie in
+    ``S``. Journeys are first reduced to their unique channel sets, and a
+    subset-sum pass over the ``2 ** n`` table then fills every coalition
+    from those few sets instead of re-scanning journeys per coalition.
+    """
+    n = len(touchpoints.channels)
+    if n > MAX_SHAPLEY_CHANNELS:
+        raise ValueError(
+            f"Shapley attribution supports at most {MAX_SHAPLEY_CHANNELS} channels"
+        )
+    converting = touchpoints.converting()
+    sets, inverse = np.unique(journey_channel_sets(converting), return_inverse=True)
+    values = np.zeros(1 << n)
+    values[sets] = np.bincount(inverse, weights=converting.conversion_value)
+    subsets = np.arange(1 << n)
+    for channel in range(n):
+        with_channel = (subsets >> channel) & 1 == 1
+        values[with_channel] += values[subsets[with_channel] ^ (1 << channel)]
+    return values
+
+
+def shapley_attribution(touchpoints: Touchpoints) -> pd.Series:
+    """Exact Shapley value of every channel over the coalition values.
+
+    Each channel's marginal contribution is weighted over all ``2 ** (n - 1)``
+    coalitions without it in one vectorized pass per channel.
+    """
+    n = len(touchpoints.channels)
+    values = coalition_values(touchpoints)
+    subsets = np.arange(1 << n)
+    sizes = np.array([bin(mask).count("1") for mask in range(1 << n)])
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, n + 1)))])
+    shapley = np.zeros(n)
+    for channel in range(n):
+        without = subsets[(subsets >> channel) & 1 == 0]
+        size = sizes[without]
+        weights = np.exp(
+            log_factorial[size] + log_factorial[n - size - 1] - log_factorial[n]
+        )
+        marginal = values[without | (1 << channel)] - values[without]
+        shapley[channel] = weights @ marginal
+    return pd.Series(
+        shapley,
+        index=pd.Index(touchpoints.channels, name="Channel"),
+        name="Shapley Value",
+    )
@@ -0,0 +1,206 @@
+# utils/batch_utils.py
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from statsmodels.stats.multitest import multipletests
+from utils.experiment_utils import (
+    ExperimentStats,
+    chi2_test,
+    reduce_experiment,
+    welch_t_test,
+)
+
+CORRECTION_METHODS = {
+    "Holm": "holm",
+    "Benjamini-Hochberg": "fdr_bh",
+    "Bonferroni": "bonferroni",
+}
+# Summary columns of an experiment table; proportions need the conversions,
+# means need the means and standard deviations
+EXPERIMENT_COLUMNS = [
+    "experiment_id",
+    "metric_type",
+    "control_n",
+    "treatment_n",
+    "control_conversions",
+    "treatment_conversions",
+    "control_mean",
+    "treatment_mean",
+    "control_std",
+    "treatment_std",
+]
+
+
+def simulate_experiment_table(
+    n_experiments: int = 200,
+    n_per_variant: int = 5000,
+    baseline_rate: float = 0.10,
+    relative_lift: float = 0.10,
+    share_with_effect: float = 0.10,
+    rng: Optional[np.random.Generator] = None,
+) -> pd.DataFrame:
+    """Simulates a table of concurrent conversion experiments.
+
+    A ``share_with_effect`` of the experiments have a true relative lift;
+    the rest are A/A tests, so the number of discoveries after correction
+    can be compared against the truth in ``true_effect``.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    has_effect = rng.random(n_experiments) < share_with_effect
+    treatment_rate = baseline_rate * (1 + relative_lift * has_effect)
+    return pd.DataFrame(
+        {
+            "experiment_id": [f"EXP-{i + 1:04d}" for i in range(n_experiments)],
+            "metric_type": "proportion",
+            "control_n": n_per_variant,
+            "treatment_n": n_per_variant,
+            "control_conversions": rng.binomial(
+                n_per_variant, baseline_rate, n_experiments
+            ),
+            "treatment_conversions": rng.binomial(n_per_variant, treatment_rate),
+            "true_effect": has_effect,
+        }
+    )
+
+
+def summarize_file(
+    path: Union[str, Path], metric_type: str = "proportion", chunksize: int = 100_000
+) -> Dict:
+    """Reduces one per-user result file (``Variant`` plus metric column) to a table row.
+
+    Variants are taken in sorted order, the first being the control.
+    """
+    value_col = "Revenue" if metric_type == "mean" else None
+    conversion_col = "Converted" if metric_type == "proportion" else None
+    stats = reduce_experiment(
+        pd.read_csv(path, chunksize=chunksize),
+        value_col=value_col,
+        conversion_col=conversion_col,
+    )
+    return {
+        "experiment_id": Path(path).stem,
+        "metric_type": metric_type,
+        "control_n": stats.n[0],
+        "treatment_n": stats.n[1],
+        "control_conversions": stats.conversions[0],
+        "treatment_conversions": stats.conversions[1],
+        "control_mean": stats.mean[0],
+        "treatment_mean": stats.mean[1],
+        "control_std": np.sqrt(stats.variance[0]),
+        "treatment_std": np.sqrt(stats.variance[1]),
+    }
+
+
+def analyze_summary(row: Dict) -> Dict:
+    """Tests one experiment given its summary row (see ``EXPERIMENT_COLUMNS``)."""
+    n = [row["control_n"], row["treatment_n"]]
+    if row["metric_type"] == "proportion":
+        conversions = [row["control_conversions"], row["treatment_conversions"]]
+        stats = ExperimentStats.from_sums(
+            ["A", "B"], n, conversions, conversions, conversions
+        )
+        result = chi2_test(stats)
+        statistic = result["Chi-Square Statistic"]
+    elif row["metric_type"] == "mean":
+        std = np.array([row["control_std"], row["treatment_std"]], dtype=float)
+        stats = ExperimentStats(
+            ["A", "B"],
+            np.asarray(n, dtype=float),
+            np.array([row["control_mean"], row["treatment_mean"]], dtype=float),
+            std**2 * (np.asarray(n, dtype=float) - 1),
+            np.zeros(2),
+        )
+        result = welch_t_test(stats)
+        statistic = result["t_statistic"]
+    else:
+        raise ValueError(f"Unknown metric_type {row['metric_type']!r}")
+    control, treatment = (
+        stats.conversion_rate if row["metric_type"] == "proportion" else stats.mean
+    )
+    return {
+        "Control": control,
+        "Treatment": treatment,
+        "Lift": treatment - control,
+        "Relative Lift": (treatment - control) / control if control else np.nan,
+        "Test": result["test_type"],
+        "Statistic": statistic,
+        "P-value": result["p_value"],
+    }
+
+
+def _analyze_unit(unit: List, metric_type: str) -> List[Dict]:
+    """Analyzes one work unit of summary rows or file paths, timing each experiment."""
+    results = []
+    for item in unit:
+        start = time.perf_counter()
+        is_file = isinstance(item, (str, Path))
+        record = {"Experiment": Path(item).stem if is_file else item["experiment_id"]}
+        try:
+            row = summarize_file(item, metric_type) if is_file else item
+            record.update(analyze_summary(row))
+            record["Error"] = None
+        except Exception as e:  # One bad experiment must not sink the batch
+            record["Error"] = f"{type(e).__name__}: {e}"
+        record["Seconds"] = time.perf_counter() - start
+        results.append(record)
+    return results
+
+
+def analyze_batch(
+    experiments: Union[pd.DataFrame, str, Path],
+    correction: str = "Holm",
+    alpha: float = 0.05,
+    metric_type: str = "proportion",
+    max_workers: Optional[int] = 1,
+    chunk_size: int = 64,
+) -> pd.DataFrame:
+    """Analyzes many experiments and corrects for multiple testing.
+
+    ``experiments`` is either a summary table with ``EXPERIMENT_COLUMNS``
+    or a directory of per-user ``*.csv`` result files (one per experiment,
+    all of ``metric_type``). Work is split into units of ``chunk_size``
+    experiments, run inline by default: starting a process pool costs more
+    than analyzing hundreds of summary rows. Pass ``max_workers`` above 1,
+    or ``None`` for one worker per CPU, to fan the units out over a pool,
+    which pays off for large directories of raw files. The ``correction``
+    is applied across every experiment that produced a p-value. Returns one
+    row per experiment with its timing; failures are reported in ``Error``
+    instead of raising.
+    """
+    if correction not in CORRECTION_METHODS:
+        raise ValueError(f"correction must be one of {list(CORRECTION_METHODS)}")
+    if isinstance(experiments, pd.DataFrame):
+        items = experiments.to_dict("records")
+    else:
+        items = sorted(str(path) for path in Path(experiments).glob("*.csv"))
+    units = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    if max_workers == 1 or len(units) <= 1:
+        results = [_analyze_unit(unit, metric_type) for unit in units]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_analyze_unit, units, [metric_type] * len(units)))
+    frame = pd.DataFrame([record for unit in results for record in unit])
+    if frame.empty:
+        return frame
+
+    p_values = (
+        frame["P-value"] if "P-value" in frame else pd.Series(np.nan, frame.index)
+    )
+    tested = p_values.notna().to_numpy()
+    adjusted = np.full(len(frame), np.nan)
+    significant = np.zeros(len(frame), dtype=bool)
+    if tested.any():
+        significant[tested], adjusted[tested], _, _ = multipletests(
+            p_values[tested], alpha=alpha, method=CORRECTION_METHODS[correction]
+        )
+    frame["P-value"] = p_values
+    frame["Adjusted P-value"] = adjusted
+    frame["Significant"] = significant
+    columns = [c for c in frame.columns if c not in ("Error", "Seconds")]
+    return frame[columns + ["Error", "Seconds"]]
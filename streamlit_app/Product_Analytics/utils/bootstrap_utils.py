@@ -0,0 +1,313 @@
+# utils/bootstrap_utils.py
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Tuple, Union
+
+import numpy as np
+from scipy import stats
+
+BOOTSTRAP_METHODS = ("percentile", "bca")
+# Statistics computed from resampled value counts, so resamples never
+# materialize individual rows
+COUNT_STATISTICS = ("mean", "std", "median")
+BLOCK_ELEMENTS = 2**22  # Cap on resample-matrix entries held at once
+MIN_BLOCK_RESAMPLES = 16  # Floor on resamples per task, however large the data
+
+Statistic = Union[str, Callable[..., np.ndarray]]
+
+
+@dataclass
+class BootstrapResult:
+    """Bootstrap distribution of a statistic and its confidence interval."""
+
+    estimate: float
+    distribution: np.ndarray
+    confidence_interval: Tuple[float, float]
+    confidence: float
+    method: str
+
+    @property
+    def standard_error(self) -> float:
+        return float(self.distribution.std(ddof=1))
+
+    @property
+    def n_resamples(self) -> int:
+        return self.distribution.size
+
+
+@dataclass
+class ValueCounts:
+    """Data compressed to its sorted unique values and their counts.
+
+    Built chunk by chunk with ``update``, so data larger than memory can be
+    bootstrapped as long as the number of distinct values fits.
+    """
+
+    values: np.ndarray
+    counts: np.ndarray
+
+    @classmethod
+    def from_array(cls, data, decimals: Optional[int] = None) -> "ValueCounts":
+        data = np.asarray(data, dtype=float).ravel()
+        if decimals is not None:
+            data = np.round(data, decimals)
+        values, counts = np.unique(data[~np.isnan(data)], return_counts=True)
+        return cls(values, counts.astype(np.int64))
+
+    @classmethod
+    def from_chunks(
+        cls, chunks: Iterable, decimals: Optional[int] = None
+    ) -> "ValueCounts":
+        """Reduces a stream of arrays (e.g. ``read_csv(chunksize=...)`` columns) in one pass."""
+        result = cls(np.empty(0), np.empty(0, dtype=np.int64))
+        for chunk in chunks:
+            result = result.update(cls.from_array(chunk, decimals))
+        return result
+
+    def update(self, other: "ValueCounts") -> "ValueCounts":
+        values, inverse = np.unique(
+            np.concatenate([self.values, other.values]), return_inverse=True
+        )
+        counts = np.bincount(
+            inverse,
+            weights=np.concatenate([self.counts, other.counts]),
+            minlength=values.size,
+        )
+        return ValueCounts(values, counts.astype(np.int64))
+
+    @property
+    def n(self) -> int:
+        return int(self.counts.sum())
+
+
+def _count_statistic(name: str, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Evaluates a statistic on (resamples x values) count matrices."""
+    n = counts.sum(axis=-1)
+    mean = counts @ values / n
+    if name == "mean":
+        return mean
+    if name == "std":
+        return np.sqrt(np.maximum(counts @ values**2 - n * mean**2, 0) / (n - 1))
+    # Lower median: first value whose cumulative count reaches half the data
+    cumulative = np.cumsum(counts, axis=-1)
+    return values[(cumulative >= np.expand_dims(n, -1) / 2).argmax(axis=-1)]
+
+
+def _lower_median(data: np.ndarray, axis: int = -1) -> np.ndarray:
+    """Lower median, matching the ``median`` of ``_count_statistic``."""
+    k = (data.shape[axis] + 1) // 2 - 1
+    return np.take(np.partition(data, k, axis=axis), k, axis=axis)
+
+
+def _sample_std(data: np.ndarray, axis: int = -1) -> np.ndarray:
+    return np.std(data, axis=axis, ddof=1)
+
+
+# Row-level versions of COUNT_STATISTICS, for data with mostly distinct values
+ROW_STATISTICS = {"mean": np.mean, "std": _sample_std, "median": _lower_median}
+
+
+def _count_influence(name: str, table: ValueCounts, estimate: float) -> np.ndarray:
+    """Empirical influence value of each distinct value (for the BCa acceleration)."""
+    if name == "mean":
+        return table.values - estimate
+    if name == "std":
+        mean = table.values @ table.counts / table.n
+        return (table.values - mean) ** 2 - estimate**2
+    return 0.5 - (table.values <= estimate)
+
+
+def _resample_counts(args) -> np.ndarray:
+    """Resamples one block of value counts with multinomial draws.
+
+    Draws are made in slices of at most ``BLOCK_ELEMENTS`` counts.
+    """
+    name, values, counts, size, seed = args
+    rng = np.random.default_rng(seed)
+    step = max(1, BLOCK_ELEMENTS // max(counts.size, 1))
+    results = []
+    for start in range(0, size, step):
+        resampled = rng.multinomial(
+            counts.sum(), counts / counts.sum(), size=min(step, size - start)
+        )
+        results.append(_count_statistic(name, values, resampled))
+    return np.concatenate(results)
+
+
+def _resample_indices(args) -> np.ndarray:
+    """Resamples one block of rows as 2-D index arrays of at most ``BLOCK_ELEMENTS``."""
+    statistic, data, size, seed = args
+    rng = np.random.default_rng(seed)
+    step = max(1, BLOCK_ELEMENTS // max(data.size, 1))
+    results = []
+    for start in range(0, size, step):
+        indices = rng.integers(0, data.size, size=(min(step, size - start), data.size))
+        results.append(statistic(data[indices], axis=1))
+    return np.concatenate(results)
+
+
+def _jackknife_influence(
+    statistic: Callable, data: np.ndarray, groups: int
+) -> np.ndarray:
+    """Delete-a-group jackknife influence values (all rows for small data)."""
+    index_groups = np.array_split(np.arange(data.size), min(groups, data.size))
+    estimates = np.array(
+        [statistic(np.delete(data, group), axis=0) for group in index_groups]
+    )
+    return estimates.mean() - estimates
+
+
+def _interval(
+    distribution: np.ndarray,
+    estimate: float,
+    confidence: float,
+    method: str,
+    influence: Optional[np.ndarray] = None,
+    weights: Optional[np.ndarray] = None,
+) -> Tuple[float, float]:
+    tail = (1 - confidence) / 2
+    quantiles = np.array([tail, 1 - tail])
+    if method == "bca":
+        bias = stats.norm.ppf(
+            np.mean(distribution < estimate) + np.mean(distribution == estimate) / 2
+        )
+        weights = np.ones_like(influence) if weights is None else weights
+        spread = (weights @ influence**2) ** 1.5
+        acceleration = (weights @ influence**3) / (6 * spread) if spread > 0 else 0.0
+        z = stats.norm.ppf(quantiles)
+        quantiles = stats.norm.cdf(bias + (bias + z) / (1 - acceleration * (bias + z)))
+    lower, upper = np.quantile(distribution, np.nan_to_num(quantiles, nan=0.5))
+    return float(lower), float(upper)
+
+
+def _run_blocks(worker: Callable, tasks: list, n_jobs: int) -> np.ndarray:
+    if n_jobs == 1 or len(tasks) == 1:
+        return np.concatenate([worker(task) for task in tasks])
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        return np.concatenate(list(pool.map(worker, tasks)))
+
+
+def _block_size(elements: int) -> int:
+    """Resamples per task: as many as fit ``BLOCK_ELEMENTS``, but at least a floor."""
+    return max(MIN_BLOCK_RESAMPLES, BLOCK_ELEMENTS // max(elements, 1))
+
+
+def _block_seeds(random_state, n_resamples: int, block_size: int):
+    """Splits resamples into blocks with independent child seeds.
+
+    Blocks depend only on ``block_size`` and the seed, so results are the
+    same whatever ``n_jobs`` is.
+    """
+    sizes = [
+        min(block_size, n_resamples - start)
+        for start in range(0, n_resamples, block_size)
+    ]
+    seed = (
+        random_state
+        if isinstance(random_state, np.random.SeedSequence)
+        else np.random.SeedSequence(random_state)
+    )
+    return zip(sizes, seed.spawn(len(sizes)))
+
+
+def bootstrap(
+    data,
+    statistic: Statistic = "mean",
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    method: str = "percentile",
+    n_jobs: int = 1,
+    block_size: Optional[int] = None,
+    random_state: Union[None, int, np.random.SeedSequence] = None,
+    jackknife_groups: int = 1000,
+) -> BootstrapResult:
+    """Bootstraps a statistic with vectorized resampling.
+
+    ``statistic`` is one of ``COUNT_STATISTICS`` or a callable that
+    reduces along an ``axis`` keyword (e.g. ``np.mean``, ``np.median``).
+    Named statistics resample multinomial counts over the distinct values
+    of the data (``ValueCounts`` may be passed directly, e.g. from
+    ``bootstrap_stream``), so their cost does not grow with the number of
+    rows; when most values are distinct, e.g. continuous data, rows are
+    resampled directly instead. Callables resample 2-D index blocks, and
+    each task handles ``block_size`` resamples (by default as many as fit
+    ``BLOCK_ELEMENTS`` entries, but at least ``MIN_BLOCK_RESAMPLES``,
+    drawn in slices so memory stays bounded). Blocks are spread over
+    ``n_jobs`` processes; callables must be picklable for that. ``method``
+    is ``"percentile"`` or ``"bca"``.
+    """
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"method must be one of {BOOTSTRAP_METHODS}")
+
+    if isinstance(statistic, str) or isinstance(data, ValueCounts):
+        if statistic not in COUNT_STATISTICS:
+            raise ValueError(
+                f"statistic must be a callable or one of {COUNT_STATISTICS}"
+            )
+        table = data if isinstance(data, ValueCounts) else ValueCounts.from_array(data)
+        estimate = float(_count_statistic(statistic, table.values, table.counts))
+        if 2 * table.values.size > table.n:
+            # Multinomial draws cost as much as the rows themselves here
+            rows = np.repeat(table.values, table.counts)
+            tasks = [
+                (ROW_STATISTICS[statistic], rows, size, seed)
+                for size, seed in _block_seeds(
+                    random_state, n_resamples, block_size or _block_size(rows.size)
+                )
+            ]
+            distribution = _run_blocks(_resample_indices, tasks, n_jobs)
+        else:
+            tasks = [
+                (statistic, table.values, table.counts, size, seed)
+                for size, seed in _block_seeds(
+                    random_state,
+                    n_resamples,
+                    block_size or _block_size(table.values.size),
+                )
+            ]
+            distribution = _run_blocks(_resample_counts, tasks, n_jobs)
+        influence, weights = (
+            (_count_influence(statistic, table, estimate), table.counts)
+            if method == "bca"
+            else (None, None)
+        )
+    else:
+        values = np.asarray(data, dtype=float).ravel()
+        tasks = [
+            (statistic, values, size, seed)
+            for size, seed in _block_seeds(
+                random_state, n_resamples, block_size or _block_size(values.size)
+            )
+        ]
+        estimate = float(statistic(values, axis=0))
+        distribution = _run_blocks(_resample_indices, tasks, n_jobs)
+        influence, weights = (
+            (_jackknife_influence(statistic, values, jackknife_groups), None)
+            if method == "bca"
+            else (None, None)
+        )
+
+    return BootstrapResult(
+        estimate=estimate,
+        distribution=distribution,
+        confidence_interval=_interval(
+            distribution, estimate, confidence, method, influence, weights
+        ),
+        confidence=confidence,
+        method=method,
+    )
+
+
+def bootstrap_stream(
+    chunks: Iterable,
+    statistic: str = "mean",
+    decimals: Optional[int] = None,
+    **kwargs,
+) -> BootstrapResult:
+    """Bootstraps data bigger than memory from a stream of chunks.
+
+    The chunks are reduced to ``ValueCounts`` in one pass (values rounded
+    to ``decimals`` if given, which bounds the number of distinct values),
+    then resampled as in ``bootstrap``.
+    """
+    return bootstrap(ValueCounts.from_chunks(chunks, decimals), statistic, **kwargs)
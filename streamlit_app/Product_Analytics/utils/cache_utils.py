@@ -0,0 +1,231 @@
+# utils/cache_utils.py
+import functools
+import hashlib
+import inspect
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+from utils import io_utils, rng_utils
+
+try:
+    import pyarrow as pa
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+CACHE_DIR = Path(
+    os.environ.get(
+        "PRODUCT_ANALYTICS_CACHE_DIR", Path.home() / ".cache" / "product_analytics"
+    )
+)
+CACHE_MAX_BYTES = 2 * 2**30
+CACHE_SUFFIX = ".arrow"
+CACHE_VERSION = 1  # Bump to invalidate every entry, e.g. when the file format changes
+SHARED_MAX_DATASETS = 32  # Mapped datasets kept open per process
+# Argument types whose repr is stable across processes, so calls can be keyed
+_KEYABLE = (type(None), bool, int, float, str, bytes)
+
+# Copy-on-write is always on from pandas 3, so shared_dataset can hand out
+# shallow copies of read-only mapped frames; before that callers get deep copies
+COPY_ON_WRITE = int(pd.__version__.split(".")[0]) >= 3
+
+
+def _source(obj) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return getattr(obj, "__qualname__", obj.__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _salt() -> bytes:
+    """Cache version plus the source of the helpers cached frames are built with.
+
+    Every key is salted with it, so changing how uploads are parsed
+    (``io_utils``) or how generators draw random numbers (``rng_utils``)
+    invalidates the entries built the old way.
+    """
+    payload = repr((CACHE_VERSION, _source(io_utils), _source(rng_utils)))
+    return hashlib.blake2b(payload.encode(), digest_size=32).digest()
+
+
+def bytes_key(data: bytes) -> str:
+    """Content address of raw input, e.g. an uploaded file's bytes."""
+    return hashlib.blake2b(data, digest_size=16, key=_salt()).hexdigest()
+
+
+def _keyable(value) -> bool:
+    if isinstance(value, (tuple, list)):
+        return all(_keyable(item) for item in value)
+    return isinstance(value, _KEYABLE)
+
+
+def call_key(func: Callable, args: tuple, kwargs: dict) -> Optional[str]:
+    """Content address of a generator call: its source code plus its arguments.
+
+    Like every key it is salted with the cache version and the shared
+    helpers' source (see ``_salt``). Returns ``None`` when an argument
+    (e.g. a random generator) has no stable representation, in which case
+    the call must not be cached.
+    """
+    if not _keyable(list(args) + list(kwargs.values())):
+        return None
+    payload = repr((func.__qualname__, _source(func), args, sorted(kwargs.items())))
+    return bytes_key(payload.encode())
+
+
+class DatasetCache:
+    """Content-addressed DataFrame store on local disk with LRU eviction.
+
+    Each entry is one uncompressed Arrow IPC (Feather v2) file named after
+    its key, so any process can find it and reload it by memory-mapping the
+    file instead of parsing. Files are written to a temporary name and
+    renamed, so concurrent writers never expose partial files. Hits refresh
+    the file's modification time; once the directory holds more than
+    ``max_bytes`` the least recently used files are deleted. Without
+    pyarrow the cache is a pass-through.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{CACHE_SUFFIX}"
+
+    def open_table(self, key: str) -> Optional["pa.Table"]:
+        """Memory-maps an entry as an Arrow table without reading it into memory."""
+        if not PYARROW_AVAILABLE:
+            return None
+        path = self.path(key)
+        try:
+            table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+            os.utime(path)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None  # Missing, evicted meanwhile, or a torn file from a crash
+        return table
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        table = self.open_table(key)
+        return table.to_pandas() if table is not None else None
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        if not PYARROW_AVAILABLE:
+            return
+        try:
+            table = pa.Table.from_pandas(df)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return  # e.g. object columns mixing types; such frames stay uncached
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temporary = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            with pa.OSFile(str(temporary), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(temporary, self.path(key))
+        finally:
+            temporary.unlink(missing_ok=True)
+        self.evict()
+
+    def get_or_create(
+        self, key: str, create: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        df = self.get(key)
+        if df is None:
+            df = create()
+            self.put(key, df)
+        return df
+
+    def evict(self) -> None:
+        """Deletes least recently used entries until the cache fits ``max_bytes``."""
+        entries = []
+        for path in self.directory.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for path in self.directory.glob(f"*{CACHE_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+
+_default_cache = DatasetCache()
+
+
+def get_dataset_cache() -> DatasetCache:
+    return _default_cache
+
+
+def cache_dataset(func: Callable[..., pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+    """Caches a DataFrame generator on disk, keyed on its source and arguments.
+
+    Calls with arguments that cannot be keyed are run without caching.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = call_key(func, args, kwargs)
+        if key is None:
+            return func(*args, **kwargs)
+        return get_dataset_cache().get_or_create(key, lambda: func(*args, **kwargs))
+
+    return wrapper
+
+
+_shared_frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_shared_lock = threading.Lock()
+
+
+def shared_dataset(func: Callable[..., pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+    """Serves a canned DataFrame as zero-copy views of one memory-mapped file.
+
+    The first call builds the frame and stores it in the dataset cache;
+    every process then maps that one file read-only and keeps a base frame
+    over it, so all sessions share the same physical pages. Each call
+    returns a shallow copy of the base, whose numeric and string columns
+    are views of the mapping (columns with missing values are
+    materialized), so a session costs almost no memory. Because the base
+    stays referenced, pandas copy-on-write copies a column on its first
+    write, and one session's edits never reach another's. Copy-on-write is
+    only guaranteed from pandas 3, so older pandas gets a writable deep copy
+    of the mapped frame instead (the file is still parsed only once).
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = call_key(func, args, kwargs)
+        if key is None or not PYARROW_AVAILABLE:
+            return func(*args, **kwargs)
+        with _shared_lock:
+            frame = _shared_frames.get(key)
+            if frame is None:
+                cache = get_dataset_cache()
+                table = cache.open_table(key)
+                if table is None:
+                    df = func(*args, **kwargs)
+                    cache.put(key, df)
+                    table = cache.open_table(key)
+                    if table is None:
+                        return df  # Not representable in Arrow
+                frame = table.to_pandas(split_blocks=True)
+                _shared_frames[key] = frame
+                while len(_shared_frames) > SHARED_MAX_DATASETS:
+                    _shared_frames.popitem(last=False)
+            _shared_frames.move_to_end(key)
+            return frame.copy(deep=not COPY_ON_WRITE)
+
+    return wrapper
@@ -1,30 +1,44 @@
 # utils/data_utils.py
+from typing import Optional
+
 import numpy as np
 import pandas as pd
+from utils.rng_utils import get_rng
 
 
 def generate_normal_data(
-    sample_size: int, loc: float = 15, scale: float = 5
+    sample_size: int,
+    loc: float = 15,
+    scale: float = 5,
+    rng: Optional[np.random.Generator] = None,
 ) -> np.ndarray:
-    """Generates normally distributed data."""
-    np.random.seed(42)
-    normal_data = np.random.normal(loc=loc, scale=scale, size=sample_size)
+    """Generates normally distributed data (reproducible unless ``rng`` is given)."""
+    if rng is None:
+        rng = get_rng("data_utils", "normal")
+    normal_data = rng.normal(loc=loc, scale=scale, size=sample_size)
     return np.clip(normal_data, 0, None)
 
 
-def generate_right_skewed_data(sample_size: int, scale: float = 5) -> np.ndarray:
-    """Generates right-skewed data."""
-    np.random.seed(42)
-    right_skewed_data = np.random.exponential(scale=scale, size=sample_size)
+def generate_right_skewed_data(
+    sample_size: int, scale: float = 5, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """Generates right-skewed data (reproducible unless ``rng`` is given)."""
+    if rng is None:
+        rng = get_rng("data_utils", "right_skewed")
+    right_skewed_data = rng.exponential(scale=scale, size=sample_size)
     return np.clip(right_skewed_data, 0, None)
 
 
 def generate_left_skewed_data(
-    sample_size: int, scale: float = 5, max_val: float = 20
+    sample_size: int,
+    scale: float = 5,
+    max_val: float = 20,
+    rng: Optional[np.random.Generator] = None,
 ) -> np.ndarray:
-    """Generates left-skewed data."""
-    np.random.seed(42)
-    left_skewed_data = max_val - np.random.exponential(scale=scale, size=sample_size)
+    """Generates left-skewed data (reproducible unless ``rng`` is given)."""
+    if rng is None:
+        rng = get_rng("data_utils", "left_skewed")
+    left_skewed_data = max_val - rng.exponential(scale=scale, size=sample_size)
     return np.clip(left_skewed_data, 0, max_val)
 
 
@@ -36,9 +50,14 @@ def generate_time_series_data(
     trend: float = 0.1,
     seasonality_amplitude: float = 10,
     noise_scale: float = 5,
+    rng: Optional[np.random.Generator] = None,
 ) -> pd.DataFrame:
-    """Generates time series data with trend, seasonality, and noise."""
-    np.random.seed(42)
+    """Generates time series data with trend, seasonality, and noise.
+
+    Reproducible unless ``rng`` is given.
+    """
+    if rng is None:
+        rng = get_rng("data_utils", "time_series")
     date_range = pd.date_range(start=start_date, periods=periods, freq=freq)
     time_index = np.arange(periods)
 
@@ -46,7 +65,7 @@ def generate_time_series_data(
     seasonal_component = seasonality_amplitude * np.sin(
         2 * np.pi * time_index / 30
     )  # Monthly seasonality
-    noise_component = np.random.normal(0, noise_scale, periods)
+    noise_component = rng.normal(0, noise_scale, periods)
 
     time_series_values = (
         base_value + trend_component + seasonal_component + noise_component
@@ -0,0 +1,426 @@
+# utils/experiment_utils.py
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+from scipy.stats import chi2_contingency, t, ttest_ind_from_stats
+
+
+def variant_names(n_variants: int) -> List[str]:
+    """Returns variant labels ``A``, ``B``, ``C``, ..."""
+    return [chr(65 + i) for i in range(n_variants)]
+
+
+def simulate_experiment(
+    n_users_per_variant: Union[int, Sequence[int]],
+    conversion_rates: Optional[Sequence[float]] = None,
+    avg_order_values: Optional[Sequence[float]] = None,
+    revenue_std: float = 20.0,
+    revenue_on_conversion: bool = False,
+    covariate_correlation: Optional[float] = None,
+    random_state: Union[None, int, np.random.Generator] = None,
+) -> pd.DataFrame:
+    """Simulates user-level A/B/n test data with bulk array draws.
+
+    Every column is preallocated for all variants at once from per-user
+    variant codes, so no per-user Python objects are created. Pass
+    ``conversion_rates`` for a binary ``Converted`` metric and/or
+    ``avg_order_values`` for a normal ``Revenue`` metric (clipped at 0; only
+    converters spend when ``revenue_on_conversion``). With
+    ``covariate_correlation`` a standardized ``Pre-Period Metric`` column is
+    added that correlates with the primary metric's noise, as a pre-experiment
+    covariate would. Results are deterministic for a given ``random_state``.
+    """
+    if conversion_rates is None and avg_order_values is None:
+        raise ValueError("Pass conversion_rates and/or avg_order_values")
+    n_variants = len(
+        conversion_rates if conversion_rates is not None else avg_order_values
+    )
+    sizes = np.broadcast_to(np.asarray(n_users_per_variant, dtype=np.int64), n_variants)
+    rng = (
+        random_state
+        if isinstance(random_state, np.random.Generator)
+        else np.random.default_rng(random_state)
+    )
+
+    codes = np.repeat(np.arange(n_variants, dtype=np.int8), sizes)
+    n = codes.size
+    converted = np.zeros(n, dtype=np.int8)
+    revenue = np.zeros(n)
+    latent = rng.standard_normal(n)  # Noise of the primary metric
+
+    if avg_order_values is not None:
+        aov = np.asarray(avg_order_values, dtype=float)
+        np.maximum(aov[codes] + revenue_std * latent, 0, out=revenue)
+    if conversion_rates is not None:
+        rates = np.asarray(conversion_rates, dtype=float)
+        # Converting through a normal threshold keeps the draw Bernoulli(rate)
+        # while letting the covariate correlate with it
+        noise = latent if avg_order_values is None else rng.standard_normal(n)
+        converted[:] = noise < ndtri(rates)[codes]
+        if avg_order_values is not None and revenue_on_conversion:
+            revenue *= converted
+
+    data = {
+        "Variant": pd.Categorical.from_codes(codes, variant_names(n_variants)),
+        "UserID": np.arange(1, n + 1),
+        "Converted": converted,
+        "Revenue": revenue,
+    }
+    if covariate_correlation is not None:
+        rho = float(covariate_correlation)
+        if not -1 <= rho <= 1:
+            raise ValueError("covariate_correlation must be between -1 and 1")
+        data["Pre-Period Metric"] = rho * latent + np.sqrt(
+            1 - rho**2
+        ) * rng.standard_normal(n)
+    return pd.DataFrame(data)
+
+
+@dataclass
+class ExperimentStats:
+    """Per-variant sufficient statistics for A/B tests.
+
+    Holds the user count, metric mean, centered sum of squares (``m2``) and
+    conversion count of every variant. Tests only need these few numbers,
+    so they run in O(variants) however many users were reduced. Partial
+    results from separate chunks combine with ``merge``.
+    """
+
+    variants: List[str]
+    n: np.ndarray
+    mean: np.ndarray
+    m2: np.ndarray
+    conversions: np.ndarray
+
+    @classmethod
+    def from_sums(
+        cls,
+        variants: Sequence[str],
+        n: Sequence[float],
+        sums: Sequence[float],
+        sums_of_squares: Sequence[float],
+        conversions: Optional[Sequence[float]] = None,
+    ) -> "ExperimentStats":
+        """Builds the statistics from per-variant ``n``, sum and sum of squares."""
+        n = np.asarray(n, dtype=float)
+        sums = np.asarray(sums, dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, sums / n, 0.0)
+        return cls(
+            variants=list(variants),
+            n=n,
+            mean=mean,
+            m2=np.maximum(np.asarray(sums_of_squares, dtype=float) - n * mean**2, 0),
+            conversions=(
+                np.zeros_like(n)
+                if conversions is None
+                else np.asarray(conversions, dtype=float)
+            ),
+        )
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        group_col: str = "Variant",
+        value_col: Optional[str] = "Revenue",
+        conversion_col: Optional[str] = "Converted",
+    ) -> "ExperimentStats":
+        """Reduces per-user rows to per-variant statistics with grouped bincounts."""
+        codes, uniques = pd.factorize(df[group_col], sort=True)
+        k = len(uniques)
+        n = np.bincount(codes, minlength=k).astype(float)
+        mean = np.zeros(k)
+        m2 = np.zeros(k)
+        if value_col is not None:
+            values = df[value_col].to_numpy(dtype=float)
+            mean = np.bincount(codes, weights=values, minlength=k) / np.maximum(n, 1)
+            m2 = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=k)
+        conversions = (
+            np.bincount(
+                codes, weights=df[conversion_col].to_numpy(dtype=float), minlength=k
+            )
+            if conversion_col is not None
+            else np.zeros(k)
+        )
+        return cls([str(v) for v in uniques], n, mean, m2, conversions)
+
+    def merge(self, other: "ExperimentStats") -> "ExperimentStats":
+        """Combines two partial results (Chan et al.'s parallel variance update)."""
+        variants = sorted(set(self.variants) | set(other.variants))
+        left, right = self._aligned(variants), other._aligned(variants)
+        n = left.n + right.n
+        delta = right.mean - left.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(n > 0, right.n / n, 0.0)
+        return ExperimentStats(
+            variants=variants,
+            n=n,
+            mean=left.mean + delta * weight,
+            m2=left.m2 + right.m2 + delta**2 * left.n * weight,
+            conversions=left.conversions + right.conversions,
+        )
+
+    def _aligned(self, variants: List[str]) -> "ExperimentStats":
+        position = {variant: i for i, variant in enumerate(self.variants)}
+        index = np.array([position.get(variant, -1) for variant in variants])
+        present = index >= 0
+
+        def take(values: np.ndarray) -> np.ndarray:
+            return np.where(present, np.append(values, 0.0)[index], 0.0)
+
+        return ExperimentStats(
+            variants,
+            take(self.n),
+            take(self.mean),
+            take(self.m2),
+            take(self.conversions),
+        )
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance (``ddof=1``) of the metric per variant."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.n > 1, self.m2 / (self.n - 1), np.nan)
+
+    @property
+    def conversion_rate(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.n > 0, self.conversions / self.n, np.nan)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns one row of statistics per variant."""
+        return pd.DataFrame(
+            {
+                "Users": self.n.astype(np.int64),
+                "Mean": self.mean,
+                "Std Dev": np.sqrt(self.variance),
+                "Conversions": self.conversions.astype(np.int64),
+                "Conversion Rate": self.conversion_rate,
+            },
+            index=pd.Index(self.variants, name="Variant"),
+        )
+
+
+def reduce_experiment(
+    chunks: Iterable[pd.DataFrame],
+    group_col: str = "Variant",
+    value_col: Optional[str] = "Revenue",
+    conversion_col: Optional[str] = "Converted",
+) -> ExperimentStats:
+    """Reduces a stream of per-user chunks (e.g. ``pd.read_csv(chunksize=...)``) in one pass.
+
+    Only the running per-variant statistics are kept, so memory does not
+    grow with the number of users.
+    """
+    result = None
+    for chunk in chunks:
+        stats = ExperimentStats.from_frame(chunk, group_col, value_col, conversion_col)
+        result = stats if result is None else result.merge(stats)
+    if result is None:
+        raise ValueError("No data to reduce")
+    return result
+
+
+def welch_t_test(stats: ExperimentStats, group_1: int = 0, group_2: int = 1) -> Dict:
+    """Welch's t-test between two variants, computed from their statistics."""
+    t_statistic, p_value = ttest_ind_from_stats(
+        stats.mean[group_1],
+        np.sqrt(stats.variance[group_1]),
+        stats.n[group_1],
+        stats.mean[group_2],
+        np.sqrt(stats.variance[group_2]),
+        stats.n[group_2],
+        equal_var=False,
+    )
+    return {
+        "test_type": "Independent Samples T-Test (Welch's)",
+        "t_statistic": t_statistic,
+        "p_value": p_value,
+        "group_1_mean": stats.mean[group_1],
+        "group_2_mean": stats.mean[group_2],
+    }
+
+
+def chi2_test(stats: ExperimentStats, outcome_name: str = "Converted") -> Dict:
+    """Chi-square test of conversion against variant from the per-variant counts."""
+    contingency_table = pd.DataFrame(
+        np.column_stack([stats.n - stats.conversions, stats.conversions]).astype(
+            np.int64
+        ),
+        index=pd.Index(stats.variants, name="Variant"),
+        columns=pd.Index([0, 1], name=outcome_name),
+    )
+    chi2, p, dof, expected = chi2_contingency(contingency_table)
+    return {
+        "test_type": "Chi-Square Test",
+        "Chi-Square Statistic": chi2,
+        "p_value": p,
+        "Degrees of Freedom": dof,
+        "Contingency Table": contingency_table,
+        "Expected Frequencies": expected,
+    }
+
+
+@dataclass
+class CupedStats:
+    """Per-variant moments of a metric and a pre-period covariate for CUPED.
+
+    Besides the metric's ``n``, mean and ``m2`` it keeps the covariate's mean
+    and ``m2`` and the metric/covariate co-moment ``c_xy``, all of which merge
+    across chunks like ``ExperimentStats``. ``theta`` is the pooled
+    within-variant slope, i.e. the covariate coefficient of a regression of
+    the metric on variant indicators and the covariate.
+    """
+
+    variants: List[str]
+    n: np.ndarray
+    mean_y: np.ndarray
+    mean_x: np.ndarray
+    m2_y: np.ndarray
+    m2_x: np.ndarray
+    c_xy: np.ndarray
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        group_col: str = "Variant",
+        value_col: str = "Revenue",
+        covariate_col: str = "Pre-Period Metric",
+    ) -> "CupedStats":
+        """Reduces per-user rows to per-variant moments with grouped bincounts."""
+        codes, uniques = pd.factorize(df[group_col], sort=True)
+        k = len(uniques)
+        n = np.bincount(codes, minlength=k).astype(float)
+        y = df[value_col].to_numpy(dtype=float)
+        x = df[covariate_col].to_numpy(dtype=float)
+        mean_y = np.bincount(codes, weights=y, minlength=k) / np.maximum(n, 1)
+        mean_x = np.bincount(codes, weights=x, minlength=k) / np.maximum(n, 1)
+        dy, dx = y - mean_y[codes], x - mean_x[codes]
+        return cls(
+            [str(v) for v in uniques],
+            n,
+            mean_y,
+            mean_x,
+            np.bincount(codes, weights=dy * dy, minlength=k),
+            np.bincount(codes, weights=dx * dx, minlength=k),
+            np.bincount(codes, weights=dx * dy, minlength=k),
+        )
+
+    def merge(self, other: "CupedStats") -> "CupedStats":
+        """Combines two partial results (Chan et al.'s update, with co-moments)."""
+        variants = sorted(set(self.variants) | set(other.variants))
+        left, right = self._aligned(variants), other._aligned(variants)
+        n = left.n + right.n
+        delta_y = right.mean_y - left.mean_y
+        delta_x = right.mean_x - left.mean_x
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(n > 0, right.n / n, 0.0)
+        return CupedStats(
+            variants=variants,
+            n=n,
+            mean_y=left.mean_y + delta_y * weight,
+            mean_x=left.mean_x + delta_x * weight,
+            m2_y=left.m2_y + right.m2_y + delta_y**2 * left.n * weight,
+            m2_x=left.m2_x + right.m2_x + delta_x**2 * left.n * weight,
+            c_xy=left.c_xy + right.c_xy + delta_x * delta_y * left.n * weight,
+        )
+
+    def _aligned(self, variants: List[str]) -> "CupedStats":
+        position = {variant: i for i, variant in enumerate(self.variants)}
+        index = np.array([position.get(variant, -1) for variant in variants])
+        present = index >= 0
+
+        def take(values: np.ndarray) -> np.ndarray:
+            return np.where(present, np.append(values, 0.0)[index], 0.0)
+
+        return CupedStats(
+            variants,
+            take(self.n),
+            take(self.mean_y),
+            take(self.mean_x),
+            take(self.m2_y),
+            take(self.m2_x),
+            take(self.c_xy),
+        )
+
+    @property
+    def theta(self) -> float:
+        m2_x = self.m2_x.sum()
+        return float(self.c_xy.sum() / m2_x) if m2_x > 0 else 0.0
+
+    def adjusted_stats(self) -> ExperimentStats:
+        """Returns ``ExperimentStats`` of ``Y - theta * (X - mean(X))`` per variant."""
+        theta = self.theta
+        overall_x = np.average(self.mean_x, weights=self.n)
+        return ExperimentStats(
+            variants=self.variants,
+            n=self.n,
+            mean=self.mean_y - theta * (self.mean_x - overall_x),
+            m2=np.maximum(self.m2_y - 2 * theta * self.c_xy + theta**2 * self.m2_x, 0),
+            conversions=np.zeros_like(self.n),
+        )
+
+    def raw_stats(self) -> ExperimentStats:
+        """Returns the unadjusted metric statistics."""
+        return ExperimentStats(
+            self.variants, self.n, self.mean_y, self.m2_y, np.zeros_like(self.n)
+        )
+
+
+def reduce_cuped(
+    chunks: Iterable[pd.DataFrame],
+    group_col: str = "Variant",
+    value_col: str = "Revenue",
+    covariate_col: str = "Pre-Period Metric",
+) -> CupedStats:
+    """Reduces a stream of per-user chunks to CUPED moments in one pass."""
+    result = None
+    for chunk in chunks:
+        stats = CupedStats.from_frame(chunk, group_col, value_col, covariate_col)
+        result = stats if result is None else result.merge(stats)
+    if result is None:
+        raise ValueError("No data to reduce")
+    return result
+
+
+def difference_interval(
+    stats: ExperimentStats, group_1: int = 0, group_2: int = 1, alpha: float = 0.05
+) -> Dict:
+    """Welch estimate and confidence interval of ``mean[group_2] - mean[group_1]``."""
+    var_1 = stats.variance[group_1] / stats.n[group_1]
+    var_2 = stats.variance[group_2] / stats.n[group_2]
+    standard_error = np.sqrt(var_1 + var_2)
+    dof = (var_1 + var_2) ** 2 / (
+        var_1**2 / (stats.n[group_1] - 1) + var_2**2 / (stats.n[group_2] - 1)
+    )
+    effect = stats.mean[group_2] - stats.mean[group_1]
+    margin = t.ppf(1 - alpha / 2, dof) * standard_error
+    return {
+        "effect": effect,
+        "standard_error": standard_error,
+        "ci_lower": effect - margin,
+        "ci_upper": effect + margin,
+        "p_value": 2 * t.sf(abs(effect) / standard_error, dof),
+    }
+
+
+def cuped_test(
+    stats: CupedStats, group_1: int = 0, group_2: int = 1, alpha: float = 0.05
+) -> Dict:
+    """Compares raw and CUPED-adjusted effect estimates between two variants."""
+    raw = difference_interval(stats.raw_stats(), group_1, group_2, alpha)
+    adjusted = difference_interval(stats.adjusted_stats(), group_1, group_2, alpha)
+    return {
+        "test_type": "CUPED-Adjusted Welch's T-Test",
+        "theta": stats.theta,
+        "raw": raw,
+        "adjusted": adjusted,
+        "variance_reduction": 1
+        - (adjusted["standard_error"] / raw["standard_error"]) ** 2,
+        "p_value": adjusted["p_value"],
+    }
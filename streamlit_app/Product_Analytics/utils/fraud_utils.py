@@ -0,0 +1,298 @@
+# utils/fraud_utils.py
+from collections import deque
+from typing import (
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = [
+    "Grocery",
+    "Electronics",
+    "Clothing",
+    "Restaurant",
+    "Travel",
+    "Home Goods",
+    "Entertainment",
+]
+LOCATIONS = [
+    {"city": "New York", "lat": 40.7128, "lon": -74.0060},
+    {"city": "London", "lat": 51.5074, "lon": 0.1278},
+    {"city": "Tokyo", "lat": 35.6895, "lon": 139.6917},
+    {"city": "Sydney", "lat": -33.8688, "lon": 151.2093},
+    {"city": "Paris", "lat": 48.8566, "lon": 2.3522},
+    {"city": "Rio de Janeiro", "lat": -22.9068, "lon": -43.1729},
+    {"city": "Cairo", "lat": 30.0444, "lon": 31.2357},
+]
+ANOMALY_CATEGORY = "Luxury Goods"  # Unusual category
+ANOMALY_LOCATION = {"city": "Dubai", "lat": 25.2048, "lon": 55.2708}  # Unusual location
+ANOMALY_TYPES = ("amount", "location", "category", "velocity")
+STREAM_BLOCK_SIZE = 65_536  # Rows drawn per seeded block in streaming mode
+
+VELOCITY_BURST_SIZE = 8  # Average transactions per simulated velocity burst
+VELOCITY_BURST_SPAN = pd.Timedelta(minutes=10)
+VELOCITY_WINDOWS = {
+    "1m": pd.Timedelta(minutes=1),
+    "1h": pd.Timedelta(hours=1),
+    "24h": pd.Timedelta(hours=24),
+}
+
+
+def generate_transactions(
+    num_transactions: int,
+    anomaly_rate: float = 0.05,
+    anomaly_types: Iterable[str] = ("amount",),
+    rng: Optional[np.random.Generator] = None,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    start_id: int = 1,
+    num_customers: int = 1000,
+    time_ordered: bool = False,
+) -> pd.DataFrame:
+    """Generates simulated transactions column by column with bulk array draws.
+
+    Every column is drawn for all rows at once, so the cost is a handful of
+    NumPy calls regardless of ``num_transactions``. ``anomaly_types`` may
+    combine any of ``ANOMALY_TYPES``; each applies to the same anomalous rows.
+    Timestamps are uniform over ``[start, end)``, which defaults to the 30
+    days up to now. Velocity anomalies are bursts of transactions on a few
+    compromised customers within ``VELOCITY_BURST_SPAN`` of each other.
+    """
+    anomaly_types = set(anomaly_types)
+    unknown = anomaly_types.difference(ANOMALY_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown anomaly types: {sorted(unknown)}")
+    if rng is None:
+        rng = np.random.default_rng()
+    end = pd.Timestamp.now() if end is None else pd.Timestamp(end)
+    start = end - pd.Timedelta(days=30) if start is None else pd.Timestamp(start)
+    start_ns, end_ns = start.value, end.value
+    n = int(num_transactions)
+
+    amount = rng.normal(50, 15, size=n)
+    is_anomaly = rng.random(n) < anomaly_rate
+    category_codes = rng.integers(0, len(CATEGORIES), size=n, dtype=np.int8)
+    location_codes = rng.integers(0, len(LOCATIONS), size=n, dtype=np.int8)
+    customer_ids = rng.integers(1, num_customers + 1, size=n)
+    timestamps = rng.integers(start_ns, end_ns, size=n)
+
+    anomaly_idx = np.flatnonzero(is_anomaly)
+    if "amount" in anomaly_types:
+        # Higher amounts for anomalies
+        amount[anomaly_idx] = rng.uniform(150, 400, size=anomaly_idx.size)
+    if "category" in anomaly_types:
+        category_codes[anomaly_idx] = len(CATEGORIES)
+    if "location" in anomaly_types:
+        location_codes[anomaly_idx] = len(LOCATIONS)
+    if "velocity" in anomaly_types and anomaly_idx.size:
+        num_bursts = max(1, anomaly_idx.size // VELOCITY_BURST_SIZE)
+        burst = rng.integers(0, num_bursts, size=anomaly_idx.size)
+        burst_span = min(VELOCITY_BURST_SPAN.value, end_ns - start_ns)
+        burst_starts = rng.integers(start_ns, end_ns - burst_span + 1, size=num_bursts)
+        customer_ids[anomaly_idx] = rng.integers(1, num_customers + 1, size=num_bursts)[
+            burst
+        ]
+        timestamps[anomaly_idx] = burst_starts[burst] + rng.integers(
+            0, burst_span, size=anomaly_idx.size
+        )
+
+    if time_ordered:
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, amount, is_anomaly = (
+            timestamps[order],
+            amount[order],
+            is_anomaly[order],
+        )
+        category_codes, location_codes = category_codes[order], location_codes[order]
+        customer_ids = customer_ids[order]
+
+    locations = LOCATIONS + [ANOMALY_LOCATION]
+    cities = [loc["city"] for loc in locations]
+    lats = np.array([loc["lat"] for loc in locations])
+    lons = np.array([loc["lon"] for loc in locations])
+
+    return pd.DataFrame(
+        {
+            "Transaction ID": np.arange(start_id, start_id + n),
+            "Customer ID": customer_ids,
+            "Timestamp": timestamps.astype("datetime64[ns]"),
+            "Amount": amount,
+            "Category": pd.Categorical.from_codes(
+                category_codes, CATEGORIES + [ANOMALY_CATEGORY]
+            ),
+            "Location": pd.Categorical.from_codes(location_codes, cities),
+            "Latitude": lats[location_codes],
+            "Longitude": lons[location_codes],
+            "Is Anomaly": is_anomaly,
+        }
+    )
+
+
+def _transaction_block(
+    seed_seq: np.random.SeedSequence,
+    block_index: int,
+    anomaly_rate: float,
+    anomaly_types: Iterable[str],
+    num_rows: int,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+) -> pd.DataFrame:
+    """Generates one time-ordered block of a transaction stream over ``[start, end)``."""
+    block_seq = np.random.SeedSequence(
+        seed_seq.entropy, spawn_key=seed_seq.spawn_key + (block_index,)
+    )
+    return generate_transactions(
+        num_rows,
+        anomaly_rate,
+        anomaly_types=anomaly_types,
+        rng=np.random.default_rng(block_seq),
+        start=start,
+        end=end,
+        start_id=block_index * STREAM_BLOCK_SIZE + 1,
+        time_ordered=True,
+    )
+
+
+def iter_transaction_chunks(
+    total_transactions: int,
+    end: pd.Timestamp,
+    chunk_size: int = 100_000,
+    anomaly_rate: float = 0.05,
+    anomaly_types: Iterable[str] = ("amount",),
+    seed: Union[None, int, np.random.SeedSequence] = None,
+) -> Iterator[pd.DataFrame]:
+    """Yields a simulated transaction stream as DataFrames of ``chunk_size`` rows.
+
+    Rows are drawn in blocks of ``STREAM_BLOCK_SIZE``, each seeded from
+    ``seed`` and its block index, and chunks are sliced out of those blocks.
+    The concatenated stream is therefore identical for any ``chunk_size``,
+    and at most two blocks are held in memory at a time. Each block covers
+    the slice of the 30 days up to ``end`` proportional to its rows, so the
+    stream arrives in timestamp order, as stateful detectors expect, and
+    never runs past ``end``. ``end`` is required so seeded streams are
+    reproducible.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    seed_seq = (
+        seed
+        if isinstance(seed, np.random.SeedSequence)
+        else np.random.SeedSequence(seed)
+    )
+    total = int(total_transactions)
+    end = pd.Timestamp(end)
+    start = end - pd.Timedelta(days=30)
+    anomaly_types = tuple(anomaly_types)
+
+    def row_time(row: int) -> pd.Timestamp:
+        return start + (end - start) * row / max(1, total)
+
+    cached_index, cached_block = -1, None
+    for chunk_start in range(0, total, chunk_size):
+        chunk_end = min(chunk_start + chunk_size, total)
+        pieces = []
+        position = chunk_start
+        while position < chunk_end:
+            block_index = position // STREAM_BLOCK_SIZE
+            if block_index != cached_index:
+                block_start = block_index * STREAM_BLOCK_SIZE
+                block_stop = min(block_start + STREAM_BLOCK_SIZE, total)
+                cached_index = block_index
+                cached_block = _transaction_block(
+                    seed_seq,
+                    block_index,
+                    anomaly_rate,
+                    anomaly_types,
+                    block_stop - block_start,
+                    row_time(block_start),
+                    row_time(block_stop),
+                )
+            stop = min(chunk_end, block_stop)
+            pieces.append(
+                cached_block.iloc[position - block_start : stop - block_start]
+            )
+            position = stop
+        chunk = pieces[0] if len(pieces) == 1 else pd.concat(pieces)
+        yield chunk.reset_index(drop=True)
+
+
+class SlidingWindowVelocity:
+    """Per-entity sliding-window transaction counts and amount sums.
+
+    Each entity keeps one deque of ``(timestamp, amount)`` pairs per window
+    together with a running count and sum. An event is appended once and
+    evicted once per window, so updates cost O(1) amortized and no batch
+    ever needs a re-groupby. Events should arrive in non-decreasing
+    timestamp order per entity; state carries over between batches.
+    """
+
+    def __init__(self, windows: Optional[Dict[str, pd.Timedelta]] = None):
+        windows = VELOCITY_WINDOWS if windows is None else windows
+        self.window_names = list(windows)
+        self._spans = [pd.Timedelta(span).value for span in windows.values()]
+        self._state: Dict[Hashable, List[list]] = {}
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def update(
+        self, entity: Hashable, timestamp_ns: int, amount: float
+    ) -> Tuple[List[int], List[float]]:
+        """Adds one event and returns its per-window counts and amount sums."""
+        state = self._state.get(entity)
+        if state is None:
+            state = [[deque(), 0, 0.0] for _ in self._spans]
+            self._state[entity] = state
+        counts, sums = [], []
+        for window, span in zip(state, self._spans):
+            events = window[0]
+            events.append((timestamp_ns, amount))
+            window[1] += 1
+            window[2] += amount
+            cutoff = timestamp_ns - span
+            while events[0][0] <= cutoff:
+                window[2] -= events.popleft()[1]
+                window[1] -= 1
+            counts.append(window[1])
+            sums.append(window[2])
+        return counts, sums
+
+    def update_batch(
+        self, entities: Sequence, timestamps: Sequence, amounts: Sequence
+    ) -> pd.DataFrame:
+        """Adds a batch of events in timestamp order and returns their features.
+
+        The result is aligned with the input order and has a
+        ``Txn Count <window>`` and ``Amount Sum <window>`` column per window.
+        """
+        timestamps_ns = np.asarray(timestamps).astype("datetime64[ns]").view(np.int64)
+        order = np.argsort(timestamps_ns, kind="stable")
+        entity_list = np.asarray(entities)[order].tolist()
+        time_list = timestamps_ns[order].tolist()
+        amount_list = np.asarray(amounts, dtype=float)[order].tolist()
+
+        n, k = len(order), len(self._spans)
+        counts = np.empty((n, k), dtype=np.int64)
+        sums = np.empty((n, k))
+        update = self.update
+        for row, (entity, timestamp_ns, amount) in enumerate(
+            zip(entity_list, time_list, amount_list)
+        ):
+            counts[row], sums[row] = update(entity, timestamp_ns, amount)
+
+        features = {}
+        for j, name in enumerate(self.window_names):
+            features[f"Txn Count {name}"] = np.empty(n, dtype=np.int64)
+            features[f"Txn Count {name}"][order] = counts[:, j]
+            features[f"Amount Sum {name}"] = np.empty(n)
+            features[f"Amount Sum {name}"][order] = sums[:, j]
+        return pd.DataFrame(features)
@@ -0,0 +1,167 @@
+# utils/geo_utils.py
+from typing import Iterable, Optional
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import HeatMap
+
+_BASE32 = np.array(list("0123456789bcdefghjkmnpqrstuvwxyz"))
+
+
+def geohash_codes(lat: np.ndarray, lon: np.ndarray, precision: int = 5) -> np.ndarray:
+    """Returns integer geohash cell codes (``5 * precision`` interleaved bits)."""
+    if not 1 <= precision <= 12:
+        raise ValueError("precision must be between 1 and 12")
+    bits = 5 * precision
+    lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+    lat_cells = _quantize(np.asarray(lat, dtype=float), -90.0, 90.0, lat_bits)
+    lon_cells = _quantize(np.asarray(lon, dtype=float), -180.0, 180.0, lon_bits)
+    codes = np.zeros(lat_cells.shape, dtype=np.int64)
+    # Geohash interleaves longitude and latitude bits, longitude first
+    for i in range(bits):
+        if i % 2 == 0:
+            bit = (lon_cells >> (lon_bits - 1 - i // 2)) & 1
+        else:
+            bit = (lat_cells >> (lat_bits - 1 - i // 2)) & 1
+        codes = (codes << 1) | bit
+    return codes
+
+
+def geohash_strings(codes: np.ndarray, precision: int = 5) -> np.ndarray:
+    """Converts integer geohash codes to their base-32 string form."""
+    codes = np.asarray(codes, dtype=np.int64)
+    chars = [
+        _BASE32[(codes >> (5 * (precision - 1 - i))) & 31] for i in range(precision)
+    ]
+    return np.array(["".join(c) for c in zip(*chars)], dtype=str)
+
+
+def _quantize(values: np.ndarray, low: float, high: float, bits: int) -> np.ndarray:
+    cells = np.floor((values - low) / (high - low) * (1 << bits)).astype(np.int64)
+    return np.clip(cells, 0, (1 << bits) - 1)
+
+
+def aggregate_by_location(
+    df: pd.DataFrame,
+    precision: int = 5,
+    lat_col: str = "Latitude",
+    lon_col: str = "Longitude",
+    anomaly_col: str = "Is Anomaly",
+) -> pd.DataFrame:
+    """Bins rows into geohash cells with counts, anomaly counts and mean position.
+
+    The result has one row per occupied cell, so its size depends on how
+    spread out the data is, not on how many rows were binned. Results for
+    separate chunks can be combined with ``merge_location_bins``.
+    """
+    lat = df[lat_col].to_numpy(dtype=float)
+    lon = df[lon_col].to_numpy(dtype=float)
+    codes = geohash_codes(lat, lon, precision)
+    cells, inverse = np.unique(codes, return_inverse=True)
+    counts = np.bincount(inverse, minlength=cells.size)
+    anomalies = np.bincount(
+        inverse, weights=df[anomaly_col].to_numpy(dtype=float), minlength=cells.size
+    )
+    bins = pd.DataFrame(
+        {
+            "Geohash": geohash_strings(cells, precision),
+            "Transactions": counts,
+            "Anomalies": anomalies.astype(np.int64),
+            "Latitude Sum": np.bincount(inverse, weights=lat, minlength=cells.size),
+            "Longitude Sum": np.bincount(inverse, weights=lon, minlength=cells.size),
+        }
+    )
+    return _finish_bins(bins)
+
+
+def merge_location_bins(bins: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Combines per-chunk results of ``aggregate_by_location`` into one table."""
+    frames = list(bins)
+    if not frames:
+        return _finish_bins(
+            pd.DataFrame(
+                columns=[
+                    "Geohash",
+                    "Transactions",
+                    "Anomalies",
+                    "Latitude Sum",
+                    "Longitude Sum",
+                ]
+            )
+        )
+    combined = (
+        pd.concat(frames)
+        .groupby("Geohash", as_index=False)[
+            ["Transactions", "Anomalies", "Latitude Sum", "Longitude Sum"]
+        ]
+        .sum()
+    )
+    return _finish_bins(combined)
+
+
+def _finish_bins(bins: pd.DataFrame) -> pd.DataFrame:
+    counts = bins["Transactions"].to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        bins["Latitude"] = bins["Latitude Sum"] / counts
+        bins["Longitude"] = bins["Longitude Sum"] / counts
+        bins["Anomaly Ratio"] = bins["Anomalies"] / counts
+    return bins.sort_values("Transactions", ascending=False, ignore_index=True)
+
+
+def build_cluster_map(
+    bins: pd.DataFrame,
+    max_bins: Optional[int] = 500,
+    heatmap: bool = True,
+    zoom_start: int = 2,
+) -> folium.Map:
+    """Draws geohash bins as sized, anomaly-coloured circles plus a heatmap layer.
+
+    At most ``max_bins`` of the busiest cells are drawn, so the HTML payload
+    stays constant however many transactions were aggregated.
+    """
+    if max_bins is not None:
+        bins = bins.head(max_bins)
+    m = folium.Map(location=[0, 0], zoom_start=zoom_start)  # World map centered
+    clusters = folium.FeatureGroup(name="Transaction Clusters")
+    if len(bins):
+        counts = bins["Transactions"].to_numpy()
+        radii = 4 + 16 * np.sqrt(counts / counts.max())
+        for cell, lat, lon, count, anomalies, ratio, radius in zip(
+            bins["Geohash"],
+            bins["Latitude"],
+            bins["Longitude"],
+            counts,
+            bins["Anomalies"],
+            bins["Anomaly Ratio"],
+            radii,
+        ):
+            folium.CircleMarker(
+                [lat, lon],
+                radius=float(radius),
+                color=_ratio_color(ratio),
+                fill=True,
+                fill_opacity=0.6,
+                popup=(
+                    f"Cell: {cell}, Transactions: {count}, "
+                    f"Anomalies: {anomalies} ({ratio:.1%})"
+                ),
+            ).add_to(clusters)
+    clusters.add_to(m)
+    if heatmap and len(bins):
+        HeatMap(
+            bins[["Latitude", "Longitude", "Transactions"]].to_numpy().tolist(),
+            name="Transaction Density",
+            show=False,
+        ).add_to(m)
+    folium.LayerControl().add_to(m)
+    return m
+
+
+def _ratio_color(ratio: float) -> str:
+    """Maps an anomaly ratio to green (none) through orange to red (half or more)."""
+    if ratio >= 0.5:
+        return "red"
+    if ratio > 0.05:
+        return "orange"
+    return "green"
@@ -0,0 +1,152 @@
+# utils/io_utils.py
+import io
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow.csv as pa_csv
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+CSV_ENGINES = ("auto", "pandas", "pyarrow")
+CHUNK_ROWS = 250_000
+SAMPLE_ROWS = 10_000
+# String columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_SHARE = 0.5
+
+
+def _rewind(source) -> None:
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def infer_categories(
+    sample: pd.DataFrame, max_share: float = CATEGORY_MAX_SHARE
+) -> List[str]:
+    """String columns of a sample whose distinct values are few enough to be categorical."""
+    strings = sample.select_dtypes(include=["object", "string"])
+    return [
+        col
+        for col in strings.columns
+        if strings[col].nunique() <= max_share * max(strings[col].count(), 1)
+    ]
+
+
+def downcast(df: pd.DataFrame) -> pd.DataFrame:
+    """Stores integer columns in the smallest integer type that holds them.
+
+    Floats are left at 64 bits so statistics computed from them keep full
+    precision.
+    """
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+
+def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenates chunks, keeping categoricals whose chunks saw different values."""
+    if not frames:
+        return pd.DataFrame()
+    for col in frames[0].select_dtypes(include="category").columns:
+        categories = pd.api.types.union_categoricals(
+            [frame[col] for frame in frames]
+        ).categories
+        for frame in frames:
+            frame[col] = frame[col].cat.set_categories(categories)
+    return downcast(pd.concat(frames))
+
+
+def iter_csv(
+    source,
+    usecols: Optional[Sequence[str]] = None,
+    chunksize: int = CHUNK_ROWS,
+    sample_rows: int = SAMPLE_ROWS,
+    categories: bool = True,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """Parses a CSV (path or file-like) in compact chunks of ``chunksize`` rows.
+
+    The first ``sample_rows`` rows decide which string columns are parsed
+    straight into categoricals; integer columns are downcast per chunk.
+    Only ``usecols`` are parsed. Extra keyword arguments go to
+    ``pd.read_csv``.
+    """
+    dtype: Dict[str, str] = {}
+    if categories:
+        sample = pd.read_csv(source, usecols=usecols, nrows=sample_rows, **kwargs)
+        _rewind(source)
+        dtype = {col: "category" for col in infer_categories(sample)}
+    for chunk in pd.read_csv(
+        source, usecols=usecols, dtype=dtype or None, chunksize=chunksize, **kwargs
+    ):
+        yield downcast(chunk)
+
+
+def _read_csv_pyarrow(
+    source, usecols: Optional[Sequence[str]], categories: bool
+) -> pd.DataFrame:
+    """Multithreaded Arrow parse; dictionary-encoded strings become categoricals."""
+    if isinstance(source, io.StringIO):
+        source = io.BytesIO(source.getvalue().encode())
+    table = pa_csv.read_csv(
+        source,
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(usecols) if usecols is not None else None,
+            auto_dict_encode=categories,
+            strings_can_be_null=True,  # Blank fields are missing, as in pandas
+        ),
+    )
+    df = table.to_pandas()
+    if categories:
+        # Arrow encodes every string column; keep only the low-cardinality ones
+        for col in df.select_dtypes(include="category").columns:
+            if df[col].cat.categories.size > CATEGORY_MAX_SHARE * df[col].count():
+                df[col] = df[col].astype(df[col].cat.categories.dtype)
+    return downcast(df)
+
+
+def read_csv(
+    source,
+    usecols: Optional[Sequence[str]] = None,
+    engine: str = "auto",
+    chunksize: int = CHUNK_ROWS,
+    categories: bool = True,
+    **kwargs,
+) -> pd.DataFrame:
+    """Loads a CSV into a memory-compact DataFrame.
+
+    With the ``pandas`` engine the file is parsed in chunks (see
+    ``iter_csv``), so parser buffers stay bounded; ``pyarrow`` parses with
+    all cores in one go and is used by ``auto`` when installed and no
+    pandas-only keyword arguments are given. Either way only ``usecols``
+    are read, low-cardinality strings become categoricals and integers are
+    downcast, which typically shrinks wide string-heavy data several times.
+    Arrow also parses ISO dates and timestamps into datetime columns.
+    """
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"engine must be one of {CSV_ENGINES}")
+    if engine == "auto":
+        engine = "pyarrow" if PYARROW_AVAILABLE and not kwargs else "pandas"
+    if engine == "pyarrow":
+        if not PYARROW_AVAILABLE:
+            raise ImportError("The pyarrow engine needs the pyarrow package")
+        return _read_csv_pyarrow(source, usecols, categories)
+    return _concat(
+        list(
+            iter_csv(
+                source,
+                usecols=usecols,
+                chunksize=chunksize,
+                categories=categories,
+                **kwargs,
+            )
+        )
+    )
+
+
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    """In-memory size of a DataFrame, counting string contents."""
+    return float(df.memory_usage(deep=True).sum() / 2**20)
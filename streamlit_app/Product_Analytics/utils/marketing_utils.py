@@ -0,0 +1,62 @@
+# utils/marketing_utils.py
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+WEBSITE_CHANNELS = ["Organic", "Paid Ads", "Social", "Email"]
+WEBSITE_DEVICES = ["Desktop", "Mobile", "Tablet"]
+WEBSITE_COUNTRIES = ["USA", "Canada", "UK"]
+
+
+def generate_website_traffic(
+    days: int = 90,
+    channels: Sequence[str] = WEBSITE_CHANNELS,
+    devices: Sequence[str] = WEBSITE_DEVICES,
+    countries: Sequence[str] = WEBSITE_COUNTRIES,
+    rng: Optional[np.random.Generator] = None,
+    end: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Generates daily website metrics for every date/channel/device/country cell.
+
+    The cartesian product is laid out as integer codes and every metric is
+    drawn for all cells at once, so the cost is a few NumPy calls however
+    many dimensions are requested. Users grow by two per day on top of
+    ``100 + N(20, 30)``; sessions are 80-95% of users, page views 2-4 per
+    session, bounce rate ``N(60%, 10%)`` clipped to 20-100%, session
+    duration exponential with a 3-minute mean (at least 30 s) and
+    conversions 1-3% of users.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    dates = pd.date_range(
+        end=pd.Timestamp("today") if end is None else end, periods=days
+    )
+    shape = (days, len(channels), len(devices), len(countries))
+    date_codes, channel_codes, device_codes, country_codes = np.unravel_index(
+        np.arange(int(np.prod(shape))), shape
+    )
+    n = date_codes.size
+
+    growth = (date_codes + 1) * 2  # Users increase over time
+    users = np.maximum(0, np.trunc(100 + rng.normal(20, 30, size=n) + growth))
+    sessions = np.floor(users * rng.uniform(0.8, 0.95, size=n))
+    page_views = np.floor(sessions * rng.uniform(2, 4, size=n))
+    bounce_rate = np.clip(np.trunc(rng.normal(60, 10, size=n)), 20, 100) / 100
+    session_duration = np.maximum(30, np.floor(rng.exponential(180, size=n)))
+    conversions = np.floor(users * rng.uniform(0.01, 0.03, size=n))
+
+    return pd.DataFrame(
+        {
+            "Date": dates.values[date_codes],
+            "Channel": pd.Categorical.from_codes(channel_codes, list(channels)),
+            "Device": pd.Categorical.from_codes(device_codes, list(devices)),
+            "Country": pd.Categorical.from_codes(country_codes, list(countries)),
+            "Users": users.astype(np.int32),
+            "Sessions": sessions.astype(np.int32),
+            "Page Views": page_views.astype(np.int32),
+            "Bounce Rate": bounce_rate,
+            "Session Duration (Seconds)": session_duration.astype(np.int32),
+            "Conversions": conversions.astype(np.int32),
+        }
+    )
@@ -0,0 +1,349 @@
+# utils/power_utils.py
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.interpolate import RegularGridInterpolator
+
+POWER_METRICS = ("binary", "continuous", "heavy-tailed")
+MAX_BATCH_VALUES = 4_000_000  # Simulated users held in memory per batch
+
+SAMPLE_SIZE_METRICS = ("proportion", "mean")
+# Default lookup table axes: baseline, relative MDE, alpha and power
+TABLE_BASELINES = {
+    "proportion": np.geomspace(0.001, 0.5, 40),
+    "mean": np.geomspace(0.05, 100, 40),  # Baseline / std for mean metrics
+}
+TABLE_MDES = np.geomspace(0.01, 0.5, 40)
+TABLE_ALPHAS = np.array([0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.2])
+TABLE_POWERS = np.array([0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 0.975, 0.99])
+
+
+@dataclass
+class PowerResult:
+    """Outcome of a Monte Carlo power simulation.
+
+    ``p_values``/``effects`` come from experiments with the true effect and
+    ``null_p_values``/``null_effects`` from A/A experiments without one.
+    Effects are observed treatment-minus-control differences in means.
+    """
+
+    p_values: np.ndarray
+    effects: np.ndarray
+    null_p_values: np.ndarray
+    null_effects: np.ndarray
+    alpha: float
+
+    @property
+    def n_trials(self) -> int:
+        return len(self.p_values)
+
+    @property
+    def power(self) -> float:
+        """Share of experiments with a true effect that reached significance."""
+        return float(np.mean(self.p_values < self.alpha))
+
+    @property
+    def type_i_error(self) -> float:
+        """Share of A/A experiments that were (falsely) significant."""
+        return float(np.mean(self.null_p_values < self.alpha))
+
+    def power_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """Normal-approximation confidence interval of the simulated power."""
+        z = stats.norm.ppf(0.5 + confidence / 2)
+        half_width = z * np.sqrt(self.power * (1 - self.power) / self.n_trials)
+        return max(0.0, self.power - half_width), min(1.0, self.power + half_width)
+
+    def summary(self) -> Dict[str, float]:
+        low, high = self.power_interval()
+        significant = self.effects[self.p_values < self.alpha]
+        return {
+            "Trials": self.n_trials,
+            "Empirical Power": self.power,
+            "Power 95% CI Low": low,
+            "Power 95% CI High": high,
+            "Type I Error": self.type_i_error,
+            "Mean Observed Effect": float(np.mean(self.effects)),
+            # Significant results overstate the effect when power is low
+            "Mean Significant Effect": (
+                float(np.mean(significant)) if significant.size else float("nan")
+            ),
+        }
+
+
+def _two_proportion_test(
+    conversions_a: np.ndarray, conversions_b: np.ndarray, n_a: int, n_b: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized pooled two-proportion z-test; returns (p-values, differences)."""
+    rate_a, rate_b = conversions_a / n_a, conversions_b / n_b
+    pooled = (conversions_a + conversions_b) / (n_a + n_b)
+    se = np.sqrt(pooled * (1 - pooled) * (1 / n_a + 1 / n_b))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.where(se > 0, (rate_b - rate_a) / se, 0.0)
+    return 2 * stats.norm.sf(np.abs(z)), rate_b - rate_a
+
+
+def _welch_test(
+    mean_a: np.ndarray,
+    var_a: np.ndarray,
+    n_a: int,
+    mean_b: np.ndarray,
+    var_b: np.ndarray,
+    n_b: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized Welch t-test on per-trial means and variances."""
+    se_a, se_b = var_a / n_a, var_b / n_b
+    se = np.sqrt(se_a + se_b)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.where(se > 0, (mean_b - mean_a) / se, 0.0)
+        dof = (se_a + se_b) ** 2 / (se_a**2 / (n_a - 1) + se_b**2 / (n_b - 1))
+    return 2 * stats.t.sf(np.abs(t), np.nan_to_num(dof, nan=1.0)), mean_b - mean_a
+
+
+def _lognormal_params(mean: float, sigma: float) -> Tuple[float, float]:
+    """Returns the log-scale ``mu`` of a lognormal with the given mean and shape."""
+    return np.log(mean) - sigma**2 / 2, sigma
+
+
+def _simulate_arm(
+    metric: str,
+    mean: float,
+    n: int,
+    n_trials: int,
+    std: float,
+    sigma: float,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns per-trial sample means and variances of one experiment arm."""
+    if metric == "continuous":
+        # Normal data: draw the sufficient statistics directly
+        means = rng.normal(mean, std / np.sqrt(n), size=n_trials)
+        variances = std**2 * rng.chisquare(n - 1, size=n_trials) / (n - 1)
+        return means, variances
+    # Heavy-tailed revenue has no closed form; draw trials x users in batches
+    mu, sigma = _lognormal_params(mean, sigma)
+    means, variances = np.empty(n_trials), np.empty(n_trials)
+    batch = max(1, MAX_BATCH_VALUES // n)
+    for start in range(0, n_trials, batch):
+        stop = min(start + batch, n_trials)
+        values = rng.lognormal(mu, sigma, size=(stop - start, n))
+        means[start:stop] = values.mean(axis=1)
+        variances[start:stop] = values.var(axis=1, ddof=1)
+    return means, variances
+
+
+def simulate_power(
+    metric: str,
+    n_per_variant: int,
+    baseline: float,
+    effect: float,
+    n_trials: int = 10_000,
+    alpha: float = 0.05,
+    std: float = 20.0,
+    sigma: float = 1.0,
+    rng: Optional[np.random.Generator] = None,
+) -> PowerResult:
+    """Simulates ``n_trials`` A/B and A/A experiments at once and tests each.
+
+    ``baseline`` is the control conversion rate (``binary``) or mean
+    (``continuous``, normal with ``std``; ``heavy-tailed``, lognormal with
+    log-scale shape ``sigma``) and the treatment adds ``effect`` to it.
+    Binary experiments draw conversion counts from the binomial directly and
+    use a two-proportion z-test; the others use Welch's t-test.
+    """
+    if metric not in POWER_METRICS:
+        raise ValueError(f"metric must be one of {POWER_METRICS}")
+    if n_per_variant < 2:
+        raise ValueError("n_per_variant must be at least 2")
+    if rng is None:
+        rng = np.random.default_rng()
+    n = int(n_per_variant)
+    treatment = baseline + effect
+
+    if metric == "binary":
+        control_a = rng.binomial(n, baseline, size=n_trials)
+        control_b = rng.binomial(n, baseline, size=n_trials)
+        treated = rng.binomial(n, treatment, size=n_trials)
+        p_values, effects = _two_proportion_test(control_a, treated, n, n)
+        null_p_values, null_effects = _two_proportion_test(control_a, control_b, n, n)
+    else:
+
+        def draw(mean: float) -> Tuple[np.ndarray, np.ndarray]:
+            return _simulate_arm(metric, mean, n, n_trials, std, sigma, rng)
+
+        mean_a, var_a = draw(baseline)
+        mean_null, var_null = draw(baseline)
+        mean_b, var_b = draw(treatment)
+        p_values, effects = _welch_test(mean_a, var_a, n, mean_b, var_b, n)
+        null_p_values, null_effects = _welch_test(
+            mean_a, var_a, n, mean_null, var_null, n
+        )
+    return PowerResult(p_values, effects, null_p_values, null_effects, alpha)
+
+
+def sample_size_from_effect(
+    effect_size, alpha=0.05, power=0.8, metric: str = "mean"
+) -> np.ndarray:
+    """Users per variant for a two-sided, two-sample test of a standardized effect.
+
+    ``effect_size`` is Cohen's d for means or Cohen's h for proportions and
+    every argument broadcasts, so whole grids are solved in one expression.
+    Proportions use the normal approximation; means add Guenther's
+    ``z**2 / 4`` correction, which reproduces the t-test solution to
+    within one user.
+    """
+    z_alpha = stats.norm.ppf(1 - np.asarray(alpha, dtype=float) / 2)
+    z_power = stats.norm.ppf(np.asarray(power, dtype=float))
+    with np.errstate(divide="ignore"):
+        n = 2 * ((z_alpha + z_power) / np.abs(effect_size)) ** 2
+    if metric == "mean":
+        n = n + z_alpha**2 / 4
+    return np.ceil(n)
+
+
+def standardized_effect(
+    metric: str, baseline, mde, std: Optional[float] = None, relative: bool = True
+) -> np.ndarray:
+    """Cohen's h (proportions) or d (means) of moving ``baseline`` by ``mde``."""
+    if metric not in SAMPLE_SIZE_METRICS:
+        raise ValueError(f"metric must be one of {SAMPLE_SIZE_METRICS}")
+    baseline = np.asarray(baseline, dtype=float)
+    change = baseline * mde if relative else np.asarray(mde, dtype=float)
+    if metric == "proportion":
+        treatment = np.clip(baseline + change, 0, 1)
+        return 2 * np.arcsin(np.sqrt(treatment)) - 2 * np.arcsin(np.sqrt(baseline))
+    if std is None:
+        raise ValueError("std is required for mean metrics")
+    return change / std
+
+
+def sample_size_grid(
+    metric: str,
+    baselines: Sequence[float],
+    mdes: Sequence[float],
+    alphas: Sequence[float] = (0.05,),
+    powers: Sequence[float] = (0.8,),
+    std: Optional[float] = None,
+    relative: bool = True,
+) -> np.ndarray:
+    """Solves users per variant on the full baseline x MDE x alpha x power grid."""
+    baselines, mdes, alphas, powers = np.ix_(
+        *(np.asarray(axis, dtype=float) for axis in (baselines, mdes, alphas, powers))
+    )
+    effect = standardized_effect(metric, baselines, mdes, std, relative)
+    return sample_size_from_effect(effect, alphas, powers, metric)
+
+
+@lru_cache(maxsize=4096)
+def required_sample_size(
+    metric: str,
+    baseline: float,
+    mde: float,
+    alpha: float = 0.05,
+    power: float = 0.8,
+    std: Optional[float] = None,
+    relative: bool = True,
+) -> int:
+    """Users per variant for one design, memoized for repeated widget changes."""
+    effect = standardized_effect(metric, baseline, mde, std, relative)
+    n = sample_size_from_effect(effect, alpha, power, metric)
+    return int(n) if np.isfinite(n) else -1
+
+
+class SampleSizeTable:
+    """Precomputed sample sizes over baseline x relative MDE x alpha x power.
+
+    ``lookup`` interpolates between grid points (in log sample size over
+    log baseline, log MDE and the normal quantiles of alpha and power), so
+    any design inside the grid is answered without solving. Tables for
+    ``mean`` metrics are built for ``std = 1`` and rescaled on lookup.
+    Designs outside the grid fall back to the closed-form solution.
+    """
+
+    def __init__(
+        self,
+        metric: str,
+        baselines: Optional[Sequence[float]] = None,
+        mdes: Sequence[float] = TABLE_MDES,
+        alphas: Sequence[float] = TABLE_ALPHAS,
+        powers: Sequence[float] = TABLE_POWERS,
+        sizes: Optional[np.ndarray] = None,
+    ):
+        self.metric = metric
+        if baselines is None:
+            baselines = TABLE_BASELINES[metric]
+        self.axes = tuple(
+            np.asarray(axis, dtype=float) for axis in (baselines, mdes, alphas, powers)
+        )
+        if sizes is None:
+            std = 1.0 if metric == "mean" else None
+            sizes = sample_size_grid(metric, *self.axes, std=std)
+        self.sizes = np.asarray(sizes, dtype=float)
+        self._interpolator = RegularGridInterpolator(
+            self._grid_coordinates(*self.axes),
+            np.log(self.sizes),
+            bounds_error=False,
+        )
+
+    @staticmethod
+    def _grid_coordinates(baselines, mdes, alphas, powers) -> Tuple[np.ndarray, ...]:
+        return (
+            np.log(baselines),
+            np.log(mdes),
+            stats.norm.ppf(1 - np.asarray(alphas) / 2),
+            stats.norm.ppf(powers),
+        )
+
+    def lookup(
+        self, baseline, mde, alpha=0.05, power=0.8, std: Optional[float] = None
+    ) -> np.ndarray:
+        """Interpolated users per variant; arguments broadcast against each other."""
+        if self.metric == "mean":
+            if std is None:
+                raise ValueError("std is required for mean metrics")
+            # A relative MDE on a mean only enters through baseline / std
+            baseline = np.asarray(baseline, dtype=float) / std
+        baseline, mde, alpha, power = np.broadcast_arrays(
+            *(np.asarray(value, dtype=float) for value in (baseline, mde, alpha, power))
+        )
+        points = np.stack(
+            np.broadcast_arrays(*self._grid_coordinates(baseline, mde, alpha, power)),
+            axis=-1,
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sizes = np.ceil(np.exp(self._interpolator(points))).reshape(baseline.shape)
+        outside = np.isnan(sizes)
+        if outside.any():
+            std = 1.0 if self.metric == "mean" else None
+            effect = standardized_effect(self.metric, baseline, mde, std)
+            exact = sample_size_from_effect(effect, alpha, power, self.metric)
+            sizes = np.where(outside, exact, sizes)
+        return sizes
+
+    def to_frame(self, alpha: float = 0.05, power: float = 0.8) -> pd.DataFrame:
+        """Returns the baseline x MDE slice nearest to ``alpha`` and ``power``."""
+        i = int(np.abs(self.axes[2] - alpha).argmin())
+        j = int(np.abs(self.axes[3] - power).argmin())
+        return pd.DataFrame(
+            self.sizes[:, :, i, j],
+            index=pd.Index(self.axes[0], name="Baseline"),
+            columns=pd.Index(self.axes[1], name="MDE"),
+        )
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, *self.axes, sizes=self.sizes, metric=self.metric)
+
+    @classmethod
+    def load(cls, path: str) -> "SampleSizeTable":
+        with np.load(path) as data:
+            axes = [data[f"arr_{i}"] for i in range(4)]
+            return cls(str(data["metric"]), *axes, sizes=data["sizes"])
+
+
+@lru_cache(maxsize=None)
+def get_sample_size_table(metric: str) -> SampleSizeTable:
+    """Returns the default lookup table for ``metric``, built once per process."""
+    return SampleSizeTable(metric)
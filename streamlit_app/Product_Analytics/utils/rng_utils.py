@@ -0,0 +1,69 @@
+# utils/rng_utils.py
+import hashlib
+from typing import Hashable, List, Optional
+
+import numpy as np
+
+DEFAULT_SEED = 42
+
+
+def _spawn_index(part: Hashable) -> int:
+    """Maps a key part to a stable non-negative integer (same across processes)."""
+    if isinstance(part, (int, np.integer)) and part >= 0:
+        return int(part)
+    digest = hashlib.blake2b(repr(part).encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+class RNGService:
+    """Hands out independent, reproducible random generators.
+
+    Every stream is addressed by a key such as ``("data_utils", "normal")``
+    or ``("ab_test", job_id)``. The key is appended to the root
+    ``SeedSequence``'s spawn key, exactly as ``SeedSequence.spawn`` does for
+    numbered children, so each key gets a statistically independent stream
+    that does not depend on the order in which streams were requested.
+    Streams depend only on the seed and key, so every session sees the same
+    data for the same inputs. Generators are created fresh on every call and
+    never shared, so concurrent sessions and threads do not race on global
+    state.
+    """
+
+    def __init__(self, seed: Optional[int] = DEFAULT_SEED):
+        self.root = np.random.SeedSequence(seed)
+
+    def seed_sequence(self, *key: Hashable) -> np.random.SeedSequence:
+        return np.random.SeedSequence(
+            self.root.entropy,
+            spawn_key=self.root.spawn_key + tuple(_spawn_index(part) for part in key),
+        )
+
+    def generator(self, *key: Hashable) -> np.random.Generator:
+        """Returns a new generator at the start of the ``key`` stream."""
+        return np.random.default_rng(self.seed_sequence(*key))
+
+    def spawn(self, n: int, *key: Hashable) -> List[np.random.SeedSequence]:
+        """Seeds for ``n`` parallel workers of the ``key`` job.
+
+        Seed sequences are small and picklable, so they can be sent to
+        threads or processes, each building its own ``default_rng(seed)``.
+        """
+        return self.seed_sequence(*key).spawn(n)
+
+    def worker_generators(self, n: int, *key: Hashable) -> List[np.random.Generator]:
+        return [np.random.default_rng(seed) for seed in self.spawn(n, *key)]
+
+
+_services = {}
+
+
+def get_rng(*key: Hashable, seed: Optional[int] = DEFAULT_SEED) -> np.random.Generator:
+    """Returns a fresh, reproducible generator for the ``key`` stream of ``seed``.
+
+    ``seed=None`` draws fresh OS entropy for a non-reproducible stream.
+    """
+    if seed is None:
+        return RNGService(None).generator(*key)
+    if seed not in _services:
+        _services[seed] = RNGService(seed)
+    return _services[seed].generator(*key)
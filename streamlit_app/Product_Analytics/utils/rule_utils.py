@@ -0,0 +1,242 @@
+# utils/rule_utils.py
+import operator
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+_COMPARISONS: Dict[str, Callable] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+_NS_PER_HOUR = 3600 * 10**9
+
+
+@dataclass(frozen=True)
+class Condition:
+    """A single test on one column: a comparison, a set membership or an hour window."""
+
+    column: str
+    op: str
+    value: Any
+
+
+def threshold(column: str, op: str, value: float) -> Condition:
+    """Compares a numeric column against a constant, e.g. ``Amount > 300``."""
+    if op not in _COMPARISONS:
+        raise ValueError(
+            f"Unknown comparison {op!r}; expected one of {list(_COMPARISONS)}"
+        )
+    return Condition(column, op, value)
+
+
+def one_of(column: str, values: Iterable, negate: bool = False) -> Condition:
+    """Tests whether a column value belongs to a set (categories, locations, ...)."""
+    return Condition(column, "not in" if negate else "in", frozenset(values))
+
+
+def hour_between(column: str, start_hour: int, end_hour: int) -> Condition:
+    """Tests whether a timestamp falls in ``[start_hour, end_hour)``, wrapping past midnight."""
+    hours = np.arange(24)
+    if start_hour <= end_hour:
+        lut = (hours >= start_hour) & (hours < end_hour)
+    else:
+        lut = (hours >= start_hour) | (hours < end_hour)
+    return Condition(column, "hour in", tuple(bool(x) for x in lut))
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A named conjunction of conditions; list the most selective condition first."""
+
+    name: str
+    conditions: tuple
+
+
+@dataclass
+class RuleEvaluation:
+    """Per-rule flags, hit counts and timings from one evaluation pass."""
+
+    flags: Dict[str, np.ndarray]
+    any_flag: np.ndarray
+    timings: Dict[str, float]
+    hit_counts: Dict[str, int] = field(init=False)
+
+    def __post_init__(self):
+        self.hit_counts = {name: int(mask.sum()) for name, mask in self.flags.items()}
+
+    def to_frame(self, index: Optional[pd.Index] = None) -> pd.DataFrame:
+        """Returns one boolean ``<rule> Flag`` column per rule."""
+        return pd.DataFrame(
+            {f"{name} Flag": mask for name, mask in self.flags.items()}, index=index
+        )
+
+    def summary(self) -> pd.DataFrame:
+        """Returns hits, hit rate and evaluation time for every rule."""
+        total = len(self.any_flag)
+        return pd.DataFrame(
+            {
+                "Rule": list(self.flags),
+                "Hits": list(self.hit_counts.values()),
+                "Hit Rate (%)": [
+                    100 * hits / total if total else 0.0
+                    for hits in self.hit_counts.values()
+                ],
+                "Time (ms)": [1000 * self.timings[name] for name in self.flags],
+            }
+        )
+
+
+class _ColumnCache:
+    """Converts each referenced column to NumPy once per evaluation."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._arrays: Dict[tuple, np.ndarray] = {}
+        self._masks: Dict[Condition, np.ndarray] = {}
+
+    def full_mask(self, condition: Condition, evaluate: Callable) -> np.ndarray:
+        """Evaluates a condition over every row, sharing the result between rules."""
+        if condition not in self._masks:
+            self._masks[condition] = evaluate(self, slice(None))
+        return self._masks[condition]
+
+    def values(self, column: str) -> np.ndarray:
+        key = ("values", column)
+        if key not in self._arrays:
+            self._arrays[key] = self._df[column].to_numpy()
+        return self._arrays[key]
+
+    def hours(self, column: str) -> np.ndarray:
+        key = ("hours", column)
+        if key not in self._arrays:
+            ns = self._df[column].to_numpy().astype("datetime64[ns]").view(np.int64)
+            self._arrays[key] = (ns // _NS_PER_HOUR) % 24
+        return self._arrays[key]
+
+    def membership(self, column: str, values: frozenset) -> Callable:
+        """Returns a row-index -> bool function for a set test on ``column``."""
+        series = self._df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Look up codes in a per-category table instead of comparing strings
+            key = ("codes", column)
+            if key not in self._arrays:
+                self._arrays[key] = series.cat.codes.to_numpy()
+            codes = self._arrays[key]
+            lut = np.append(series.cat.categories.isin(list(values)), False)
+            return lambda idx: lut[codes[idx]]
+        column_values = self.values(column)
+        wanted = np.array(list(values), dtype=column_values.dtype)
+        return lambda idx: np.isin(column_values[idx], wanted)
+
+
+def _compile_condition(condition: Condition) -> Callable:
+    """Turns a condition into ``f(cache, idx) -> bool array`` over rows ``idx``."""
+    column, op, value = condition.column, condition.op, condition.value
+    if op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+        return lambda cache, idx: compare(cache.values(column)[idx], value)
+    if op in ("in", "not in"):
+        negate = op == "not in"
+
+        def evaluate_membership(cache, idx):
+            mask = cache.membership(column, value)(idx)
+            return ~mask if negate else mask
+
+        return evaluate_membership
+    if op == "hour in":
+        lut = np.array(value, dtype=bool)
+        return lambda cache, idx: lut[cache.hours(column)[idx]]
+    raise ValueError(f"Unknown operator {op!r} for column {column!r}")
+
+
+class CompiledRuleSet:
+    """A rule set compiled into vectorized NumPy mask functions."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rule_names = [rule.name for rule in rules]
+        self._first = [rule.conditions[0] for rule in rules]
+        self._compiled = [
+            [_compile_condition(condition) for condition in rule.conditions]
+            for rule in rules
+        ]
+
+    def evaluate(self, df: pd.DataFrame, short_circuit: bool = False) -> RuleEvaluation:
+        """Evaluates every rule over ``df`` in one pass.
+
+        Within a rule, each condition only sees the rows that passed the
+        previous ones, and identical leading conditions are computed once
+        for the whole rule set. With ``short_circuit=True`` rows already flagged by an
+        earlier rule are skipped too, so ``hit_counts`` report the first rule
+        that fired for each row rather than every rule that would have.
+        """
+        n = len(df)
+        cache = _ColumnCache(df)
+        any_flag = np.zeros(n, dtype=bool)
+        flags, timings = {}, {}
+        for name, first, conditions in zip(
+            self.rule_names, self._first, self._compiled
+        ):
+            started = time.perf_counter()
+            # The first condition of each rule reads whole columns without a
+            # gather and is shared by every rule that starts with it
+            passed = cache.full_mask(first, conditions[0])
+            if short_circuit:
+                passed = passed & ~any_flag
+            candidates = np.flatnonzero(passed)
+            for condition in conditions[1:]:
+                if candidates.size == 0:
+                    break
+                candidates = candidates[condition(cache, candidates)]
+            mask = np.zeros(n, dtype=bool)
+            mask[candidates] = True
+            any_flag |= mask
+            flags[name] = mask
+            timings[name] = time.perf_counter() - started
+        return RuleEvaluation(flags=flags, any_flag=any_flag, timings=timings)
+
+
+class RuleSet:
+    """Registry of named fraud rules that compiles into a ``CompiledRuleSet``."""
+
+    def __init__(self):
+        self._rules: Dict[str, Rule] = {}
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def add(self, name: str, *conditions: Condition) -> "RuleSet":
+        """Registers a rule that fires when all ``conditions`` hold."""
+        if not conditions:
+            raise ValueError(f"Rule {name!r} needs at least one condition")
+        self._rules[name] = Rule(name, tuple(conditions))
+        return self
+
+    @classmethod
+    def from_config(cls, config: List[Dict[str, Any]]) -> "RuleSet":
+        """Builds a rule set from ``[{"name": ..., "when": [{"column", "op", "value"}]}]``."""
+        rule_set = cls()
+        for rule in config:
+            conditions = []
+            for spec in rule["when"]:
+                op = spec["op"]
+                if op in ("in", "not in"):
+                    conditions.append(
+                        one_of(spec["column"], spec["value"], negate=op == "not in")
+                    )
+                elif op == "hour between":
+                    conditions.append(hour_between(spec["column"], *spec["value"]))
+                else:
+                    conditions.append(threshold(spec["column"], op, spec["value"]))
+            rule_set.add(rule["name"], *conditions)
+        return rule_set
+
+    def compile(self) -> CompiledRuleSet:
+        """Compiles the registered rules in registration order."""
+        return CompiledRuleSet(list(self._rules.values()))
@@ -0,0 +1,266 @@
+# utils/sequential_utils.py
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.optimize import brentq
+
+ALPHA_SPENDING: Dict[str, Callable] = {
+    # Lan-DeMets approximations of the classic group-sequential boundaries,
+    # as total two-sided alpha spent by information fraction t. O'Brien-Fleming
+    # spends 2 - 2 * Phi(z_{alpha/4} / sqrt(t)) on each side
+    "O'Brien-Fleming": lambda t, alpha: 4
+    - 4 * stats.norm.cdf(stats.norm.ppf(1 - alpha / 4) / np.sqrt(t)),
+    "Pocock": lambda t, alpha: alpha * np.log(1 + (np.e - 1) * t),
+}
+
+
+class RunningMoments:
+    """Counts, means and centered sums of squares for many streams at once.
+
+    ``add`` folds in a batch increment given as ``(n, sum, sum of squares)``
+    per stream with Chan et al.'s parallel update, so each update is O(1)
+    per stream and raw observations are never needed.
+    """
+
+    def __init__(self, size: int):
+        self.n = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+
+    def add(self, n, total, total_sq) -> "RunningMoments":
+        n = np.broadcast_to(np.asarray(n, dtype=float), self.n.shape)
+        total = np.broadcast_to(np.asarray(total, dtype=float), self.n.shape)
+        total_sq = np.broadcast_to(np.asarray(total_sq, dtype=float), self.n.shape)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            batch_mean = np.where(n > 0, total / n, 0.0)
+            combined = self.n + n
+            weight = np.where(combined > 0, n / combined, 0.0)
+        batch_m2 = np.maximum(total_sq - n * batch_mean**2, 0.0)
+        delta = batch_mean - self.mean
+        self.m2 = self.m2 + batch_m2 + delta**2 * self.n * weight
+        self.mean = self.mean + delta * weight
+        self.n = combined
+        return self
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance (``ddof=1``); zero until a stream has two observations."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.n > 1, self.m2 / (self.n - 1), 0.0)
+
+
+class GroupSequentialBoundary:
+    """Two-sided group-sequential boundaries from an alpha-spending function.
+
+    Each call to ``next_look`` spends ``alpha(t_k) - alpha(t_{k-1})`` at
+    information fraction ``t_k`` and returns the z boundary that spends
+    exactly that much given the earlier looks. The continuation density of
+    the score statistic is carried between looks on a grid, so adding a look
+    costs one grid convolution regardless of how many looks came before.
+    One boundary serves every experiment that shares the look schedule.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.05,
+        spending: str = "O'Brien-Fleming",
+        grid_size: int = 401,
+    ):
+        if spending not in ALPHA_SPENDING:
+            raise ValueError(f"spending must be one of {list(ALPHA_SPENDING)}")
+        self.alpha = alpha
+        self.spending = spending
+        self.grid_size = grid_size
+        self.information_fractions: List[float] = []
+        self.boundaries: List[float] = []
+        self.alpha_spent = 0.0
+        self._grid: Optional[np.ndarray] = None  # Score values S = Z * sqrt(t)
+        self._density: Optional[np.ndarray] = None  # Sub-density of continuing
+
+    def next_look(self, information_fraction: float) -> float:
+        """Registers the next interim look and returns its z boundary."""
+        t = float(np.clip(information_fraction, 0.0, 1.0))
+        previous = self.information_fractions[-1] if self.information_fractions else 0
+        if t <= previous:
+            raise ValueError("Information fractions must increase between looks")
+        target = ALPHA_SPENDING[self.spending](t, self.alpha) - self.alpha_spent
+        step = np.sqrt(t - previous)
+
+        if self._grid is None:
+            # First look: the score is N(0, t), so the boundary is direct
+            z = stats.norm.isf(target / 2) if target > 0 else np.inf
+            crossing = target if target > 0 else 0.0
+        else:
+            weights = self._density * self._weights()
+
+            def crossing_probability(bound: float) -> float:
+                upper = stats.norm.sf((bound - self._grid) / step)
+                lower = stats.norm.cdf((-bound - self._grid) / step)
+                return float(weights @ (upper + lower))
+
+            if target <= 0:
+                z, crossing = np.inf, 0.0
+            else:
+                bound = brentq(
+                    lambda b: crossing_probability(b) - target, 1e-9, 40 * np.sqrt(t)
+                )
+                z, crossing = bound / np.sqrt(t), target
+
+        # Propagate the continuation density to the new look
+        bound = z * np.sqrt(t) if np.isfinite(z) else 8 * np.sqrt(t)
+        grid = np.linspace(-bound, bound, self.grid_size)
+        if self._grid is None:
+            density = stats.norm.pdf(grid / np.sqrt(t)) / np.sqrt(t)
+        else:
+            kernel = stats.norm.pdf((grid[:, None] - self._grid[None, :]) / step) / step
+            density = kernel @ (self._density * self._weights())
+        self._grid, self._density = grid, density
+
+        self.information_fractions.append(t)
+        self.boundaries.append(float(z))
+        self.alpha_spent += crossing
+        return float(z)
+
+    def _weights(self) -> np.ndarray:
+        """Trapezoid quadrature weights of the current grid."""
+        spacing = self._grid[1] - self._grid[0]
+        weights = np.full(self._grid.size, spacing)
+        weights[[0, -1]] = spacing / 2
+        return weights
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "Information Fraction": self.information_fractions,
+                "Z Boundary": self.boundaries,
+                "Nominal p": 2 * stats.norm.sf(self.boundaries),
+            }
+        )
+
+
+class SequentialMonitor:
+    """Always-valid monitoring of many two-arm experiments from batch increments.
+
+    Every ``update`` takes per-experiment ``(n, sum, sum of squares)`` of
+    each arm since the last update (e.g. one day of data) and costs O(1) per
+    experiment. It maintains the mixture SPRT (mSPRT) with a normal mixing
+    distribution of scale ``tau`` on the treatment-minus-control difference:
+    an always-valid p-value and confidence sequence that stay correct however
+    often they are checked. With ``spending`` set, updates that pass an
+    ``information_fraction`` are also tested against shared group-sequential
+    boundaries.
+    """
+
+    def __init__(
+        self,
+        n_experiments: int,
+        tau: float,
+        alpha: float = 0.05,
+        spending: Optional[str] = None,
+    ):
+        if tau <= 0:
+            raise ValueError("tau must be positive")
+        self.tau = tau
+        self.alpha = alpha
+        self.control = RunningMoments(n_experiments)
+        self.treatment = RunningMoments(n_experiments)
+        self.p_value = np.ones(n_experiments)
+        self.lower = np.full(n_experiments, -np.inf)
+        self.upper = np.full(n_experiments, np.inf)
+        self.boundary = (
+            GroupSequentialBoundary(alpha, spending) if spending is not None else None
+        )
+        self.boundary_crossed = np.zeros(n_experiments, dtype=bool)
+        self.looks = 0
+
+    def update(
+        self,
+        n_control,
+        sum_control,
+        sum_sq_control,
+        n_treatment,
+        sum_treatment,
+        sum_sq_treatment,
+        information_fraction: Optional[float] = None,
+    ) -> "SequentialMonitor":
+        """Adds one batch of data for every experiment and refreshes the tests."""
+        self.control.add(n_control, sum_control, sum_sq_control)
+        self.treatment.add(n_treatment, sum_treatment, sum_sq_treatment)
+        self.looks += 1
+
+        effect, variance = self.effect, self._effect_variance()
+        ready = variance > 0
+        tau2 = self.tau**2
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            log_likelihood_ratio = 0.5 * np.log(variance / (variance + tau2)) + (
+                tau2 * effect**2 / (2 * variance * (variance + tau2))
+            )
+            p_value = np.minimum(1.0, np.exp(-log_likelihood_ratio))
+            half_width = np.sqrt(
+                variance
+                * (variance + tau2)
+                / tau2
+                * (np.log((variance + tau2) / variance) - 2 * np.log(self.alpha))
+            )
+        # Always-valid results only ever tighten: keep the running min / intersection
+        self.p_value = np.where(ready, np.minimum(self.p_value, p_value), self.p_value)
+        self.lower = np.where(
+            ready, np.maximum(self.lower, effect - half_width), self.lower
+        )
+        self.upper = np.where(
+            ready, np.minimum(self.upper, effect + half_width), self.upper
+        )
+
+        if self.boundary is not None and information_fraction is not None:
+            z_boundary = self.boundary.next_look(information_fraction)
+            self.boundary_crossed |= ready & (np.abs(self.z) >= z_boundary)
+        return self
+
+    @property
+    def effect(self) -> np.ndarray:
+        """Observed treatment-minus-control difference in means."""
+        return self.treatment.mean - self.control.mean
+
+    def _effect_variance(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(
+                (self.control.n > 1) & (self.treatment.n > 1),
+                self.control.variance / np.maximum(self.control.n, 1)
+                + self.treatment.variance / np.maximum(self.treatment.n, 1),
+                0.0,
+            )
+
+    @property
+    def z(self) -> np.ndarray:
+        """Fixed-horizon z statistic of the current data (not peeking-safe)."""
+        variance = self._effect_variance()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(variance > 0, self.effect / np.sqrt(variance), 0.0)
+
+    @property
+    def naive_p_value(self) -> np.ndarray:
+        """Fixed-horizon p-value; repeatedly checking it inflates false positives."""
+        return 2 * stats.norm.sf(np.abs(self.z))
+
+    @property
+    def rejected(self) -> np.ndarray:
+        """Experiments whose always-valid p-value is below ``alpha``."""
+        return self.p_value < self.alpha
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame(
+            {
+                "Control Users": self.control.n.astype(np.int64),
+                "Treatment Users": self.treatment.n.astype(np.int64),
+                "Effect": self.effect,
+                "Naive p": self.naive_p_value,
+                "Always-Valid p": self.p_value,
+                "CS Lower": self.lower,
+                "CS Upper": self.upper,
+            }
+        )
+        if self.boundary is not None:
+            frame["Boundary Crossed"] = self.boundary_crossed
+        return frame
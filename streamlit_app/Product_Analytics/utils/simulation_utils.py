@@ -0,0 +1,116 @@
+# utils/simulation_utils.py
+from typing import Callable, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+CLT_POPULATIONS = ["Uniform (Discrete)", "Exponential"]
+BLOCK_ELEMENTS = 2**22  # Cap on matrix entries drawn at once
+
+
+def roll_dice(
+    num_rolls: int, sides: int = 6, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """Rolls a fair die ``num_rolls`` times in one draw (faces ``1..sides``)."""
+    if rng is None:
+        rng = np.random.default_rng()
+    return rng.integers(1, sides + 1, size=num_rolls, dtype=np.int16)
+
+
+def running_mean(values: np.ndarray) -> np.ndarray:
+    """Mean of every prefix ``values[:i]`` from one cumulative sum (O(n))."""
+    values = np.asarray(values, dtype=float)
+    return np.cumsum(values) / np.arange(1, values.size + 1)
+
+
+def sample_means(
+    population: str,
+    num_samples: int,
+    sample_size: int,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Means of ``num_samples`` i.i.d. samples of ``sample_size`` from a population.
+
+    Samples are drawn as (samples x sample size) matrices, in row blocks of
+    at most ``BLOCK_ELEMENTS`` entries so memory stays bounded for millions
+    of samples. ``population`` is one of ``CLT_POPULATIONS``: a fair die or
+    an exponential with mean 1.
+    """
+    if population not in CLT_POPULATIONS:
+        raise ValueError(f"population must be one of {CLT_POPULATIONS}")
+    if rng is None:
+        rng = np.random.default_rng()
+    means = np.empty(num_samples)
+    rows = max(1, BLOCK_ELEMENTS // sample_size)
+    for start in range(0, num_samples, rows):
+        shape = (min(rows, num_samples - start), sample_size)
+        if population == "Uniform (Discrete)":
+            block = rng.integers(1, 7, size=shape, dtype=np.int16)
+        else:
+            block = rng.exponential(scale=1, size=shape)
+        means[start : start + shape[0]] = block.mean(axis=1)
+    return means
+
+
+def plot_indices(n: int, max_points: int = 2000) -> np.ndarray:
+    """Log-spaced indices for plotting a length-``n`` series with few points."""
+    return np.unique(np.geomspace(1, n, num=min(n, max_points)).astype(np.int64)) - 1
+
+
+def dice_sum_counts(
+    num_trials: int,
+    num_dice: int = 1,
+    sides: int = 6,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Rolls ``num_dice`` dice ``num_trials`` times and counts each total.
+
+    Rolls are drawn as (trials x dice) integer matrices in blocks of at most
+    ``BLOCK_ELEMENTS`` entries and tallied with ``np.bincount``, so memory
+    stays constant and Python overhead is one loop step per block. Entry
+    ``i`` of the result is the number of trials whose dice summed to ``i``.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    counts = np.zeros(num_dice * sides + 1, dtype=np.int64)
+    rows = max(1, BLOCK_ELEMENTS // num_dice)
+    for start in range(0, num_trials, rows):
+        rolls = rng.integers(
+            1, sides + 1, size=(min(rows, num_trials - start), num_dice), dtype=np.int16
+        )
+        counts += np.bincount(rolls.sum(axis=1), minlength=counts.size)
+    return counts
+
+
+def discrete_event_counts(
+    num_trials: int,
+    probabilities: Sequence[float],
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Counts how often each outcome occurs in ``num_trials`` i.i.d. draws.
+
+    The counts of i.i.d. draws from a discrete distribution are exactly
+    multinomial, so they are drawn in one call whose cost depends only on
+    the number of outcomes, not on ``num_trials``.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    p = np.asarray(probabilities, dtype=float)
+    return rng.multinomial(num_trials, p / p.sum())
+
+
+def empirical_probability(
+    counts: np.ndarray,
+    event: Union[Callable[[np.ndarray], np.ndarray], Iterable],
+    values: Optional[np.ndarray] = None,
+) -> float:
+    """Share of trials whose outcome is in ``event``, from outcome counts.
+
+    ``values`` are the outcomes the counts refer to (default: their
+    indices). ``event`` is a vectorized predicate over those values (e.g.
+    ``lambda x: x % 2 == 0``) or a collection of favorable outcomes.
+    """
+    counts = np.asarray(counts)
+    values = np.arange(counts.size) if values is None else np.asarray(values)
+    mask = event(values) if callable(event) else np.isin(values, list(event))
+    total = counts.sum()
+    return float(counts[mask].sum() / total) if total else 0.0
@@ -0,0 +1,395 @@
+# utils/sketch_utils.py
+import io
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _clean(values) -> np.ndarray:
+    """Flattens values, drops missing ones and unifies dtypes for hashing."""
+    values = np.asarray(values).ravel()
+    values = values[~pd.isna(values)]
+    if values.dtype.kind in "biuf":
+        return values.astype(float)  # 1 and 1.0 count as the same value
+    return values.astype(str)
+
+
+def _mix(hashes: np.ndarray, seed: int = 0) -> np.ndarray:
+    """SplitMix64 finalizer: derives independent-looking 64-bit hashes per seed."""
+    h = hashes ^ np.uint64(seed * 0x9E3779B97F4A7C15 % 2**64)
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def _hash(values: np.ndarray) -> np.ndarray:
+    """Stable 64-bit hashes (the same in every process and session)."""
+    return _mix(pd.util.hash_array(values))
+
+
+def _pack(kind: str, **arrays) -> bytes:
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, kind=np.array(kind), **arrays)
+    return buffer.getvalue()
+
+
+def _unpack(data: bytes, kind: str) -> Dict[str, np.ndarray]:
+    with np.load(io.BytesIO(data)) as arrays:
+        if str(arrays["kind"]) != kind:
+            raise ValueError(f"Serialized sketch is a {arrays['kind']}, not a {kind}")
+        return {name: arrays[name] for name in arrays.files}
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang and Liberty's KLL).
+
+    Values are kept in a stack of compactors; an item at level ``h``
+    stands for ``2**h`` inputs. When a level outgrows its capacity it is
+    sorted and every other item (from a random offset) is promoted, so the
+    sketch holds ``O(k)`` items however many values it has seen. Ranks are
+    accurate to roughly ``1.7 / k`` of ``n`` with high probability, and two
+    sketches with the same ``k`` merge into a sketch of the combined data.
+    """
+
+    def __init__(self, k: int = 200, rng: Optional[np.random.Generator] = None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = rng if rng is not None else np.random.default_rng()
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        # Lazy compaction: only compact while the sketch as a whole is over budget
+        while self.size > sum(map(self._capacity, range(len(self.levels)))):
+            level = next(
+                level
+                for level, items in enumerate(self.levels)
+                if items.size > self._capacity(level)
+            )
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            # An odd item out stays behind so promoted weight matches removed weight
+            kept, items = items[: items.size % 2], items[items.size % 2 :]
+            promoted = items[self._rng.integers(2) :: 2]
+            self.levels[level] = kept
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def update(self, values) -> "KLLSketch":
+        """Adds a chunk of values (NaNs are ignored)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.n += values.size
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Folds ``other`` into this sketch in place."""
+        if other.k != self.k:
+            raise ValueError("Only sketches with the same k can be merged")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _sorted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [
+                np.full(level.size, 2**h, dtype=np.int64)
+                for h, level in enumerate(self.levels)
+            ]
+        )
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """Approximate quantile(s) for ``q`` in ``[0, 1]`` (NaN when empty)."""
+        q = np.asarray(q, dtype=float)
+        if self.n == 0:
+            return np.full(q.shape, np.nan) if q.ndim else np.nan
+        items, cumulative = self._sorted_items()
+        index = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        result = items[np.clip(index, 0, items.size - 1)]
+        result = np.where(q <= 0, self.min, np.where(q >= 1, self.max, result))
+        return result if q.ndim else float(result)
+
+    def rank(self, value) -> float:
+        """Approximate share of values less than or equal to ``value``."""
+        if self.n == 0:
+            return np.nan
+        items, cumulative = self._sorted_items()
+        position = np.searchsorted(items, value, side="right")
+        return float(cumulative[position - 1] / cumulative[-1]) if position else 0.0
+
+    @property
+    def size(self) -> int:
+        """Number of items retained."""
+        return sum(level.size for level in self.levels)
+
+    def to_bytes(self) -> bytes:
+        return _pack(
+            "KLLSketch",
+            params=np.array([self.k, self.n]),
+            extremes=np.array([self.min, self.max]),
+            sizes=np.array([level.size for level in self.levels]),
+            items=np.concatenate(self.levels),
+        )
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, rng: Optional[np.random.Generator] = None
+    ) -> "KLLSketch":
+        arrays = _unpack(data, "KLLSketch")
+        k, n = arrays["params"]
+        sketch = cls(int(k), rng)
+        sketch.n = int(n)
+        sketch.min, sketch.max = map(float, arrays["extremes"])
+        sketch.levels = np.split(arrays["items"], np.cumsum(arrays["sizes"])[:-1])
+        return sketch
+
+
+class CountMinSketch:
+    """Approximate frequency of every value in ``width x depth`` counters.
+
+    Each value is hashed to one counter per row; the estimate is the
+    smallest of its counters, which never undercounts and overcounts by at
+    most ``e * n / width`` with probability ``1 - exp(-depth)``. Sketches
+    with the same shape and seed merge by adding their tables.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 5, seed: int = 0):
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.n = 0
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        return np.stack(
+            [
+                _mix(hashes, self.seed * self.depth + row + 1) % np.uint64(self.width)
+                for row in range(self.depth)
+            ]
+        ).astype(np.int64)
+
+    def update(self, values) -> "CountMinSketch":
+        """Adds a chunk of values (missing values are ignored)."""
+        values = _clean(values)
+        self.n += values.size
+        for row, columns in enumerate(self._columns(_hash(values))):
+            self.table[row] += np.bincount(columns, minlength=self.width)
+        return self
+
+    def estimate(self, values) -> np.ndarray:
+        """Upper-bound count estimates for each of ``values``."""
+        columns = self._columns(_hash(_clean(values)))
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (other.width, other.depth, other.seed) != (
+            self.width,
+            self.depth,
+            self.seed,
+        ):
+            raise ValueError("Only sketches with the same shape and seed can be merged")
+        self.table += other.table
+        self.n += other.n
+        return self
+
+    def to_bytes(self) -> bytes:
+        return _pack(
+            "CountMinSketch",
+            params=np.array([self.width, self.depth, self.seed, self.n]),
+            table=self.table,
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CountMinSketch":
+        arrays = _unpack(data, "CountMinSketch")
+        width, depth, seed, n = map(int, arrays["params"])
+        sketch = cls(width, depth, seed)
+        sketch.n, sketch.table = n, arrays["table"]
+        return sketch
+
+
+class SpaceSaving:
+    """Heavy hitters and mode with ``capacity`` monitored values (Space-Saving).
+
+    Every monitored value has a count that overestimates its true count by
+    at most its ``error``, and any value more frequent than
+    ``n / capacity`` is guaranteed to be monitored. Chunks are first
+    reduced to exact counts and then merged with the mergeable-summary rule
+    (Agarwal et al.), so updates cost one ``np.unique`` per chunk.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.n = 0
+        self.values = np.empty(0)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.errors = np.empty(0, dtype=np.int64)
+
+    def _floor(self) -> int:
+        """Count assumed for unmonitored values (0 until the summary is full)."""
+        return int(self.counts.min()) if self.counts.size >= self.capacity else 0
+
+    def update(self, values) -> "SpaceSaving":
+        """Adds a chunk of values (missing values are ignored)."""
+        chunk = SpaceSaving(self.capacity)
+        chunk.values, counts = np.unique(_clean(values), return_counts=True)
+        chunk.counts = counts.astype(np.int64)
+        chunk.errors = np.zeros(counts.size, dtype=np.int64)
+        chunk.n = int(counts.sum())
+        return self.merge(chunk)
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Folds ``other`` into this summary, keeping the ``capacity`` largest counts."""
+        if other.values.size == 0:
+            return self
+        if self.values.size == 0:
+            self.values = self.values.astype(other.values.dtype)
+        floor_a, floor_b = self._floor(), other._floor()
+        values, inverse = np.unique(
+            np.concatenate([self.values, other.values]), return_inverse=True
+        )
+        counts = np.full(values.size, floor_a + floor_b, dtype=np.int64)
+        errors = counts.copy()
+        mine, theirs = inverse[: self.values.size], inverse[self.values.size :]
+        counts[mine] += self.counts - floor_a
+        errors[mine] += self.errors - floor_a
+        counts[theirs] += other.counts - floor_b
+        errors[theirs] += other.errors - floor_b
+        keep = np.argsort(-counts, kind="stable")[: self.capacity]
+        self.values, self.counts, self.errors = values[keep], counts[keep], errors[keep]
+        self.n += other.n
+        return self
+
+    def top(self, n: int = 10) -> List[Tuple[object, int, int]]:
+        """The ``n`` most frequent values as ``(value, count, max overcount)``."""
+        return [
+            (value.item(), int(count), int(error))
+            for value, count, error in zip(
+                self.values[:n], self.counts[:n], self.errors[:n]
+            )
+        ]
+
+    @property
+    def mode(self):
+        """Most frequent value (``None`` when empty)."""
+        return self.values[0].item() if self.values.size else None
+
+    def to_bytes(self) -> bytes:
+        return _pack(
+            "SpaceSaving",
+            params=np.array([self.capacity, self.n]),
+            values=self.values,
+            counts=self.counts,
+            errors=self.errors,
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SpaceSaving":
+        arrays = _unpack(data, "SpaceSaving")
+        capacity, n = map(int, arrays["params"])
+        summary = cls(capacity)
+        summary.n = n
+        summary.values = arrays["values"]
+        summary.counts, summary.errors = arrays["counts"], arrays["errors"]
+        return summary
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """Number of significant bits of each unsigned 64-bit integer."""
+    x = x.copy()
+    length = np.zeros(x.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = x >= np.uint64(1 << shift)
+        length[high] += shift
+        x[high] >>= np.uint64(shift)
+    return length + (x > 0)
+
+
+class HyperLogLog:
+    """Approximate distinct count in ``2**precision`` one-byte registers.
+
+    The relative error is about ``1.04 / sqrt(2**precision)`` (0.8% at the
+    default precision of 14, in 16 KB) however many values are added.
+    Sketches with the same precision merge by taking register maxima.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(2**precision, dtype=np.uint8)
+
+    def update(self, values) -> "HyperLogLog":
+        """Adds a chunk of values (missing values are ignored)."""
+        hashes = _hash(_clean(values))
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.int64)
+        remainder = hashes & np.uint64(2**bits - 1)
+        rank = (bits - _bit_length(remainder) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> float:
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m**2 / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            return float(m * np.log(m / zeros))  # Linear counting for small counts
+        return float(estimate)
+
+    def to_bytes(self) -> bytes:
+        return _pack(
+            "HyperLogLog",
+            params=np.array([self.precision]),
+            registers=self.registers,
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        arrays = _unpack(data, "HyperLogLog")
+        sketch = cls(int(arrays["params"][0]))
+        sketch.registers = arrays["registers"]
+        return sketch
+
+
+SKETCH_TYPES = {
+    cls.__name__: cls for cls in (KLLSketch, CountMinSketch, SpaceSaving, HyperLogLog)
+}
+
+
+def sketch_from_bytes(data: bytes):
+    """Restores any sketch serialized with its ``to_bytes``."""
+    with np.load(io.BytesIO(data)) as arrays:
+        kind = str(arrays["kind"])
+    if kind not in SKETCH_TYPES:
+        raise ValueError(f"Unknown sketch type {kind!r}")
+    return SKETCH_TYPES[kind].from_bytes(data)
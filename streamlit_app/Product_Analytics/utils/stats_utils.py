@@ -1,42 +1,58 @@
 # utils/stats_utils.py
 import math
+from functools import lru_cache
 from typing import Dict, List
 
 import numpy as np
-from scipy import stats
 from statsmodels.stats.power import TTestIndPower
+from utils.streaming_utils import (
+    MODE_MAX_DISTINCT,
+    SUMMARY_PERCENTILES,
+    StreamingMoments,
+)
 
 
 def calculate_descriptive_stats(data: List[float]) -> Dict:
-    """Calculates descriptive statistics for a given dataset."""
-    data = np.array(data)
-    unique_values = np.unique(data)
+    """Calculates descriptive statistics for a given dataset.
+
+    Moments come from one ``StreamingMoments`` pass and all percentiles from
+    one partial sort; for data that does not fit in memory use
+    ``utils.streaming_utils.describe_stream``. Missing values (NaN) are
+    dropped before any statistic is computed.
+    """
+    data = np.asarray(data, dtype=float).ravel()
+    data = data[~np.isnan(data)]
+    moments = StreamingMoments.from_array(data)
+    q1, median, q3, p90 = np.percentile(data, SUMMARY_PERCENTILES)
+    unique_values, counts = np.unique(data, return_counts=True)
     mode_val = (
-        stats.mode(data, keepdims=True)[0][0]
-        if len(unique_values) < 500
+        unique_values[counts.argmax()]
+        if len(unique_values) < MODE_MAX_DISTINCT
         else "Not well-defined"
     )
     return {
-        "Mean": np.mean(data),
-        "Median": np.median(data),
+        "Mean": moments.mean,
+        "Median": median,
         "Mode": mode_val,
-        "Range": np.max(data) - np.min(data),
-        "Variance": np.var(data),
-        "Standard Deviation": np.std(data),
-        "IQR": stats.iqr(data),
-        "Skewness": stats.skew(data),
-        "Kurtosis": stats.kurtosis(data),
-        "25th Percentile (Q1)": np.percentile(data, 25),
-        "50th Percentile (Median)": np.percentile(data, 50),
-        "75th Percentile (Q3)": np.percentile(data, 75),
-        "90th Percentile": np.percentile(data, 90),
+        "Range": moments.max - moments.min,
+        "Variance": moments.variance(),
+        "Standard Deviation": moments.std(),
+        "IQR": q3 - q1,
+        "Skewness": moments.skewness,
+        "Kurtosis": moments.kurtosis,
+        "25th Percentile (Q1)": q1,
+        "50th Percentile (Median)": median,
+        "75th Percentile (Q3)": q3,
+        "90th Percentile": p90,
     }
 
 
+@lru_cache(maxsize=1024)
 def calculate_sample_size_power(
     effect_size: float, power: float, alpha: float = 0.05
 ) -> float:
     """Calculates sample size given effect size, power and alpha"""
+    # Exact solve is iterative, so repeated slider positions come from the cache
     analysis = TTestIndPower()  # indendent samples t test
     sample_size = analysis.solve_power(
         effect_size=effect_size, power=power, alpha=alpha
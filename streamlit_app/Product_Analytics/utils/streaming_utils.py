@@ -0,0 +1,197 @@
+# utils/streaming_utils.py
+import io
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from utils.sketch_utils import HyperLogLog, KLLSketch, SpaceSaving
+
+SUMMARY_PERCENTILES = (25, 50, 75, 90)
+MODE_MAX_DISTINCT = 500  # Above this many distinct values the mode is not reported
+
+
+class StreamingMoments:
+    """Count, extremes and central moments up to the fourth, built chunk by chunk.
+
+    Each chunk is reduced to its own count, mean and centered power sums,
+    which are then combined with the running totals using Pébay's pairwise
+    update formulas. Combining is exact and associative, so partial results
+    from separate chunks or workers can be merged in any order.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @classmethod
+    def from_array(cls, values) -> "StreamingMoments":
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        moments = cls()
+        if values.size:
+            moments.n = values.size
+            moments.mean = float(values.mean())
+            deviation = values - moments.mean
+            squared = deviation * deviation
+            moments.m2 = float(squared.sum())
+            moments.m3 = float(squared @ deviation)
+            moments.m4 = float(squared @ squared)
+            moments.min = float(values.min())
+            moments.max = float(values.max())
+        return moments
+
+    def update(self, values) -> "StreamingMoments":
+        """Adds a chunk of values (NaNs are ignored)."""
+        return self.merge(StreamingMoments.from_array(values))
+
+    def merge(self, other: "StreamingMoments") -> "StreamingMoments":
+        """Folds ``other`` into these moments in place."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        n_a, n_b = self.n, other.n
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        m2 = self.m2 + other.m2 + delta**2 * n_a * n_b / n
+        m3 = (
+            self.m3
+            + other.m3
+            + delta**3 * n_a * n_b * (n_a - n_b) / n**2
+            + 3 * delta * (n_a * other.m2 - n_b * self.m2) / n
+        )
+        m4 = (
+            self.m4
+            + other.m4
+            + delta**4 * n_a * n_b * (n_a**2 - n_a * n_b + n_b**2) / n**3
+            + 6 * delta**2 * (n_a**2 * other.m2 + n_b**2 * self.m2) / n**2
+            + 4 * delta * (n_a * other.m3 - n_b * self.m3) / n
+        )
+        self.n, self.m2, self.m3, self.m4 = n, m2, m3, m4
+        self.mean += delta * n_b / n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof: int = 0) -> float:
+        return self.m2 / (self.n - ddof) if self.n > ddof else np.nan
+
+    def std(self, ddof: int = 0) -> float:
+        return float(np.sqrt(self.variance(ddof)))
+
+    @property
+    def skewness(self) -> float:
+        """Biased sample skewness, as ``scipy.stats.skew``."""
+        return np.sqrt(self.n) * self.m3 / self.m2**1.5 if self.m2 > 0 else np.nan
+
+    @property
+    def kurtosis(self) -> float:
+        """Biased excess kurtosis, as ``scipy.stats.kurtosis``."""
+        return self.n * self.m4 / self.m2**2 - 3 if self.m2 > 0 else np.nan
+
+
+MOMENT_FIELDS = ("n", "mean", "m2", "m3", "m4", "min", "max")
+
+
+class StreamingSummary:
+    """Mergeable summary of one numeric column built from sketches.
+
+    Moments are exact; quantiles come from a KLL sketch, the mode from a
+    Space-Saving summary and the distinct count from a HyperLogLog. Memory
+    stays bounded by the sketch sizes however many rows are added, so a
+    column of any length can be summarized from a stream of chunks, and
+    per-partition summaries can be stored with ``to_bytes`` and merged later.
+    """
+
+    def __init__(self, k: int = 200, rng: Optional[np.random.Generator] = None):
+        self.moments = StreamingMoments()
+        self.sketch = KLLSketch(k, rng)
+        self.frequent = SpaceSaving()
+        self.distinct = HyperLogLog()
+
+    def update(self, values) -> "StreamingSummary":
+        values = np.asarray(values, dtype=float).ravel()
+        self.moments.update(values)
+        self.sketch.update(values)
+        self.frequent.update(values)
+        self.distinct.update(values)
+        return self
+
+    def merge(self, other: "StreamingSummary") -> "StreamingSummary":
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        self.frequent.merge(other.frequent)
+        self.distinct.merge(other.distinct)
+        return self
+
+    def describe(self) -> Dict:
+        """The ``calculate_descriptive_stats`` keys plus counts, from the sketches."""
+        moments = self.moments
+        q1, median, q3, p90 = self.sketch.quantile(np.array(SUMMARY_PERCENTILES) / 100)
+        distinct = self.distinct.count()
+        return {
+            "Count": moments.n,
+            "Distinct Values": round(distinct),
+            "Mean": moments.mean if moments.n else np.nan,
+            "Median": median,
+            "Mode": (
+                self.frequent.mode
+                if distinct < MODE_MAX_DISTINCT
+                else "Not well-defined"
+            ),
+            "Range": moments.max - moments.min if moments.n else np.nan,
+            "Variance": moments.variance(),
+            "Standard Deviation": moments.std(),
+            "IQR": q3 - q1,
+            "Skewness": moments.skewness,
+            "Kurtosis": moments.kurtosis,
+            "25th Percentile (Q1)": q1,
+            "50th Percentile (Median)": median,
+            "75th Percentile (Q3)": q3,
+            "90th Percentile": p90,
+        }
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            moments=np.array([getattr(self.moments, f) for f in MOMENT_FIELDS]),
+            **{
+                name: np.frombuffer(getattr(self, name).to_bytes(), dtype=np.uint8)
+                for name in ("sketch", "frequent", "distinct")
+            },
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, rng: Optional[np.random.Generator] = None
+    ) -> "StreamingSummary":
+        summary = cls(rng=rng)
+        with np.load(io.BytesIO(data)) as arrays:
+            for field, value in zip(MOMENT_FIELDS, arrays["moments"].tolist()):
+                setattr(summary.moments, field, value)
+            summary.moments.n = int(summary.moments.n)
+            summary.sketch = KLLSketch.from_bytes(arrays["sketch"].tobytes(), rng)
+            summary.frequent = SpaceSaving.from_bytes(arrays["frequent"].tobytes())
+            summary.distinct = HyperLogLog.from_bytes(arrays["distinct"].tobytes())
+        return summary
+
+
+def describe_stream(
+    chunks: Iterable, k: int = 200, rng: Optional[np.random.Generator] = None
+) -> Dict:
+    """Summarizes a column from a stream of chunks in one pass.
+
+    ``chunks`` can be arrays or Series, e.g. one column of
+    ``pd.read_csv(..., chunksize=...)``.
+    """
+    summary = StreamingSummary(k, rng)
+    for chunk in chunks:
+        summary.update(chunk)
+    return summary.describe()